@@ -0,0 +1,91 @@
+"""
+Throughput versus latency of group commit for concurrent item creates.
+
+Runs ``--writers`` threads that each insert rows as fast as they can, first
+with one commit per insert and then through ``GroupCommitter`` at each
+``--windows`` setting, and prints writes/s and per-write latency. Longer
+windows build bigger batches (fewer commits, higher throughput) but every
+write waits for its batch, which shows up in p50/p99:
+
+    python -m benchmarks.bench_group_commit --writers 32 --writes 4000
+    SQLITE_SYNCHRONOUS=FULL python -m benchmarks.bench_group_commit  # fsync every commit
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.database import Base, Item, create_db_engine
+from src.group_commit import GroupCommitter
+
+
+def _drive(engine, writers: int, total: int, write):
+    latencies = []
+    lock = threading.Lock()
+    remaining = iter(range(total))
+
+    def worker():
+        local = []
+        for n in remaining:
+            statement = insert(Item).values(name=f"bench {n}", price=float(n % 100)).returning(Item.id)
+            start = time.perf_counter()
+            write(statement)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        for _ in range(writers):
+            pool.submit(worker)
+    return time.perf_counter() - start, latencies
+
+
+def run(engine, label: str, writers: int, total: int, write, committer=None) -> str:
+    elapsed, latencies = _drive(engine, writers, total, write)
+    quantiles = statistics.quantiles(latencies, n=100)
+    line = (f"{label:>14}: {len(latencies) / elapsed:8.1f} writes/s  "
+            f"p50 {quantiles[49] * 1000:7.2f} ms  p99 {quantiles[98] * 1000:7.2f} ms")
+    if committer is not None:
+        line += f"  avg batch {committer.stats()['average_batch']:5.1f}"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="database to benchmark (default: a temporary SQLite file)")
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=4000)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--windows", default="0.5,2,5", help="comma-separated group commit windows, in ms")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(
+            args.database_url or f"sqlite:///{tmp}/bench.db", pool_size=args.writers, max_overflow=0
+        )
+        Base.metadata.create_all(engine)
+
+        def commit_each(statement):
+            with Session(bind=engine) as db:
+                db.execute(statement).one()
+                db.commit()
+
+        print(f"{args.writers} writers, {args.writes} creates")
+        print(run(engine, "commit each", args.writers, args.writes, commit_each))
+        for window_ms in (float(w) for w in args.windows.split(",")):
+            committer = GroupCommitter(max_batch=args.max_batch, window=window_ms / 1000)
+            label = f"group {window_ms:g} ms"
+            print(run(engine, label, args.writers, args.writes, lambda s: committer.submit(engine, s), committer))
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Microbenchmarks for the item hot paths at several table sizes (SQLite).
+
+For every size in ``--sizes``, a seeded dataset from ``benchmarks.datagen``
+is copied to a scratch file and each hot path is measured in-process
+(through the ASGI app for the endpoints):
+
+    time     median and p95 wall time per call (gc disabled while timing)
+    alloc    peak memory allocated during a call (tracemalloc, separate pass)
+    queries  SQL statements executed per call
+
+Runs are repeatable across commits (fixed seeds, warm-up calls, identical
+data); save one with ``--json`` and diff a later run with ``--compare``:
+
+    python -m benchmarks.bench_hotpaths --sizes 1000,100000 --json before.json
+    python -m benchmarks.bench_hotpaths --sizes 1000,100000 --compare before.json
+    python -m benchmarks.bench_hotpaths --sizes 10000000 --paths get_item,list_first_page
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.datagen import dataset
+from src.app import app
+from src.database import Item, create_db_engine, get_db
+from src.schemas import ItemResponse
+from src.serialization import dumps, item_payload
+
+PAGE = 100
+
+
+class Context:
+    """Engine, app client and id bookkeeping shared by the hot paths for one dataset."""
+
+    def __init__(self, engine, seed: int):
+        self.engine = engine
+        self.session_factory = sessionmaker(bind=engine, autoflush=False)
+        self.rng = random.Random(seed)
+        with self.session_factory() as db:
+            self.count = db.scalar(select(func.count()).select_from(Item))
+            self.max_id = db.scalar(select(func.max(Item.id)))
+            self.page = db.scalars(select(Item).order_by(Item.id).limit(PAGE)).all()
+            db.expunge_all()
+        self.page_dicts = [item.to_dict() for item in self.page]
+        # Deletes consume ids; hand out distinct ones from the top of the table.
+        self.deletable = iter(range(self.max_id, 0, -1))
+
+        def override_get_db():
+            db = self.session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        self.client = TestClient(app)
+
+    def random_id(self) -> int:
+        return self.rng.randint(1, self.max_id)
+
+    def close(self):
+        app.dependency_overrides.clear()
+
+
+def _checked(response, status=200):
+    assert response.status_code == status, (response.status_code, response.text[:200])
+    return response
+
+
+def hot_paths(ctx: Context) -> dict:
+    """Name -> zero-argument callable performing one call of that hot path."""
+    adapter = TypeAdapter(list[ItemResponse])
+    client = ctx.client
+    return {
+        "to_dict_page": lambda: [item.to_dict() for item in ctx.page],
+        "validate_page": lambda: adapter.validate_python(ctx.page_dicts),
+        "encode_page": lambda: dumps([item_payload(item) for item in ctx.page]),
+        "list_first_page": lambda: _checked(client.get(f"/api/items?limit={PAGE}")),
+        "list_sparse": lambda: _checked(client.get(f"/api/items?limit={PAGE}&fields=id,name,price")),
+        "list_deep_offset": lambda: _checked(client.get(f"/api/items?limit={PAGE}&skip={max(ctx.count - PAGE, 0)}")),
+        "list_filtered": lambda: _checked(client.get(f"/api/items?limit={PAGE}&min_price=10&max_price=12&sort=price")),
+        "list_search": lambda: _checked(client.get(f"/api/items?limit={PAGE}&q=alpha%20oak")),
+        "get_item": lambda: _checked(client.get(f"/api/items/{ctx.random_id()}")),
+        "stats": lambda: _checked(client.get("/api/items/stats")),
+        "create_item": lambda: _checked(
+            client.post("/api/items", json={"name": "bench", "description": "alpha oak", "price": 5.0}), 201
+        ),
+        "update_item": lambda: _checked(client.put(f"/api/items/{ctx.random_id()}", json={"price": 7.5})),
+        "delete_item": lambda: _checked(client.delete(f"/api/items/{next(ctx.deletable)}"), 204),
+    }
+
+
+def measure(ctx: Context, call, repeat: int, warmup: int, alloc_calls: int) -> dict:
+    for _ in range(warmup):
+        call()
+
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(ctx.engine, "before_cursor_execute", count)
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+        event.remove(ctx.engine, "before_cursor_execute", count)
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_calls):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            call()
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "median_us": statistics.median(timings) * 1e6,
+        "p95_us": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1e6,
+        "alloc_kib": statistics.median(peaks) / 1024 if peaks else 0.0,
+        "queries": statements / repeat,
+    }
+
+
+def run(args) -> dict:
+    results = {}
+    for size in (int(s) for s in args.sizes.split(",")):
+        source = dataset(size, seed=args.seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.db")
+            shutil.copyfile(source, path)
+            engine = create_db_engine(f"sqlite:///{path}")
+            ctx = Context(engine, seed=args.seed)
+            try:
+                for name, call in hot_paths(ctx).items():
+                    if args.paths and name not in args.paths:
+                        continue
+                    results[f"{name}@{size}"] = measure(ctx, call, args.repeat, args.warmup, args.alloc_calls)
+                    print(_format_row(name, size, results[f"{name}@{size}"]), flush=True)
+            finally:
+                ctx.close()
+                engine.dispose()
+    return results
+
+
+def _format_row(name: str, size: int, r: dict, baseline: dict = None) -> str:
+    line = (f"{name:>17} {size:>10,} {r['median_us']:>11.1f} {r['p95_us']:>11.1f} "
+            f"{r['alloc_kib']:>10.1f} {r['queries']:>8.1f}")
+    if baseline:
+        change = (r["median_us"] - baseline["median_us"]) / baseline["median_us"] * 100
+        line += f"  {change:+7.1f}%"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000", help="comma-separated row counts")
+    parser.add_argument("--paths", type=lambda s: set(s.split(",")), help="only these hot paths")
+    parser.add_argument("--repeat", type=int, default=200, help="timed calls per path")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--alloc-calls", type=int, default=20, help="calls measured under tracemalloc")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="write results to this file")
+    parser.add_argument("--compare", metavar="PATH", help="previous --json run to compare medians against")
+    args = parser.parse_args(argv)
+
+    header = f"{'path':>17} {'rows':>10} {'median µs':>11} {'p95 µs':>11} {'alloc KiB':>10} {'queries':>8}"
+    print(header)
+    results = run(args)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+    if args.compare:
+        with open(args.compare) as fh:
+            previous = json.load(fh)
+        print(f"\nChange in median vs {args.compare}:")
+        print(header + "   change")
+        for key, r in results.items():
+            name, size = key.rsplit("@", 1)
+            if key in previous:
+                print(_format_row(name, int(size), r, previous[key]))
+
+
+if __name__ == "__main__":
+    main()
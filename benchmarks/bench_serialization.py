@@ -0,0 +1,60 @@
+"""
+Measure the cost of encoding a large list_items page.
+
+Compares the previous response path (``Item.to_dict()`` → ``ItemResponse``
+validation via response_model → ``jsonable_encoder`` → ``json.dumps``) with
+the fast path (column values → ``serialization.dumps``) on in-memory items:
+
+    python -m benchmarks.bench_serialization --items 1000 --repeat 200
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from src.database import Item
+from src.schemas import ItemResponse
+from src.serialization import dumps, item_payload
+
+
+def make_items(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        Item(id=i, name=f"Item {i}", description="x" * 200, price=i * 1.25, created_at=now, updated_at=now)
+        for i in range(count)
+    ]
+
+
+def legacy_path(items, adapter) -> bytes:
+    validated = adapter.validate_python([item.to_dict() for item in items])
+    payload = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(items) -> bytes:
+    return dumps([item_payload(item) for item in items])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    items = make_items(args.items)
+    adapter = TypeAdapter(list[ItemResponse])
+    assert json.loads(legacy_path(items, adapter)) == json.loads(fast_path(items))
+
+    legacy = min(timeit.repeat(lambda: legacy_path(items, adapter), number=args.repeat, repeat=3)) / args.repeat
+    fast = min(timeit.repeat(lambda: fast_path(items), number=args.repeat, repeat=3)) / args.repeat
+    print(f"{args.items} items/page")
+    print(f"  legacy: {legacy * 1000:8.3f} ms/page")
+    print(f"  fast:   {fast * 1000:8.3f} ms/page  ({legacy / fast:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Seeded synthetic data for the ``items`` table.
+
+The same ``--rows`` and ``--seed`` always produce the same rows, so
+benchmark runs on different commits see identical data. Rows are
+bulk-inserted into a bare ``items`` table and the indexes, full-text index
+and summary tables are built afterwards, which is much faster than
+maintaining them row by row:
+
+    python -m benchmarks.datagen --rows 100000 --out /tmp/items-100k.db
+
+``dataset(rows, seed)`` returns the path of a cached database file
+(under ``benchmarks/.data``), generating it on first use.
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.schema import CreateTable
+
+from src.database import Base, Item, create_db_engine, install_sqlite_fts
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), ".data")
+CHUNK = 10_000
+EPOCH = datetime(2023, 1, 1)
+
+WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima mike november oscar papa "
+    "quebec romeo sierra tango uniform victor whiskey xray yankee zulu red green blue amber steel oak"
+).split()
+
+
+def rows(count: int, seed: int = 1):
+    """Yield ``count`` deterministic item rows (ids 1..count, created in id order)."""
+    rng = random.Random(seed)
+    # Spread creation times over two years, in id order like real inserts.
+    step = timedelta(days=730) / max(count, 1)
+    for i in range(1, count + 1):
+        created_at = EPOCH + step * i
+        yield {
+            "id": i,
+            "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}",
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(4, 16))),
+            "price": round(rng.lognormvariate(3, 1.2), 2),
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(seconds=rng.randint(0, 86400 * 30)),
+        }
+
+
+def generate(url: str, count: int, seed: int = 1, progress=None):
+    """Create a database at ``url`` holding ``count`` generated items and the full schema."""
+    engine = create_db_engine(url)
+    try:
+        Base.metadata.drop_all(engine)
+        with engine.begin() as connection:
+            connection.execute(CreateTable(Item.__table__))
+        batch = []
+        for row in rows(count, seed):
+            batch.append(row)
+            if len(batch) == CHUNK:
+                with engine.begin() as connection:
+                    connection.execute(insert(Item), batch)
+                if progress:
+                    progress(row["id"])
+                batch = []
+        if batch:
+            with engine.begin() as connection:
+                connection.execute(insert(Item), batch)
+        with engine.begin() as connection:
+            for index in Item.__table__.indexes:
+                index.create(connection, checkfirst=True)
+            install_sqlite_fts(connection)
+        # Creates the remaining tables; their triggers and summaries are built from the loaded rows.
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+    finally:
+        engine.dispose()
+
+
+def dataset(count: int, seed: int = 1, regenerate: bool = False) -> str:
+    """Path to a cached SQLite database with ``count`` items, generating it if needed."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"items-{count}-seed{seed}.db")
+    if regenerate or not os.path.exists(path):
+        partial = path + ".partial"
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(partial + suffix):
+                os.remove(partial + suffix)
+        generate(f"sqlite:///{partial}", count, seed)
+        os.replace(partial, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", required=True, help="SQLite file to (re)create")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    generate(f"sqlite:///{args.out}", args.rows, args.seed,
+             progress=lambda done: print(f"\r{done:,} / {args.rows:,} rows", end="", flush=True))
+    print(f"\r{args.rows:,} rows written to {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Concurrent load test against the app running under uvicorn.
+
+Starts the app on a temporary SQLite database (or ``--database-url``), seeds
+``--items`` rows, then runs ``--concurrency`` async clients for
+``--duration`` seconds. Each request is drawn from ``--mix``, a weighted set
+of scenarios:
+
+    health  GET /health
+    read    GET /api/items/{id}
+    list    GET /api/items?limit=50
+    search  GET /api/items?q=...&limit=50
+    write   POST /api/items
+
+Throughput and p50/p95/p99/max latency are reported per scenario and
+overall. With ``--baseline`` the results are compared against a stored run
+and the process exits with status 1 if throughput dropped or tail latency
+or the error rate rose beyond ``--tolerance``:
+
+    python -m benchmarks.loadtest --save-baseline benchmarks/baseline.json
+    python -m benchmarks.loadtest --baseline benchmarks/baseline.json
+    python -m benchmarks.loadtest --mix health=1,read=8,write=1 --concurrency 100
+
+Baselines are only meaningful on the machine that recorded them, so none is
+shipped: record one on the runner class that will do the comparison, and keep
+it alongside that runner's configuration.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.server import free_port, start_server
+
+SCENARIOS = {
+    "health": lambda rng, ids: ("GET", "/health", None),
+    "read": lambda rng, ids: ("GET", f"/api/items/{rng.choice(ids)}", None),
+    "list": lambda rng, ids: ("GET", "/api/items?limit=50", None),
+    "search": lambda rng, ids: ("GET", f"/api/items?q=tag{rng.randrange(20)}&limit=50", None),
+    "write": lambda rng, ids: ("POST", "/api/items", {"name": "load", "description": "tag0", "price": 1.0}),
+}
+DEFAULT_MIX = "health=1,read=6,list=2,write=1"
+
+# Latency comparisons ignore differences below this many milliseconds; at
+# sub-millisecond latencies, scheduler noise alone exceeds any tolerance.
+LATENCY_SLACK_MS = 2.0
+
+
+def parse_mix(spec: str) -> dict:
+    """Parse ``name=weight,...`` into a weight per scenario."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def summarize(latencies, errors: int, elapsed: float) -> dict:
+    """Throughput, error rate and latency percentiles (ms) for one set of requests."""
+    count = len(latencies)
+    if count == 0:
+        return {"requests": 0, "rps": 0.0, "errors": errors, "error_rate": 1.0 if errors else 0.0,
+                "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    if count == 1:
+        cuts = latencies * 99
+    else:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": count,
+        "rps": count / elapsed,
+        "errors": errors,
+        "error_rate": errors / count,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return a description of each metric that regressed against ``baseline``."""
+    regressions = []
+    for scenario, base in baseline.get("results", {}).items():
+        current = results["results"].get(scenario)
+        if current is None or not base["requests"]:
+            continue
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{scenario}: throughput {current['rps']:.1f} req/s < baseline {base['rps']:.1f}")
+        for metric in ("p95_ms", "p99_ms"):
+            limit = base[metric] * (1 + tolerance) + LATENCY_SLACK_MS
+            if current[metric] > limit:
+                regressions.append(
+                    f"{scenario}: {metric} {current[metric]:.2f} > baseline {base[metric]:.2f} (limit {limit:.2f})"
+                )
+        if current["error_rate"] > base["error_rate"] + 0.001:
+            regressions.append(
+                f"{scenario}: error rate {current['error_rate']:.2%} > baseline {base['error_rate']:.2%}"
+            )
+    return regressions
+
+
+async def _drive(base_url: str, ids, mix: dict, concurrency: int, duration: float, seed: int):
+    names, weights = list(mix), list(mix.values())
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+
+    async def worker(client, rng, deadline):
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, url, body = SCENARIOS[name](rng, ids)
+            start = time.perf_counter()
+            try:
+                res = await client.request(method, url, json=body)
+                failed = res.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append(time.perf_counter() - start)
+            errors[name] += failed
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(worker(client, random.Random(seed + n), deadline) for n in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def run(args) -> dict:
+    mix = parse_mix(args.mix)
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=args.database_url or f"sqlite:///{tmp}/load.db")
+        port = free_port()
+        proc = start_server(port, env, workers=args.workers)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            items = [{"name": f"seed {i}", "description": f"tag{i % 20}", "price": float(i % 100)}
+                     for i in range(args.items)]
+            ids = []
+            for offset in range(0, len(items), 1000):
+                res = httpx.post(f"{base_url}/api/items:batch", json={"create": items[offset:offset + 1000]}, timeout=60)
+                ids += [r["id"] for r in res.json()["results"]]
+            if args.warmup:
+                asyncio.run(_drive(base_url, ids, mix, args.concurrency, args.warmup, args.seed))
+            latencies, errors, elapsed = asyncio.run(
+                _drive(base_url, ids, mix, args.concurrency, args.duration, args.seed)
+            )
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    results = {name: summarize(latencies[name], errors[name], elapsed) for name in mix}
+    results["overall"] = summarize(
+        [value for values in latencies.values() for value in values], sum(errors.values()), elapsed
+    )
+    return {
+        "config": {
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "items": args.items,
+            "workers": args.workers,
+        },
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": results,
+    }
+
+
+def report(results: dict) -> str:
+    lines = [f"{'scenario':>9} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+             f"{'p99 ms':>8} {'max ms':>8} {'errors':>7}"]
+    for name, r in results["results"].items():
+        lines.append(f"{name:>9} {r['requests']:>9} {r['rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+                     f"{r['p99_ms']:>8.2f} {r['max_ms']:>8.2f} {r['errors']:>7}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="database to load (default: a temporary SQLite file)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted scenarios (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load first")
+    parser.add_argument("--items", type=int, default=1000, help="rows seeded before the run")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (src.server when > 1)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write these results as the new baseline")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    print(report(results))
+    for path in filter(None, (args.save_baseline, args.json)):
+        with open(path, "w") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        if baseline.get("config") != results["config"]:
+            print(f"warning: baseline config {baseline.get('config')} differs from this run", file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nREGRESSION against {args.baseline} (tolerance {args.tolerance:.0%}):", file=sys.stderr)
+            for line in regressions:
+                print(f"  - {line}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Helpers for benchmarks that run the app under a real uvicorn server."""
+
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, env: dict, workers: int = 1) -> subprocess.Popen:
+    """Start ``src.app:app`` under uvicorn (src.server for several workers) and wait until /health answers."""
+    if workers > 1:
+        cmd = [sys.executable, "-m", "src.server", "--workers", str(workers)]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "src.app:app"]
+    cmd += ["--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, env=env)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return proc
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("server did not start")
@@ -18,6 +18,11 @@ setup(
             "pytest>=8.0.0,<9.0.0",
             "httpx>=0.27.0,<1.0.0",
         ],
+        "async": [
+            "sqlalchemy[asyncio]>=2.0.0,<3.0.0",
+            "aiosqlite>=0.20.0,<1.0.0",
+            "asyncpg>=0.29.0,<1.0.0",
+        ],
     },
     python_requires=">=3.11",
 )
@@ -0,0 +1,5 @@
+import time
+
+# Taken before any submodule (or its dependencies) is imported; src.app reports
+# the difference as the application's import time.
+IMPORT_STARTED = time.perf_counter()
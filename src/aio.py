@@ -0,0 +1,148 @@
+"""
+Async CRUD endpoints for items (opt-in via DB_ASYNC=true).
+
+These mirror the sync handlers in ``src.app`` but run on an AsyncSession, so a
+request waiting on the database yields the event loop instead of holding a
+threadpool thread. The router is included ahead of the sync routes, so it
+takes over the same paths when enabled; its ``{item_id:int}`` paths leave the
+fixed ones (``/api/items/export``, ``/api/items/stats``, ...) to the sync app.
+
+Writes share the sync path's bookkeeping: they invalidate cached and
+in-flight reads, wake change-feed long-polls, honour ``If-Match`` and return
+the ETag / Last-Modified and ``X-Last-Write`` headers. They always commit one
+by one: group commit batches on threads and does not apply here. Reads skip
+the response cache and conditional GET handling.
+"""
+
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import pagination, reads, replicas, search
+from src.database import Item, get_async_db
+from src.schemas import ItemCreate, ItemUpdate, ItemResponse
+from src.serialization import JSONBytesResponse, item_payload
+
+router = APIRouter()
+
+
+def _app():
+    # src.app includes this router while it is still being imported, so its
+    # shared write helpers are looked up when a request runs.
+    from src import app
+
+    return app
+
+
+async def _if_match_guard(db: AsyncSession, item_id: int, if_match) -> tuple:
+    """Async ``src.app._if_match_guard``: extra WHERE clauses pinning the write to the If-Match version."""
+    if if_match is None:
+        return ()
+    row = (await db.execute(select(Item.updated_at).where(Item.id == item_id))).one_or_none()
+    return _app()._version_guard(item_id, if_match, row)
+
+
+async def _write_headers(db: AsyncSession, row=None) -> dict:
+    """Validators of the written ``row`` (if any) and the read-your-writes position."""
+    headers = _app()._item_validators(row) if row is not None else {}
+    return {**headers, **await db.run_sync(replicas.write_headers)}
+
+
+@router.post("/api/items", response_model=ItemResponse, status_code=201)
+async def create_item_async(item: ItemCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new item."""
+    row = (await db.execute(insert(Item).values(**item.model_dump()).returning(*reads.ITEM_COLUMNS))).one()
+    await db.commit()
+    _app()._invalidate_items()
+    return JSONBytesResponse(item_payload(row), status_code=201, headers=await _write_headers(db, row))
+
+
+@router.get("/api/items", response_model=List[ItemResponse])
+async def list_items_async(
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    sort: Literal["id", "name", "price", "created_at"] = Query(default="id"),
+    order: Literal["asc", "desc"] = Query(default="asc"),
+    cursor: Optional[str] = Query(default=None),
+    name: Optional[str] = Query(default=None),
+    name_prefix: Optional[str] = Query(default=None),
+    min_price: Optional[float] = Query(default=None, ge=0),
+    max_price: Optional[float] = Query(default=None, ge=0),
+    created_after: Optional[datetime] = Query(default=None),
+    created_before: Optional[datetime] = Query(default=None),
+    q: Optional[str] = Query(default=None, max_length=256),
+    fields: Optional[str] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List items with pagination and filters (see the sync ``list_items`` for semantics)."""
+    fields = reads.requested_fields(fields)
+    filters = search.item_filters(
+        db.bind.dialect.name, name, name_prefix, min_price, max_price, created_after, created_before, q
+    )
+    try:
+        stmt = pagination.paginate(
+            select(*reads.item_columns(fields, ("id", sort))).where(*filters), skip, limit, sort, order, cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    rows = (await db.execute(stmt)).all()
+    next_cursor = pagination.next_cursor(rows, limit, sort, order)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return JSONBytesResponse(reads.payloads(rows, fields), headers=headers)
+
+
+@router.get("/api/items/{item_id:int}", response_model=ItemResponse)
+async def get_item_async(
+    item_id: int, fields: Optional[str] = Query(default=None), db: AsyncSession = Depends(get_async_db)
+):
+    """Get a single item by ID."""
+    fields = reads.requested_fields(fields)
+    row = (await db.execute(reads.item_by_id(fields), {"item_id": item_id})).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return JSONBytesResponse(reads.payloads((row,), fields)[0])
+
+
+@router.put("/api/items/{item_id:int}", response_model=ItemResponse)
+async def update_item_async(
+    item_id: int,
+    item_update: ItemUpdate,
+    if_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Update an existing item (one UPDATE ... RETURNING; see the sync ``update_item`` for If-Match)."""
+    values = item_update.model_dump(exclude_none=True)
+    guard = await _if_match_guard(db, item_id, if_match)
+    if not values:
+        row = (await db.execute(select(*reads.ITEM_COLUMNS).where(Item.id == item_id))).one_or_none()
+    else:
+        stmt = update(Item).where(Item.id == item_id, *guard).values(**values).returning(*reads.ITEM_COLUMNS)
+        row = (await db.execute(stmt, execution_options={"synchronize_session": False})).one_or_none()
+        await db.commit()
+    if row is None:
+        _app()._raise_write_conflict(guard)
+    if values:
+        _app()._invalidate_items(item_id)
+    return JSONBytesResponse(item_payload(row), headers=await _write_headers(db, row))
+
+
+@router.delete("/api/items/{item_id:int}", status_code=204)
+async def delete_item_async(
+    item_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Delete an item (one DELETE ... RETURNING). With ``If-Match``, only if it still has that ETag."""
+    guard = await _if_match_guard(db, item_id, if_match)
+    stmt = delete(Item).where(Item.id == item_id, *guard).returning(Item.id)
+    deleted = (await db.execute(stmt, execution_options={"synchronize_session": False})).scalar_one_or_none()
+    await db.commit()
+    if deleted is None:
+        _app()._raise_write_conflict(guard)
+    _app()._invalidate_items(item_id)
+    response.headers.update(await _write_headers(db))
+    return None
@@ -5,54 +5,150 @@ Features:
 - Health check and greeting endpoints (original)
 - Database-backed CRUD for items (added for integration CI demo)
 - Supports SQLite (local) and PostgreSQL (CI service containers)
+- Optional async database path for the CRUD endpoints (DB_ASYNC=true)
+- Optional in-process cache of serialized item responses (ITEM_CACHE_SIZE)
+- ETag / Last-Modified validators with conditional GET, PUT and DELETE
+- Streaming NDJSON / CSV export and chunked bulk import of items
+- Item responses encoded straight to bytes (orjson), bypassing re-validation
+- Prometheus /metrics with per-route request counts and latency histograms
+- Indexed list filters (name, price, created_at) and full-text search (q)
+- O(1) item statistics from a trigger-maintained summary (/api/items/stats)
+- Optional read replicas with read-your-writes via an X-Last-Write position
+- Optional group commit of concurrent creates/updates (GROUP_COMMIT_MAX_BATCH)
+- Fast restarts: schema work skipped while its fingerprint matches, timings in /metrics
+- Pre-fork multi-worker server with worker recycling (python -m src.server)
+- Single-flight coalescing of identical concurrent item/list reads (SINGLE_FLIGHT)
+- Incremental change feed with tombstones and long-polling (/api/items/changes)
+- Item GET reads served from Core column selects, without ORM object construction
 """
 
+import asyncio
+import csv
+import io
+import logging
 import os
-from typing import Optional, List
+import time
+from datetime import datetime, timezone
+from typing import Optional, List, Literal
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Query, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, Query, Depends, HTTPException, Response, BackgroundTasks, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy import insert, update, delete, select
 from sqlalchemy.orm import Session
 
-from src.database import init_db, get_db, Item
+from src.database import DB_ASYNC, engine, init_db, get_db, Item
+from src.replicas import get_read_db
+from src import IMPORT_STARTED, changes, conditional, ingest, pagination, pool, reads, replicas, search, stats
+from src.serialization import ITEM_FIELDS, JSONBytesResponse, dumps, dumps_lines, item_payload
+from src.cache import ResponseCache, REVALIDATE
+from src.group_commit import GroupCommitter
+from src.singleflight import SingleFlight
+from src.metrics import MetricsMiddleware, RequestMetrics, gauge_lines, histogram_lines
+from src.schemas import (  # noqa: F401 — re-exported for existing imports
+    MAX_BATCH_SIZE,
+    ItemCreate,
+    ItemUpdate,
+    ItemResponse,
+    ItemBatchRequest,
+    ItemBatchResponse,
+    ItemBatchGetRequest,
+    ItemBatchGetResponse,
+    ItemChangesResponse,
+    ItemImportResult,
+    ItemStatsResponse,
+    ItemStatsVerification,
+)
 
 VERSION = os.environ.get("APP_VERSION", "0.1.0")
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+# Keeps IN (...) lists well under SQLite's bound-parameter limit.
+IN_CLAUSE_CHUNK = 500
+# Rows fetched (and flushed to the client) per round trip when exporting.
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", "1000"))
+# Longest a change-feed long-poll may be held, and how often it re-reads the
+# feed to notice writes made by other worker processes.
+CHANGES_MAX_WAIT = 60
+CHANGES_POLL_INTERVAL = float(os.environ.get("CHANGES_POLL_INTERVAL", "1"))
+
+# Disabled (0 entries) by default: each worker process keeps its own copy, so
+# enabling it trades up to ITEM_CACHE_TTL seconds of cross-worker staleness
+# for skipping the database on hot reads.
+item_cache = ResponseCache(
+    max_entries=int(os.environ.get("ITEM_CACHE_SIZE", "0")),
+    max_bytes=int(os.environ.get("ITEM_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl=float(os.environ.get("ITEM_CACHE_TTL", "5")),
+    stale_ttl=float(os.environ.get("ITEM_CACHE_STALE_TTL", "30")),
+)
+
+# Disabled (0) by default: coalescing concurrent creates/updates into shared
+# commits raises write throughput under bursts at the cost of up to
+# GROUP_COMMIT_WINDOW_MS of added latency per write.
+group_commit = GroupCommitter(
+    max_batch=int(os.environ.get("GROUP_COMMIT_MAX_BATCH", "0")),
+    window=float(os.environ.get("GROUP_COMMIT_WINDOW_MS", "2")) / 1000,
+)
+
+
+# Logged through uvicorn's logger so the report shows next to its startup lines.
+logger = logging.getLogger("uvicorn.error")
+
+# Seconds spent per startup phase, filled in by the lifespan handler.
+startup_timings = {"import": time.perf_counter() - IMPORT_STARTED}
+
+# Sparse fieldsets (see reads.requested_fields) that item reads have used as cache keys;
+# at most one per subset of ITEM_FIELDS.
+_sparse_fieldsets = set()
+
+# Wakes change-feed long-polls on writes made by this process.
+change_notifier = changes.ChangeNotifier()
+
+# Concurrent identical item/list reads that miss the cache share one query.
+read_coalescer = SingleFlight(enabled=os.environ.get("SINGLE_FLIGHT", "true").lower() == "true")
 
 
 # ── Lifespan event ────────────────────────────────────────────
 @asynccontextmanager
 async def lifespan(application: FastAPI):
-    """Initialize database tables on startup."""
-    init_db()
+    """
+    Bring the schema up to date, then start serving.
+
+    The pool is prewarmed in the background: requests arriving first simply
+    open their own connections.
+    """
+    started = time.perf_counter()
+    schema_applied = init_db()
+    startup_timings["schema"] = time.perf_counter() - started
+    startup_timings["schema_applied"] = int(schema_applied)
+    prewarm = asyncio.create_task(run_in_threadpool(pool.prewarm, engine))
+    logger.info(
+        "Startup: import %.0f ms, schema %s in %.0f ms",
+        startup_timings["import"] * 1000,
+        "applied" if schema_applied else "unchanged",
+        startup_timings["schema"] * 1000,
+    )
     yield
+    await prewarm
 
 
 app = FastAPI(title="sample-app-python", version=VERSION, lifespan=lifespan)
 
+request_metrics = RequestMetrics()
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=request_metrics)
 
-# ── Pydantic schemas ──────────────────────────────────────────
-class ItemCreate(BaseModel):
-    name: str
-    description: Optional[str] = None
-    price: float = 0.0
+if DB_ASYNC:
+    # Registered first so the async handlers take precedence over the sync
+    # CRUD routes declared below for the same paths; its item routes only
+    # match integer ids, so fixed paths such as /api/items/export still
+    # reach the sync handlers.
+    from src.aio import router as async_items_router
 
-
-class ItemUpdate(BaseModel):
-    name: Optional[str] = None
-    description: Optional[str] = None
-    price: Optional[float] = None
-
-
-class ItemResponse(BaseModel):
-    model_config = {"from_attributes": True}
-
-    id: int
-    name: str
-    description: Optional[str]
-    price: float
-    created_at: Optional[str]
-    updated_at: Optional[str]
+    app.include_router(async_items_router)
+    if group_commit.enabled:
+        logger.warning("GROUP_COMMIT_MAX_BATCH has no effect with DB_ASYNC: async writes commit one by one")
 
 
 # ── Original endpoints ────────────────────────────────────────
@@ -62,6 +158,57 @@ def health():
     return {"status": "ok", "version": VERSION}
 
 
+@app.get("/metrics", include_in_schema=False, response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of request, cache and connection pool metrics."""
+    lines = request_metrics.render()
+
+    cache = item_cache.stats()
+    for name in ("hits", "stale_hits", "misses", "evictions", "expirations", "invalidations"):
+        lines += gauge_lines(f"item_cache_{name}_total", cache[name], f"Item cache {name.replace('_', ' ')}.", "counter")
+    lines += gauge_lines("item_cache_entries", cache["entries"], "Entries in the item cache.")
+    lines += gauge_lines("item_cache_bytes", cache["bytes"], "Bytes of response bodies in the item cache.")
+
+    pool_info = pool.pool_stats(engine)
+    for name in ("size", "checked_out", "checked_in", "overflow"):
+        if name in pool_info:
+            lines += gauge_lines(f"db_pool_{name}", pool_info[name], f"Connection pool {name.replace('_', ' ')}.")
+    if "checkout_wait_seconds" in pool_info:
+        lines += gauge_lines("db_pool_timeouts_total", pool_info["timeouts"], "Pool checkout timeouts.", "counter")
+        lines += [
+            "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+            "# TYPE db_pool_checkout_wait_seconds histogram",
+        ]
+        lines += histogram_lines("db_pool_checkout_wait_seconds", pool_info["checkout_wait_seconds"])
+
+    lines += [
+        "# HELP app_startup_seconds Time spent in each startup phase.",
+        "# TYPE app_startup_seconds gauge",
+    ]
+    lines += [
+        f'app_startup_seconds{{phase="{phase}"}} {startup_timings[phase]}'
+        for phase in ("import", "schema")
+        if phase in startup_timings
+    ]
+    if "schema_applied" in startup_timings:
+        lines += gauge_lines(
+            "app_schema_applied", startup_timings["schema_applied"], "1 if the last startup applied schema changes."
+        )
+
+    if read_coalescer.enabled:
+        coalescing = read_coalescer.stats()
+        lines += gauge_lines("read_coalesce_loads_total", coalescing["loads"], "Reads that ran a query.", "counter")
+        lines += gauge_lines(
+            "read_coalesce_collapsed_total", coalescing["coalesced"], "Reads sharing a concurrent query.", "counter"
+        )
+
+    if group_commit.enabled:
+        batching = group_commit.stats()
+        for name in ("batches", "operations", "fallbacks"):
+            lines += gauge_lines(f"group_commit_{name}_total", batching[name], f"Group commit {name}.", "counter")
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/api/greet")
 def greet(name: str = Query(default="World")):
     """Greeting endpoint."""
@@ -71,63 +218,551 @@ def greet(name: str = Query(default="World")):
 # ── CRUD endpoints (database-backed) ─────────────────────────
 @app.post("/api/items", response_model=ItemResponse, status_code=201)
 def create_item(item: ItemCreate, db: Session = Depends(get_db)):
-    """Create a new item."""
-    db_item = Item(name=item.name, description=item.description, price=item.price)
-    db.add(db_item)
+    """Create a new item (a single INSERT ... RETURNING)."""
+    row = _execute_write(db, insert(Item).values(**item.model_dump()).returning(*reads.ITEM_COLUMNS))
+    _invalidate_items()
+    headers = {**_item_validators(row), **replicas.write_headers(db)}
+    return JSONBytesResponse(item_payload(row), status_code=201, headers=headers)
+
+
+@app.post("/api/items:batch", response_model=ItemBatchResponse)
+def batch_items(batch: ItemBatchRequest, db: Session = Depends(get_db)):
+    """
+    Apply creates, updates and deletes in a single transaction.
+
+    Each operation type runs as one multi-row statement (plus one lookup for
+    updates), so ingest cost is dominated by the database rather than by
+    per-item requests and commits. Results are reported per item, in request
+    order: creates, then updates, then deletes.
+    """
+    results = []
+
+    if batch.create:
+        rows = [item.model_dump() for item in batch.create]
+        # sort_by_parameter_order would force row-at-a-time INSERTs on SQLite;
+        # ids are assigned in VALUES order, so sorting by id restores it.
+        created = sorted(db.scalars(insert(Item).returning(Item), rows), key=lambda item: item.id)
+        results += [
+            {"op": "create", "id": item.id, "status": 201, "item": item_payload(item)} for item in created
+        ]
+
+    if batch.update:
+        ids = {change.id for change in batch.update}
+        existing = set()
+        for chunk in _chunks(list(ids), IN_CLAUSE_CHUNK):
+            existing.update(db.scalars(select(Item.id).where(Item.id.in_(chunk))))
+        now = datetime.now(timezone.utc)
+        params = [
+            {"id": change.id, "updated_at": now, **change.model_dump(exclude={"id"}, exclude_none=True)}
+            for change in batch.update
+            if change.id in existing
+        ]
+        if params:
+            db.execute(update(Item), params)
+        updated = {}
+        for chunk in _chunks(list(existing), IN_CLAUSE_CHUNK):
+            stmt = select(Item).where(Item.id.in_(chunk)).execution_options(populate_existing=True)
+            updated.update((item.id, item) for item in db.scalars(stmt))
+        for change in batch.update:
+            if change.id in updated:
+                results.append(
+                    {"op": "update", "id": change.id, "status": 200, "item": item_payload(updated[change.id])}
+                )
+            else:
+                results.append({"op": "update", "id": change.id, "status": 404, "detail": "Item not found"})
+
+    if batch.delete:
+        deleted = set()
+        for chunk in _chunks(list(set(batch.delete)), IN_CLAUSE_CHUNK):
+            stmt = delete(Item).where(Item.id.in_(chunk)).returning(Item.id)
+            deleted.update(db.scalars(stmt.execution_options(synchronize_session=False)))
+        for item_id in batch.delete:
+            if item_id in deleted:
+                results.append({"op": "delete", "id": item_id, "status": 204})
+                deleted.discard(item_id)
+            else:
+                results.append({"op": "delete", "id": item_id, "status": 404, "detail": "Item not found"})
+
     db.commit()
-    db.refresh(db_item)
-    return db_item.to_dict()
+    _invalidate_items(*(change.id for change in batch.update), *batch.delete)
+    return JSONBytesResponse({"results": results}, headers=replicas.write_headers(db))
+
+
+@app.post("/api/items:batchGet", response_model=ItemBatchGetResponse)
+def batch_get_items(
+    lookup: ItemBatchGetRequest,
+    fields: Optional[str] = Query(default=None, description="Comma-separated item fields to return (default: all)"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Fetch up to MAX_BATCH_GET_IDS items by id in one request.
+
+    Ids are resolved IN_CLAUSE_CHUNK at a time with ``id IN (...)`` queries
+    (a repeated id is returned once) and items come back in request order;
+    ids without an item are listed under ``missing``. Lookups larger than
+    one chunk are streamed: each chunk is encoded and sent before the next
+    is queried, so memory is bounded by the chunk, not the request. The
+    stream reads on its own session (bound like the request's), as it runs
+    after the handler has returned.
+    """
+    fields = reads.requested_fields(fields)
+    columns = reads.item_columns(fields, ("id",))
+    ids = list(dict.fromkeys(lookup.ids))
+    missing = []
+
+    def resolve(session, chunk):
+        found = {row.id: row for row in session.execute(select(*columns).where(Item.id.in_(chunk)))}
+        missing.extend(item_id for item_id in chunk if item_id not in found)
+        return [item_payload(found[item_id], fields) for item_id in chunk if item_id in found]
+
+    if len(ids) <= IN_CLAUSE_CHUNK:
+        return JSONBytesResponse({"items": resolve(db, ids), "missing": missing})
+    bind = db.get_bind()
+
+    def generate():
+        yield b'{"items":['
+        separator = b""
+        with Session(bind=bind) as session:
+            for chunk in _chunks(ids, IN_CLAUSE_CHUNK):
+                items = resolve(session, chunk)
+                if items:
+                    yield separator + dumps(items)[1:-1]
+                    separator = b","
+        yield b'],"missing":' + dumps(missing) + b"}"
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+@app.post(
+    "/api/items/import",
+    response_model=ItemImportResult,
+    openapi_extra={"requestBody": {"content": {"application/x-ndjson": {}, "text/csv": {}}, "required": True}},
+)
+async def import_items(
+    request: Request,
+    response: Response,
+    format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+    chunk_size: int = Query(default=IMPORT_CHUNK_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """
+    Bulk-import items from an NDJSON or CSV body (e.g. a previous export).
+
+    The body is read incrementally and validated and inserted in committed
+    chunks of ``chunk_size`` rows, so uploads of any size use bounded memory
+    (see ``src.ingest`` for expected throughput).
+    Invalid lines are skipped and reported; chunks committed before a
+    database error stay committed.
+    """
+    rows = ingest.parse_rows(ingest.body_lines(request.stream()), format)
+    try:
+        summary = await run_in_threadpool(ingest.import_rows, db, rows, chunk_size)
+    finally:
+        _invalidate_items()
+    response.headers.update(await run_in_threadpool(replicas.write_headers, db))
+    return summary
 
 
 @app.get("/api/items", response_model=List[ItemResponse])
 def list_items(
+    request: Request,
+    background_tasks: BackgroundTasks,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    sort: Literal["id", "name", "price", "created_at"] = Query(default="id"),
+    order: Literal["asc", "desc"] = Query(default="asc"),
+    cursor: Optional[str] = Query(default=None),
+    name: Optional[str] = Query(default=None, description="Exact name"),
+    name_prefix: Optional[str] = Query(default=None, description="Case-sensitive name prefix"),
+    min_price: Optional[float] = Query(default=None, ge=0),
+    max_price: Optional[float] = Query(default=None, ge=0),
+    created_after: Optional[datetime] = Query(default=None, description="Inclusive lower bound"),
+    created_before: Optional[datetime] = Query(default=None, description="Exclusive upper bound"),
+    q: Optional[str] = Query(default=None, max_length=256, description="Full-text search over name and description"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated item fields to return (default: all)"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    List items with pagination and optional filters.
+
+    Results are ordered by ``sort`` (ties broken by id). Full pages carry an
+    ``X-Next-Cursor`` header; passing it back as ``cursor`` continues with a
+    keyset scan, which stays fast on deep pages unlike ``skip``.
+
+    Filters are combined with AND and are evaluated in the database (see
+    ``src.search``); ``q`` requires every word to appear in the name or
+    description. Cursors stay valid as long as the same filters are passed.
+
+    ``fields`` (e.g. ``id,name,price``) narrows both the SELECT and each
+    returned object to those columns.
+
+    The ETag is derived from the page parameters and the database's write
+    position, so ``If-None-Match`` is answered with a 304 without running the
+    page query. Pages carry no ``Last-Modified``: no timestamp in the table
+    advances when an item is deleted.
+    """
+    fields = reads.requested_fields(fields)
+    filters = (name, name_prefix, min_price, max_price, created_after, created_before, q)
+    try:
+        stmt = pagination.paginate(
+            select(*reads.item_columns(fields, ("id", sort)))
+            .where(*search.item_filters(db.get_bind().dialect.name, *filters)),
+            skip, limit, sort, order, cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    key = ("list", skip, limit, sort, order, cursor, filters, fields)
+
+    def probe(session):
+        # A primary-key lookup: the position advances on every create, update and delete.
+        position = replicas.position(session)
+        if position is None:
+            return {}  # not maintained on this database: no validator to revalidate against
+        return conditional.validators(conditional.list_etag(key, position), None)
+
+    def load(session):
+        headers = probe(session)
+        rows = session.execute(stmt).all()
+        next_cursor = pagination.next_cursor(rows, limit, sort, order)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return dumps(reads.payloads(rows, fields)), headers
+
+    return _cached_read(key, load, db, background_tasks, request, probe)
+
+
+@app.get(
+    "/api/items/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+def export_items(format: Literal["ndjson", "csv"] = Query(default="ndjson"), db: Session = Depends(get_read_db)):
+    """
+    Stream every item as NDJSON (one object per line) or CSV, ordered by id.
+
+    Rows are fetched EXPORT_BATCH_SIZE at a time (server-side cursor on
+    PostgreSQL) and each batch is flushed before the next is read, so memory
+    stays flat regardless of table size and the first bytes go out immediately.
+    The body is read on its own session (bound like the request's, so replica
+    routing still applies), as it streams after the handler has returned.
+    """
+    stmt = select(*reads.ITEM_COLUMNS).order_by(Item.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    bind = db.get_bind()
+
+    def generate():
+        if format == "csv":
+            yield _csv_chunk([ITEM_FIELDS])
+        with Session(bind=bind) as session:
+            for partition in session.execute(stmt).partitions():
+                if format == "ndjson":
+                    yield dumps_lines(reads.payloads(partition))
+                else:
+                    yield _csv_chunk(_csv_values(row) for row in partition)
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    headers = {"Content-Disposition": f'attachment; filename="items.{format}"'}
+    return StreamingResponse(generate(), media_type=media_type, headers=headers)
+
+
+@app.get("/api/items/changes", response_model=ItemChangesResponse)
+async def item_changes(
+    since: Optional[str] = Query(default=None, description="Cursor from the previous response; omit for a full sync"),
+    limit: int = Query(default=1000, ge=1, le=10000),
+    wait: float = Query(default=0, ge=0, le=CHANGES_MAX_WAIT, description="Seconds to wait for a change if none"),
+    db: Session = Depends(get_read_db),
 ):
-    """List all items with pagination."""
-    items = db.query(Item).offset(skip).limit(limit).all()
-    return [item.to_dict() for item in items]
+    """
+    Items created, updated or deleted since ``since``, oldest change first.
+
+    Each item appears once, with its current state (``upsert``) or as a
+    ``delete`` tombstone. Store the returned ``cursor`` and pass it as
+    ``since`` next time; ``has_more`` means another page is ready now. With
+    ``wait``, a request that finds no changes is held until one arrives or
+    the wait runs out, so a synced client costs nothing while nothing changes.
+    """
+    try:
+        changes.decode_cursor(since)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    deadline = time.monotonic() + wait
+    while True:
+        seen = change_notifier.version
+        feed = await run_in_threadpool(changes.read, db, since, limit)
+        remaining = deadline - time.monotonic()
+        if feed["changes"] or remaining <= 0:
+            return JSONBytesResponse(feed)
+        await change_notifier.wait(seen, min(remaining, CHANGES_POLL_INTERVAL))
+
+
+@app.get("/api/items/stats", response_model=ItemStatsResponse)
+def item_stats(db: Session = Depends(get_read_db)):
+    """
+    Item count, price min/max/sum/avg and a price histogram.
+
+    Served from the summary tables that triggers on ``items`` keep current,
+    so the cost is the same for ten rows or ten million.
+    """
+    return stats.summary(db)
+
+
+@app.get("/api/items/stats:verify", response_model=ItemStatsVerification)
+def verify_item_stats(db: Session = Depends(get_db)):
+    """Compare the maintained summary against a full scan of the items table."""
+    return stats.verify(db)
+
+
+@app.post("/api/items/stats:recompute", response_model=ItemStatsResponse)
+def recompute_item_stats(db: Session = Depends(get_db)):
+    """Rebuild the summary from a full scan (locks out writers while it runs)."""
+    return stats.recompute(db)
 
 
 @app.get("/api/items/{item_id}", response_model=ItemResponse)
-def get_item(item_id: int, db: Session = Depends(get_db)):
-    """Get a single item by ID."""
-    item = db.query(Item).filter(Item.id == item_id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    return item.to_dict()
+def get_item(
+    item_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    fields: Optional[str] = Query(default=None, description="Comma-separated item fields to return (default: all)"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Get a single item by ID. Supports If-None-Match / If-Modified-Since.
+
+    ``fields`` narrows the SELECT and the response to those columns; each
+    fieldset is a separate representation with its own ETag.
+    """
+    fields = reads.requested_fields(fields)
+
+    def probe(session):
+        row = session.execute(select(Item.updated_at).where(Item.id == item_id)).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return conditional.validators(conditional.item_etag(item_id, row.updated_at, fields), row.updated_at)
+
+    def load(session):
+        row = session.execute(reads.item_by_id(fields), {"item_id": item_id}).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return dumps(reads.payloads((row,), fields)[0]), _item_validators(row, fields)
+
+    return _cached_read(_item_key(item_id, fields), load, db, background_tasks, request, probe)
 
 
 @app.put("/api/items/{item_id}", response_model=ItemResponse)
-def update_item(item_id: int, item_update: ItemUpdate, db: Session = Depends(get_db)):
-    """Update an existing item."""
-    item = db.query(Item).filter(Item.id == item_id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    if item_update.name is not None:
-        item.name = item_update.name
-    if item_update.description is not None:
-        item.description = item_update.description
-    if item_update.price is not None:
-        item.price = item_update.price
-    db.commit()
-    db.refresh(item)
-    return item.to_dict()
+def update_item(
+    item_id: int,
+    item_update: ItemUpdate,
+    if_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    """
+    Update an existing item.
+
+    Runs as one UPDATE ... RETURNING; a missing item shows up as no row
+    returned. With ``If-Match``, the item's current version is read first and
+    the update only applies if it is unchanged; the check is part of the
+    UPDATE itself, so concurrent writers cannot slip in between (412
+    Precondition Failed otherwise).
+    """
+    values = item_update.model_dump(exclude_none=True)
+    guard = _if_match_guard(db, item_id, if_match)
+    if not values:
+        row = db.execute(select(*reads.ITEM_COLUMNS).where(Item.id == item_id)).one_or_none()
+    else:
+        stmt = update(Item).where(Item.id == item_id, *guard).values(**values).returning(*reads.ITEM_COLUMNS)
+        row = _execute_write(db, stmt.execution_options(synchronize_session=False))
+    if row is None:
+        _raise_write_conflict(guard)
+    if values:
+        _invalidate_items(item_id)
+    headers = {**_item_validators(row), **replicas.write_headers(db)}
+    return JSONBytesResponse(item_payload(row), headers=headers)
 
 
 @app.delete("/api/items/{item_id}", status_code=204)
-def delete_item(item_id: int, db: Session = Depends(get_db)):
-    """Delete an item."""
-    item = db.query(Item).filter(Item.id == item_id).first()
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    db.delete(item)
+def delete_item(
+    item_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    """Delete an item (one DELETE ... RETURNING). With ``If-Match``, only if it still has that ETag."""
+    guard = _if_match_guard(db, item_id, if_match)
+    stmt = delete(Item).where(Item.id == item_id, *guard).returning(Item.id)
+    deleted = db.execute(stmt, execution_options={"synchronize_session": False}).scalar_one_or_none()
     db.commit()
+    if deleted is None:
+        _raise_write_conflict(guard)
+    _invalidate_items(item_id)
+    response.headers.update(replicas.write_headers(db))
     return None
 
 
+@app.get("/api/pool/stats")
+def pool_stats(db: Session = Depends(get_db)):
+    """Connection pool occupancy, overflow, timeouts and checkout-wait histogram."""
+    stats = pool.pool_stats(db.get_bind())
+    if replicas.replicas.enabled:
+        stats["replicas"] = [
+            {**pool.pool_stats(replica_engine), **usage}
+            for replica_engine, usage in zip(replicas.replicas.engines, replicas.replicas.stats()["replicas"])
+        ]
+        stats["replica_primary_fallbacks"] = replicas.replicas.fallbacks
+    return stats
+
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    """Item cache hit/miss/eviction counters and sizing, for tuning ITEM_CACHE_*, plus read coalescing."""
+    return {**item_cache.stats(), "single_flight": read_coalescer.stats()}
+
+
+# ── Helpers ───────────────────────────────────────────────────
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _csv_values(row) -> list:
+    """A row's CSV cells: timestamps in ISO 8601, as in JSON responses."""
+    return [value.isoformat() if isinstance(value, datetime) else value for value in row]
+
+
+def _cached_read(key, load, db: Session, background_tasks: BackgroundTasks, request: Request, probe) -> Response:
+    """
+    Serve ``key`` from the item cache, falling back to ``load(db)``.
+
+    ``load`` takes a session and returns ``(body_bytes, headers)``; ``probe``
+    returns just the validator headers, cheaply. Conditional requests that
+    miss the cache are checked against ``probe`` before anything is loaded.
+    Stale hits are served immediately; the first one schedules a background
+    refresh on a fresh session bound to the same engine as the request.
+
+    Misses are loaded through ``read_coalescer``: concurrent misses for the
+    same key run ``load`` once and share the result (and a single cache fill).
+
+    Reads carrying a read-your-writes position skip the lookup and load on
+    their own: the entry or a concurrent load may come from a replica that had
+    not caught up with that write.
+    """
+    pinned = replicas.replicas.enabled and replicas.requested_position(request) is not None
+    if pinned:
+        cached, state = None, None
+    else:
+        cached, state = item_cache.get(key)
+    if cached is not None:
+        if state == REVALIDATE:
+            background_tasks.add_task(_revalidate, key, load, db.get_bind(), item_cache.epoch)
+        body, headers = cached
+    else:
+        if _is_conditional(request):
+            headers = probe(db)
+            if conditional.not_modified(request.headers, headers):
+                return Response(status_code=304, headers=headers)
+
+        def fill():
+            epoch = item_cache.epoch
+            result = load(db)
+            item_cache.set(key, result, len(result[0]), epoch)
+            return result
+
+        body, headers = load(db) if pinned else read_coalescer.do(key, fill)
+    if conditional.not_modified(request.headers, headers):
+        return Response(status_code=304, headers=headers)
+    return JSONBytesResponse(body, headers=headers)
+
+
+def _is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _item_validators(item, fields=ITEM_FIELDS) -> dict:
+    return conditional.validators(conditional.item_etag(item.id, item.updated_at, fields), item.updated_at)
+
+
+def _item_key(item_id: int, fields) -> tuple:
+    """Cache key of one item representation; sparse fieldsets are remembered for invalidation."""
+    if fields == ITEM_FIELDS:
+        return ("item", item_id)
+    _sparse_fieldsets.add(fields)
+    return ("item", item_id, fields)
+
+
+def _execute_write(db: Session, statement):
+    """Run a single-row write and commit it, through group commit when enabled."""
+    if group_commit.enabled:
+        # The batch leader checks out its own connection; hand back the one an
+        # If-Match read left this session holding, or a small pool deadlocks.
+        db.rollback()
+        return group_commit.submit(db.get_bind(), statement)
+    row = db.execute(statement).one_or_none()
+    db.commit()
+    return row
+
+
+def _if_match_guard(db: Session, item_id: int, if_match) -> tuple:
+    """
+    Enforce If-Match for PUT/DELETE, returning extra WHERE clauses for the write.
+
+    Without the header nothing is read and the guard is empty. With it, the
+    item's current version is loaded (404 / 412 as appropriate) and the guard
+    pins the write to that version.
+    """
+    if if_match is None:
+        return ()
+    row = db.execute(select(Item.updated_at).where(Item.id == item_id)).one_or_none()
+    return _version_guard(item_id, if_match, row)
+
+
+def _version_guard(item_id: int, if_match: str, row) -> tuple:
+    """Check If-Match against ``row`` (the item's ``updated_at``, or None if missing) and pin the write to it."""
+    if row is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    if not conditional.if_match(if_match, conditional.item_etag(item_id, row[0])):
+        raise HTTPException(status_code=412, detail="Precondition failed: ETag does not match")
+    return (Item.updated_at == row[0],)
+
+
+def _raise_write_conflict(guard):
+    """A guarded write matched no row: the item changed (412) or never existed (404)."""
+    if guard:
+        raise HTTPException(status_code=412, detail="Item was modified concurrently")
+    raise HTTPException(status_code=404, detail="Item not found")
+
+
+def _revalidate(key, load, bind, epoch):
+    with Session(bind=bind) as db:
+        try:
+            body, headers = load(db)
+        except HTTPException:
+            item_cache.invalidate(key)
+            return
+        except Exception:
+            item_cache.release(key)
+            raise
+    item_cache.set(key, (body, headers), len(body), epoch)
+
+
+def _invalidate_items(*item_ids):
+    """Drop cached entries (and in-flight coalesced loads) for the given items and every list page."""
+    keys = [("item", item_id) for item_id in item_ids]
+    keys += [("item", item_id, fields) for fields in tuple(_sparse_fieldsets) for item_id in item_ids]
+    read_coalescer.forget(*keys)
+    read_coalescer.forget_namespace("list")
+    change_notifier.notify()
+    if item_cache.enabled:
+        item_cache.invalidate(*keys)
+        item_cache.invalidate_namespace("list")
+
+
+def _chunks(values, size):
+    """Split a list into consecutive slices of at most ``size`` elements."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
 if __name__ == "__main__":  # pragma: no cover
-    import uvicorn
+    from src.server import serve
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="127.0.0.1", port=port)
+    raise SystemExit(serve(app, host="127.0.0.1", port=port))
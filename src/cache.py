@@ -0,0 +1,186 @@
+"""
+In-process read-through cache for serialized item responses.
+
+Entries hold pre-rendered JSON bytes (plus any response headers), so a hit
+skips the database, the ORM and serialization entirely. The cache is bounded
+by entry count and total body bytes with LRU eviction, entries expire after a
+TTL, and expired entries may still be served for a grace period while one
+caller revalidates them (stale-while-revalidate).
+
+Write endpoints invalidate exactly the keys they affect. Loads note the
+cache's epoch (a write counter) when they start, and invalidations stamp the
+keys and namespaces they drop with the epoch; a load finishing after a write
+that stamped its key is discarded instead of re-populating the cache with
+stale data, while loads of unrelated keys still store their results.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+FRESH = "fresh"
+STALE = "stale"
+REVALIDATE = "revalidate"
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "stale_until", "revalidating")
+
+    def __init__(self, value, size, expires_at, stale_until):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.revalidating = False
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU + TTL cache keyed by tuples whose first element is a namespace.
+
+    ``max_entries=0`` disables the cache: lookups always miss and stores are
+    dropped, so callers never need a separate code path.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=5.0, stale_ttl=30.0,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._namespaces = {}
+        self._bytes = 0
+        self._epoch = 0
+        # Epoch of the latest invalidation per key / per namespace; loads that
+        # started before everything up to ``_floor`` are rejected outright.
+        self._invalidated = {}
+        self._invalidated_namespaces = {}
+        self._floor = 0
+        self._stats = dict.fromkeys(
+            ("hits", "stale_hits", "misses", "evictions", "expirations", "invalidations"), 0
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def epoch(self) -> int:
+        """Current write epoch; note it before loading and pass it back to ``set``."""
+        return self._epoch
+
+    def get(self, key):
+        """
+        Look up ``key`` and return ``(value, state)``.
+
+        ``state`` is FRESH, STALE, REVALIDATE (stale, and this caller should
+        refresh the entry) or None on a miss.
+        """
+        if not self.enabled:
+            return None, None
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self.clock()
+            if entry is not None and now >= entry.stale_until:
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None, None
+            self._entries.move_to_end(key)
+            if now < entry.expires_at:
+                self._stats["hits"] += 1
+                return entry.value, FRESH
+            self._stats["stale_hits"] += 1
+            if entry.revalidating:
+                return entry.value, STALE
+            entry.revalidating = True
+            return entry.value, REVALIDATE
+
+    def set(self, key, value, size, epoch):
+        """Store ``value`` unless ``key`` (or its namespace) was invalidated since ``epoch``."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if size > self.max_bytes or self._invalidated_since(key, epoch):
+                self._release(key)
+                return
+            if key in self._entries:
+                self._remove(key)
+            now = self.clock()
+            self._entries[key] = _Entry(value, size, now + self.ttl, now + self.ttl + self.stale_ttl)
+            self._namespaces.setdefault(key[0], set()).add(key)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def release(self, key):
+        """Give up a refresh handed out as REVALIDATE, so a later lookup retries it."""
+        with self._lock:
+            self._release(key)
+
+    def invalidate(self, *keys):
+        """Drop specific keys."""
+        with self._lock:
+            self._epoch += 1
+            for key in keys:
+                self._invalidated[key] = self._epoch
+                if key in self._entries:
+                    self._remove(key)
+                    self._stats["invalidations"] += 1
+
+    def invalidate_namespace(self, namespace):
+        """Drop every key in a namespace (e.g. all cached list pages)."""
+        with self._lock:
+            self._epoch += 1
+            self._invalidated_namespaces[namespace] = self._epoch
+            for key in list(self._namespaces.get(namespace, ())):
+                self._remove(key)
+                self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._floor = self._epoch
+            self._invalidated.clear()
+            self._entries.clear()
+            self._namespaces.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_ratio": (self._stats["hits"] + self._stats["stale_hits"]) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+            }
+
+    def _invalidated_since(self, key, epoch) -> bool:
+        if len(self._invalidated) > max(1024, 4 * self.max_entries):
+            # Bound the per-key stamps: forget them all, at the price of
+            # rejecting the loads that are in flight right now.
+            self._floor = self._epoch
+            self._invalidated.clear()
+        stamp = max(self._floor, self._invalidated.get(key, 0), self._invalidated_namespaces.get(key[0], 0))
+        return stamp > epoch
+
+    def _release(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.revalidating = False
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._namespaces[key[0]].discard(key)
+        self._bytes -= entry.size
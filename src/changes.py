@@ -0,0 +1,127 @@
+"""
+Incremental change feed over ``items``.
+
+Triggers keep one ``item_changes`` row per item id, stamped with a
+monotonic ``seq`` on every create, update and delete (deletes leave a
+tombstone). A client syncs by reading the changes after its cursor in
+``(seq, item_id)`` order, each carrying the item's current state, and
+storing the returned cursor for the next call; the first call (no cursor)
+returns every item. Each call costs an index range scan over the rows that
+changed since the cursor, however large the table is.
+
+Tombstones are kept indefinitely (one row per deleted id), so any cursor
+stays valid.
+
+``ChangeNotifier`` lets long-polling requests sleep until a write in this
+process wakes them; writes made by other processes are picked up by
+re-reading the feed every ``poll_interval`` seconds.
+"""
+
+import asyncio
+import base64
+import binascii
+import json
+import threading
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from src.database import Item, ItemChange
+from src.reads import ITEM_COLUMNS
+from src.serialization import item_payload
+
+
+def encode_cursor(seq: int, item_id: int) -> str:
+    payload = json.dumps([seq, item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token) -> tuple:
+    """``(seq, item_id)`` of a cursor, ``(0, 0)`` for None. Raises ValueError if malformed."""
+    if token is None:
+        return 0, 0
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        seq, item_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(seq, int) or not isinstance(item_id, int):
+        raise ValueError("Invalid cursor")
+    return seq, item_id
+
+
+def read(db: Session, cursor, limit: int) -> dict:
+    """
+    Up to ``limit`` changes after ``cursor``, with the cursor to continue from.
+
+    Ends the session's transaction, so a long-poll holds no connection (and
+    sees fresh data) between reads.
+    """
+    after = decode_cursor(cursor)
+    stmt = (
+        select(ItemChange.seq, ItemChange.item_id, ItemChange.deleted, *ITEM_COLUMNS)
+        .outerjoin(Item, Item.id == ItemChange.item_id)
+        .where(tuple_(ItemChange.seq, ItemChange.item_id) > tuple_(*after))
+        .order_by(ItemChange.seq, ItemChange.item_id)
+        .limit(limit + 1)
+    )
+    try:
+        rows = db.execute(stmt).all()
+    finally:
+        db.rollback()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes = []
+    for row in rows:
+        if row.deleted or row.id is None:
+            changes.append({"op": "delete", "id": row.item_id})
+        else:
+            changes.append({"op": "upsert", "id": row.item_id, "item": item_payload(row)})
+    if rows:
+        cursor = encode_cursor(rows[-1].seq, rows[-1].item_id)
+    else:
+        cursor = encode_cursor(*after)
+    return {"changes": changes, "cursor": cursor, "has_more": has_more}
+
+
+class ChangeNotifier:
+    """Wakes coroutines waiting for item writes; ``notify`` may be called from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = set()
+        # Bumped by every notify; read it before reading the feed so a write
+        # landing in between is not slept through.
+        self.version = 0
+
+    async def wait(self, seen_version: int, timeout: float) -> bool:
+        """Sleep until a ``notify`` after ``seen_version`` or ``timeout``; returns whether notified."""
+        loop = asyncio.get_running_loop()
+        waiter = (loop, loop.create_future())
+        with self._lock:
+            if self.version != seen_version:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1], timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def notify(self):
+        with self._lock:
+            self.version += 1
+            waiters = list(self._waiters)
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # its event loop has closed
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,82 @@
+"""
+HTTP validators (ETag / Last-Modified) and conditional request checks.
+
+Item ETags are strong and derived from the item id and ``updated_at`` (plus
+the fieldset, for sparse representations), so they can be computed from a
+single-column lookup without building the response.
+List ETags are derived from the page parameters plus the write position
+(see ``WritePosition`` in src.database), a single-row counter that every
+create, update and delete advances. Lists have no ``Last-Modified``, as
+deletes leave no newer timestamp behind.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from src.serialization import ITEM_FIELDS
+
+
+def _etag(*parts) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def item_etag(item_id: int, updated_at, fields=ITEM_FIELDS) -> str:
+    parts = ("item", item_id, updated_at.isoformat() if updated_at else None)
+    if fields != ITEM_FIELDS:
+        # A sparse fieldset is a different representation of the same item.
+        parts += (fields,)
+    return _etag(*parts)
+
+
+def list_etag(key, position: int) -> str:
+    return _etag(key, position)
+
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp as an HTTP-date (naive timestamps are stored as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def validators(etag: str, last_modified) -> dict:
+    """Response headers carrying the validators for a representation."""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _parse_etags(header: str):
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def not_modified(request_headers, headers: dict) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against response validators.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    it is absent, as RFC 9110 requires.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _parse_etags(if_none_match)
+        return "*" in tags or headers.get("ETag") in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = headers.get("Last-Modified")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def if_match(header, etag: str) -> bool:
+    """Return True when an If-Match header is absent or matches ``etag``."""
+    if header is None:
+        return True
+    tags = {tag.strip() for tag in header.split(",")}
+    return "*" in tags or etag in tags
@@ -3,24 +3,172 @@ Database module — SQLAlchemy models and connection management.
 
 Uses SQLite for local development and PostgreSQL in CI (via service containers).
 The DATABASE_URL environment variable controls which database is used.
+
+Setting DB_ASYNC=true switches the CRUD endpoints to an AsyncEngine built from
+the same URL (aiosqlite / asyncpg drivers). The async engine and its driver are
+only imported when first used, so the sync path has no extra dependencies.
+
+SQLite engines get a performance profile by default (SQLITE_PROFILE=performance):
+per-connection pragmas for WAL journaling, synchronous=NORMAL, memory-mapped
+I/O, a larger page cache, a busy timeout and in-memory temp storage, each
+overridable through SQLITE_* environment variables. SQLITE_PROFILE=off keeps
+SQLite's defaults.
+
+Pool sizing and liveness checks come from DB_POOL_* variables (see src.pool).
+
+Full-text search over item names and descriptions uses an external-content
+FTS5 table on SQLite, kept in sync by triggers on ``items``, and a GIN
+expression index over ``to_tsvector`` on PostgreSQL, which the database
+maintains itself. Both are created alongside the ``items`` table.
+
+Aggregate statistics (count, price sum, price-bucket counts) live in the
+``item_stats`` and ``item_price_buckets`` tables, kept current by row triggers
+on ``items`` so every write path — ORM, batch, import, raw SQL — updates them
+in the same transaction (see src.stats).
+
+Every write to ``items`` also advances the single ``write_position`` row, a
+portable replication position: read replicas (DATABASE_REPLICA_URLS, see
+src.replicas) report how far they have caught up by their copy of that row.
+
+``item_changes`` holds the latest change per item id — an upsert or a
+tombstone — stamped with a ``seq`` drawn from that same counter, which backs
+the incremental change feed (see src.changes).
+
+``init_db`` records a fingerprint of the schema DDL in ``schema_version`` and
+skips all schema work on later starts while it still matches (SCHEMA_CHECK).
 """
 
+import hashlib
+import logging
 import os
+import weakref
 from datetime import datetime, timezone
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float
+from sqlalchemy import (
+    create_engine, event, exc, exists, false, func, insert, literal, make_url, select, text, update,
+    BigInteger, Boolean, Column, Integer, String, DateTime, Float, Index,
+)
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.pool import StaticPool
+
+from src import pool
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./app.db")
 
 # Handle PostgreSQL URL scheme (SQLAlchemy requires postgresql://)
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    echo=os.environ.get("SQL_ECHO", "").lower() == "true",
-)
+DB_ASYNC = os.environ.get("DB_ASYNC", "").lower() == "true"
+
+# "fingerprint" skips schema work at startup when the stored DDL fingerprint
+# matches; "always" re-applies it on every start.
+SCHEMA_CHECK = os.environ.get("SCHEMA_CHECK", "fingerprint").lower()
+# Part of the fingerprint: bump when init_db's own steps change, so databases
+# whose fingerprint was stored by an earlier version get them applied once.
+SCHEMA_REVISION = 3
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_url(url: str) -> str:
+    """Translate a sync database URL to its async-driver equivalent."""
+    scheme, sep, rest = url.partition("://")
+    backend = scheme.split("+", 1)[0]
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' URLs")
+    return ASYNC_DRIVERS[backend] + sep + rest
+
+
+SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "performance").lower()
+
+# Applied with PRAGMA on every new SQLite connection under the performance profile.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "cache_size": os.environ.get("SQLITE_CACHE_SIZE", "-64000"),  # negative = KiB, i.e. ~64 MB
+    "busy_timeout": os.environ.get("SQLITE_BUSY_TIMEOUT", "5000"),  # ms
+    "temp_store": os.environ.get("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
+
+def apply_sqlite_profile(sync_engine):
+    """Register a connect hook that applies SQLITE_PRAGMAS to each new connection."""
+    if SQLITE_PROFILE != "performance":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def dispose_in_forked_children(sync_engine):
+    """
+    Give forked child processes (src.server workers) their own pool.
+
+    A connection inherited across fork shares its socket with the parent;
+    the child drops the inherited pool without closing those connections,
+    which still belong to the parent, and opens its own on demand.
+    """
+    ref = weakref.ref(sync_engine)
+
+    def _dispose():
+        forked = ref()
+        if forked is not None:
+            forked.dispose(close=False)
+
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_dispose)
+
+
+def create_db_engine(url: str, **kwargs):
+    """
+    Create an engine for ``url`` with the settings this app expects.
+
+    Engines use the instrumented, DB_POOL_*-sized QueuePool. SQLite
+    connections are local, so they are never pinged, may be used across
+    FastAPI's worker threads, and get the performance profile; in-memory
+    databases share one connection so every session sees the same data.
+    Forked children start with an empty pool.
+    """
+    options = {"echo": os.environ.get("SQL_ECHO", "").lower() == "true"}
+    if _is_sqlite_memory(url):
+        options["poolclass"] = StaticPool
+    else:
+        options.update(pool.engine_options())
+    if _is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+        options["pool_pre_ping"] = False
+    options.update(kwargs)
+    new_engine = create_engine(url, **options)
+    dispose_in_forked_children(new_engine)
+    if _is_sqlite(url):
+        apply_sqlite_profile(new_engine)
+    elif pool.PRE_PING == "interval":
+        pool.install_interval_ping(new_engine)
+    return new_engine
+
+
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -30,9 +178,15 @@ class Item(Base):
     """A simple item model for CRUD operations."""
 
     __tablename__ = "items"
+    __table_args__ = (
+        # Composite (sort key, id) indexes back keyset pagination on each sort key.
+        Index("ix_items_name_id", "name", "id"),
+        Index("ix_items_price_id", "price", "id"),
+        Index("ix_items_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    name = Column(String(255), nullable=False, index=True)
+    name = Column(String(255), nullable=False)
     description = Column(String(1024), nullable=True)
     price = Column(Float, nullable=False, default=0.0)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -49,9 +203,444 @@ class Item(Base):
         }
 
 
-def init_db():
-    """Create all tables. Safe to call multiple times."""
-    Base.metadata.create_all(bind=engine)
+# Text searched by full-text queries; the PostgreSQL index below and queries must
+# use this exact expression for the planner to match them up.
+SEARCH_CONFIG = text("'simple'")
+search_vector = func.to_tsvector(
+    SEARCH_CONFIG,
+    func.coalesce(Item.__table__.c.name, text("''"))
+    + text("' '")
+    + func.coalesce(Item.__table__.c.description, text("''")),
+)
+
+# PostgreSQL-only indexes, kept as plain DDL: declaring them on the table with
+# postgresql_* options would import the PostgreSQL dialect on every boot.
+POSTGRESQL_INDEX_DDL = (
+    # PostgreSQL only uses a b-tree for LIKE 'prefix%' under a pattern opclass.
+    "CREATE INDEX IF NOT EXISTS ix_items_name_pattern ON items (name text_pattern_ops, id)",
+    "CREATE INDEX IF NOT EXISTS ix_items_search ON items "
+    "USING gin (to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '')))",
+)
+
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE items_fts USING fts5(name, description, content='items', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF name, description ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO items_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+)
+
+
+def install_postgresql_indexes(connection):
+    """Create the PostgreSQL-only indexes on ``items`` if missing."""
+    if connection.dialect.name != "postgresql":
+        return
+    for statement in POSTGRESQL_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+
+
+# Indexes earlier revisions created that nothing reads any more; dropped on
+# upgrade so they stop costing a write on every insert and update.
+RETIRED_INDEXES = ("ix_items_updated_at",)
+
+
+def install_indexes(connection):
+    """Create any missing model indexes, and the PostgreSQL-only ones, on existing tables."""
+    for name in RETIRED_INDEXES:
+        connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    install_postgresql_indexes(connection)
+
+
+def install_sqlite_fts(connection):
+    """Create the FTS5 index and its sync triggers if missing, indexing existing rows."""
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+    ).first()
+    if exists:
+        return
+    for statement in SQLITE_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+
+
+@event.listens_for(Item.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    install_sqlite_fts(connection)
+    install_postgresql_indexes(connection)
+
+
+@event.listens_for(Item.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    # The triggers go with the items table; the virtual table has to be dropped explicitly.
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS items_fts")
+
+
+# Upper edges of the price histogram buckets; the last bucket is unbounded.
+# The bucket tables and triggers are rebuilt at startup if these change.
+PRICE_BUCKETS = (10.0, 50.0, 100.0, 500.0, 1000.0)
+
+
+class ItemStats(Base):
+    """Running totals over ``items`` (a single row, id=1), maintained by triggers."""
+
+    __tablename__ = "item_stats"
+
+    id = Column(Integer, primary_key=True)
+    item_count = Column(Integer, nullable=False, default=0)
+    price_sum = Column(Float, nullable=False, default=0.0)
+
+
+class ItemPriceBucket(Base):
+    """Item count per price bucket ``[lower, upper)``, maintained by triggers."""
+
+    __tablename__ = "item_price_buckets"
+
+    bucket = Column(Integer, primary_key=True)
+    lower = Column(Float, nullable=True)
+    upper = Column(Float, nullable=True)
+    item_count = Column(Integer, nullable=False, default=0)
+
+
+def price_bucket_bounds():
+    """``(bucket, lower, upper)`` for each configured price bucket (None = unbounded)."""
+    edges = (None, *PRICE_BUCKETS, None)
+    return [(index, edges[index], edges[index + 1]) for index in range(len(edges) - 1)]
+
+
+def _bucket_of(price_sql: str) -> str:
+    cases = " ".join(f"WHEN {price_sql} < {upper!r} THEN {index}" for index, upper in enumerate(PRICE_BUCKETS))
+    return f"CASE {cases} ELSE {len(PRICE_BUCKETS)} END"
+
+
+def _stats_delta(row: str, sign: str) -> list:
+    """SQL statements applying one row's contribution (``new``/``old``) to the summary."""
+    return [
+        f"UPDATE item_stats SET item_count = item_count {sign} 1, price_sum = price_sum {sign} {row}.price WHERE id = 1",
+        f"UPDATE item_price_buckets SET item_count = item_count {sign} 1 WHERE bucket = {_bucket_of(row + '.price')}",
+    ]
+
+
+def _sqlite_stats_ddl() -> list:
+    def trigger(name, event_sql, statements):
+        body = "".join(f"{statement};\n" for statement in statements)
+        return f"CREATE TRIGGER {name} AFTER {event_sql} ON items BEGIN\n{body}END"
+
+    return [
+        "DROP TRIGGER IF EXISTS items_stats_insert",
+        "DROP TRIGGER IF EXISTS items_stats_delete",
+        "DROP TRIGGER IF EXISTS items_stats_update",
+        trigger("items_stats_insert", "INSERT", _stats_delta("new", "+")),
+        trigger("items_stats_delete", "DELETE", _stats_delta("old", "-")),
+        trigger(
+            "items_stats_update",
+            "UPDATE OF price",
+            _stats_delta("old", "-") + _stats_delta("new", "+"),
+        ),
+    ]
+
+
+def _postgresql_stats_apply(delta_sql: str) -> list:
+    """Statements applying ``delta_sql`` rows ``(n, price)`` (n = +1 / -1) to the summary in one update each."""
+    return [
+        f"""WITH delta AS ({delta_sql})
+        UPDATE item_stats SET item_count = item_count + d.n, price_sum = price_sum + d.s
+        FROM (SELECT sum(n) AS n, sum(n * price) AS s FROM delta HAVING count(*) > 0) d
+        WHERE id = 1""",
+        f"""WITH delta AS ({delta_sql})
+        UPDATE item_price_buckets b SET item_count = b.item_count + d.n
+        FROM (SELECT {_bucket_of('price')} AS bucket, sum(n) AS n FROM delta GROUP BY 1 HAVING sum(n) <> 0) d
+        WHERE b.bucket = d.bucket""",
+    ]
+
+
+def _postgresql_stats_ddl() -> list:
+    # Statement-level triggers over transition tables: a statement updates the
+    # hot summary row once with its aggregated delta, however many rows it wrote.
+    # Transition tables rule out UPDATE OF price, so updates keep only the rows
+    # whose price changed.
+    changed = "FROM old_rows o JOIN new_rows n USING (id) WHERE o.price IS DISTINCT FROM n.price"
+    branches = {
+        "INSERT": _postgresql_stats_apply("SELECT 1 AS n, price FROM new_rows"),
+        "DELETE": _postgresql_stats_apply("SELECT -1 AS n, price FROM old_rows"),
+        "UPDATE": _postgresql_stats_apply(
+            f"SELECT -1 AS n, o.price {changed} UNION ALL SELECT 1, n.price {changed}"
+        ),
+    }
+    body = "".join(
+        f"    {'IF' if index == 0 else 'ELSIF'} TG_OP = '{op}' THEN\n"
+        + "".join(f"        {statement};\n" for statement in statements)
+        for index, (op, statements) in enumerate(branches.items())
+    )
+    statements = [
+        f"""CREATE OR REPLACE FUNCTION items_stats_sync() RETURNS trigger AS $$
+BEGIN
+{body}    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        # The per-row trigger this replaces.
+        "DROP TRIGGER IF EXISTS items_stats_sync ON items",
+    ]
+    for op, transition in (("INSERT", "NEW TABLE AS new_rows"), ("DELETE", "OLD TABLE AS old_rows"),
+                           ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows")):
+        statements += [
+            f"DROP TRIGGER IF EXISTS items_stats_{op.lower()} ON items",
+            f"CREATE TRIGGER items_stats_{op.lower()} AFTER {op} ON items REFERENCING {transition} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION items_stats_sync()",
+        ]
+    return statements
+
+
+def recompute_item_stats(connection):
+    """Rebuild the summary tables from a full scan of ``items``."""
+    if connection.dialect.name == "postgresql":
+        # Keep writers (and their trigger updates) out until the new totals commit.
+        connection.exec_driver_sql("LOCK TABLE items IN SHARE MODE")
+    connection.execute(ItemPriceBucket.__table__.delete())
+    connection.execute(
+        ItemPriceBucket.__table__.insert(),
+        [{"bucket": b, "lower": lower, "upper": upper, "item_count": 0} for b, lower, upper in price_bucket_bounds()],
+    )
+    connection.exec_driver_sql(
+        f"UPDATE item_price_buckets SET item_count = (SELECT count(*) FROM items WHERE "
+        f"{_bucket_of('items.price')} = item_price_buckets.bucket)"
+    )
+    connection.execute(ItemStats.__table__.delete())
+    connection.exec_driver_sql(
+        "INSERT INTO item_stats (id, item_count, price_sum) "
+        "SELECT 1, count(*), coalesce(sum(price), 0) FROM items"
+    )
+
+
+def install_item_stats(connection):
+    """(Re)create the summary triggers and rebuild the summary if it is missing or stale."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = _sqlite_stats_ddl()
+    elif dialect == "postgresql":
+        statements = _postgresql_stats_ddl()
+    else:
+        logger.warning("Item statistics triggers are not implemented for %s; /api/items/stats is not maintained",
+                       dialect)
+        return
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+    stored = connection.execute(
+        select(ItemPriceBucket.bucket, ItemPriceBucket.lower, ItemPriceBucket.upper).order_by(ItemPriceBucket.bucket)
+    ).all()
+    has_totals = connection.execute(select(ItemStats.id).where(ItemStats.id == 1)).first() is not None
+    if not has_totals or [tuple(row) for row in stored] != price_bucket_bounds():
+        recompute_item_stats(connection)
+
+
+class WritePosition(Base):
+    """Counter advanced by every write to ``items`` (a single row, id=1), maintained by triggers."""
+
+    __tablename__ = "write_position"
+
+    id = Column(Integer, primary_key=True)
+    seq = Column(BigInteger, nullable=False, default=0)
+
+
+_ADVANCE_POSITION = "UPDATE write_position SET seq = seq + 1 WHERE id = 1"
+
+
+def _write_position_ddl(dialect: str) -> list:
+    # The change-feed triggers (see _item_changes_ddl) advance the position as
+    # they stamp each change; the triggers that used to advance it on their own
+    # are dropped so every write bumps the hot row once.
+    if dialect == "sqlite":
+        return [f"DROP TRIGGER IF EXISTS items_position_{op}" for op in ("insert", "update", "delete")]
+    if dialect == "postgresql":
+        return [
+            "DROP TRIGGER IF EXISTS items_advance_position ON items",
+            "DROP FUNCTION IF EXISTS items_advance_position()",
+            # Created as int4 before seq became a BigInteger; a no-op once it is bigint.
+            "ALTER TABLE write_position ALTER COLUMN seq TYPE bigint",
+        ]
+    return []
+
+
+def install_write_position(connection):
+    """
+    Drop the superseded position triggers and seed the ``write_position`` row.
+
+    On dialects without change-feed triggers nothing would advance it, so the
+    row is left out and readers see no position at all.
+    """
+    if connection.dialect.name not in ("sqlite", "postgresql"):
+        logger.warning("Write position triggers are not implemented for %s; replica pinning and list ETags are off",
+                       connection.dialect.name)
+        return
+    for statement in _write_position_ddl(connection.dialect.name):
+        connection.exec_driver_sql(statement)
+    if connection.execute(select(WritePosition.id).where(WritePosition.id == 1)).first() is None:
+        connection.execute(WritePosition.__table__.insert().values(id=1, seq=0))
+
+
+class ItemChange(Base):
+    """Latest change per item id (upsert or tombstone), ordered by ``seq``; maintained by triggers."""
+
+    __tablename__ = "item_changes"
+    __table_args__ = (Index("ix_item_changes_seq_item_id", "seq", "item_id"),)
+
+    item_id = Column(Integer, primary_key=True, autoincrement=False)
+    seq = Column(BigInteger, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+
+
+def _record_change(rows_sql: str) -> str:
+    return (
+        f"INSERT INTO item_changes (item_id, seq, deleted) {rows_sql} "
+        "ON CONFLICT (item_id) DO UPDATE SET seq = excluded.seq, deleted = excluded.deleted"
+    )
+
+
+def _item_changes_ddl(dialect: str) -> list:
+    # Each change takes its own step of the write_position counter. Bumping
+    # the counter row also serializes writers until they commit, so changes
+    # become visible in seq order and a reader's cursor never skips one.
+    if dialect == "sqlite":
+        def trigger(op, row, deleted):
+            return (
+                f"CREATE TRIGGER items_changes_{op.lower()} AFTER {op} ON items BEGIN\n"
+                f"{_ADVANCE_POSITION};\n"
+                f"{_record_change(f'SELECT {row}.id, seq, {deleted} FROM write_position WHERE id = 1')};\n"
+                "END"
+            )
+
+        statements = [f"DROP TRIGGER IF EXISTS items_changes_{op}" for op in ("insert", "update", "delete")]
+        return statements + [trigger("INSERT", "new", "0"), trigger("UPDATE", "new", "0"), trigger("DELETE", "old", "1")]
+    if dialect == "postgresql":
+        # Statement-level with transition tables: one seq per statement, shared
+        # by its rows (the feed orders by seq, then item_id).
+        statements = [
+            f"""CREATE OR REPLACE FUNCTION items_record_changes() RETURNS trigger AS $$
+DECLARE
+    next_seq bigint;
+BEGIN
+    {_ADVANCE_POSITION} RETURNING seq INTO next_seq;
+    IF TG_OP = 'DELETE' THEN
+        {_record_change('SELECT id, next_seq, true FROM old_rows')};
+    ELSE
+        {_record_change('SELECT id, next_seq, false FROM new_rows')};
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql""",
+        ]
+        for op, transition in (("INSERT", "NEW TABLE AS new_rows"), ("UPDATE", "NEW TABLE AS new_rows"),
+                               ("DELETE", "OLD TABLE AS old_rows")):
+            statements += [
+                f"DROP TRIGGER IF EXISTS items_changes_{op.lower()} ON items",
+                f"CREATE TRIGGER items_changes_{op.lower()} AFTER {op} ON items REFERENCING {transition} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION items_record_changes()",
+            ]
+        return statements
+    return []
+
+
+def install_item_changes(connection):
+    """(Re)create the change-feed triggers and enter items written before the feed existed."""
+    if connection.dialect.name not in ("sqlite", "postgresql"):
+        logger.warning("Change feed triggers are not implemented for %s; /api/items/changes is not maintained",
+                       connection.dialect.name)
+        return
+    for statement in _item_changes_ddl(connection.dialect.name):
+        connection.exec_driver_sql(statement)
+    unrecorded = ~exists().where(ItemChange.item_id == Item.id)
+    if connection.execute(select(Item.id).where(unrecorded).limit(1)).first() is not None:
+        connection.execute(update(WritePosition).where(WritePosition.id == 1).values(seq=WritePosition.seq + 1))
+        seq = connection.scalar(select(WritePosition.seq).where(WritePosition.id == 1))
+        connection.execute(
+            insert(ItemChange).from_select(
+                ["item_id", "seq", "deleted"], select(Item.id, literal(seq), false()).where(unrecorded)
+            )
+        )
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_triggers(target, connection, **kw):
+    install_item_stats(connection)
+    install_write_position(connection)
+    install_item_changes(connection)
+
+
+class SchemaVersion(Base):
+    """Fingerprint of the schema last applied by ``init_db`` (a single row, id=1)."""
+
+    __tablename__ = "schema_version"
+
+    id = Column(Integer, primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    applied_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+def schema_fingerprint(dialect) -> str:
+    """Hash of all DDL ``init_db`` would apply on ``dialect``: tables, indexes and triggers."""
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        statements += [
+            str(CreateIndex(index).compile(dialect=dialect)) for index in sorted(table.indexes, key=lambda i: i.name)
+        ]
+    if dialect.name == "sqlite":
+        statements += [*SQLITE_FTS_DDL, *_sqlite_stats_ddl()]
+    elif dialect.name == "postgresql":
+        statements += [*POSTGRESQL_INDEX_DDL, *_postgresql_stats_ddl()]
+    statements += _write_position_ddl(dialect.name) + _item_changes_ddl(dialect.name)
+    statements.append(repr(price_bucket_bounds()))
+    statements.append(f"revision {SCHEMA_REVISION}")
+    return hashlib.sha256("\n;\n".join(statements).encode()).hexdigest()
+
+
+def _stored_fingerprint(bind):
+    try:
+        with bind.connect() as connection:
+            return connection.scalar(select(SchemaVersion.fingerprint).where(SchemaVersion.id == 1))
+    except exc.DBAPIError:
+        # No schema_version table yet (new or pre-fingerprint database).
+        return None
+
+
+def init_db(bind=None) -> bool:
+    """
+    Create all tables, indexes and triggers. Safe to call multiple times.
+
+    The DDL is fingerprinted and the fingerprint stored in ``schema_version``;
+    when it matches, startup skips create_all (and its trigger reinstalls,
+    which take table locks on PostgreSQL) entirely. SCHEMA_CHECK=always
+    re-applies the schema on every start regardless. Returns whether any
+    schema work ran.
+    """
+    bind = bind or engine
+    fingerprint = schema_fingerprint(bind.dialect)
+    if SCHEMA_CHECK != "always" and _stored_fingerprint(bind) == fingerprint:
+        return False
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as connection:
+        # create_all skips existing tables along with their indexes, so indexes
+        # added since a database was created are created here.
+        install_indexes(connection)
+        # Databases created before full-text search existed still need the index.
+        install_sqlite_fts(connection)
+        connection.execute(SchemaVersion.__table__.delete())
+        connection.execute(SchemaVersion.__table__.insert().values(id=1, fingerprint=fingerprint))
+    return True
 
 
 def get_db():
@@ -61,3 +650,43 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_engine():
+    """Return the lazily created AsyncEngine (ASYNC_DATABASE_URL or derived from DATABASE_URL)."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        url = os.environ.get("ASYNC_DATABASE_URL") or async_url(DATABASE_URL)
+        options = {"echo": os.environ.get("SQL_ECHO", "").lower() == "true"}
+        if _is_sqlite_memory(url):
+            # One shared connection, as create_db_engine does; StaticPool takes no sizing arguments.
+            options["poolclass"] = StaticPool
+        else:
+            options.update(
+                pool_size=pool.POOL_SIZE,
+                max_overflow=pool.MAX_OVERFLOW,
+                pool_timeout=pool.POOL_TIMEOUT,
+                pool_recycle=pool.POOL_RECYCLE,
+                pool_pre_ping=not _is_sqlite(url) and pool.PRE_PING == "always",
+            )
+        _async_engine = create_async_engine(url, **options)
+        dispose_in_forked_children(_async_engine.sync_engine)
+        if _is_sqlite(url):
+            apply_sqlite_profile(_async_engine.sync_engine)
+        elif pool.PRE_PING == "interval":
+            pool.install_interval_ping(_async_engine.sync_engine)
+        _async_sessionmaker = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db():
+    """Async dependency for FastAPI — yields an AsyncSession."""
+    get_async_engine()
+    async with _async_sessionmaker() as db:
+        yield db
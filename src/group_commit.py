@@ -0,0 +1,113 @@
+"""
+Group commit: coalesce concurrent single-row writes into shared transactions.
+
+Every create/update normally pays for its own commit (and fsync). With group
+commit enabled, concurrent write statements are queued per engine: the first
+caller to arrive becomes the batch leader, waits up to ``window`` seconds (or
+until ``max_batch`` statements are queued), then runs the whole batch in one
+transaction and hands each caller its own result. Followers block until
+their batch has committed, so a returned result is always durable.
+
+If any statement in a batch fails, the batch is rolled back and its
+statements are retried one transaction each, so a bad row only fails its own
+caller. (Savepoints would avoid the retry, but pysqlite's implicit
+transaction handling does not bracket a leading SAVEPOINT reliably.)
+"""
+
+import threading
+from concurrent.futures import Future
+
+from sqlalchemy.orm import Session
+
+
+class GroupCommitter:
+    """Leader/follower batcher for write statements that return at most one row."""
+
+    def __init__(self, max_batch: int = 0, window: float = 0.002):
+        self.max_batch = max_batch
+        self.window = window
+        self._lock = threading.Lock()
+        # bind -> the batch currently accepting statements: (entries, full_event)
+        self._open = {}
+        self.batches = 0
+        self.operations = 0
+        self.fallbacks = 0
+        self.largest_batch = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch > 0
+
+    def submit(self, bind, statement):
+        """
+        Execute ``statement`` in the next group commit on ``bind``.
+
+        Returns the statement's single result row (or None), after the
+        transaction containing it has committed; re-raises its error otherwise.
+        """
+        future = Future()
+        with self._lock:
+            batch = self._open.get(bind)
+            leader = batch is None
+            if leader:
+                batch = self._open[bind] = ([], threading.Event())
+            entries, full = batch
+            entries.append((statement, future))
+            if len(entries) >= self.max_batch:
+                # Seal it: later arrivals start (and lead) the next batch.
+                del self._open[bind]
+                full.set()
+        if leader:
+            full.wait(self.window)
+            with self._lock:
+                if self._open.get(bind) is batch:
+                    del self._open[bind]
+            self._flush(bind, entries)
+        return future.result()
+
+    def _flush(self, bind, entries):
+        try:
+            with self._lock:
+                self.batches += 1
+                self.operations += len(entries)
+                self.largest_batch = max(self.largest_batch, len(entries))
+            try:
+                with Session(bind=bind) as db:
+                    rows = [db.execute(statement).one_or_none() for statement, _ in entries]
+                    db.commit()
+            except Exception:
+                with self._lock:
+                    self.fallbacks += 1
+                for statement, future in entries:
+                    self._run_alone(bind, statement, future)
+                return
+            for row, (_, future) in zip(rows, entries):
+                future.set_result(row)
+        except BaseException as exc:
+            # Never leave a follower waiting forever.
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(exc)
+            raise
+
+    def _run_alone(self, bind, statement, future):
+        try:
+            with Session(bind=bind) as db:
+                row = db.execute(statement).one_or_none()
+                db.commit()
+        except Exception as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(row)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_batch": self.max_batch,
+            "window_ms": self.window * 1000,
+            "batches": self.batches,
+            "operations": self.operations,
+            "fallbacks": self.fallbacks,
+            "largest_batch": self.largest_batch,
+            "average_batch": self.operations / self.batches if self.batches else 0.0,
+        }
@@ -0,0 +1,146 @@
+"""
+Lightweight in-process metrics and Prometheus text exposition.
+
+Kept dependency-free and cheap enough to update on every request or pool
+checkout: a histogram is a fixed list of bucket counters guarded by a lock.
+
+``MetricsMiddleware`` is a plain ASGI middleware (no BaseHTTPMiddleware
+request/response wrapping) that records per-route request counts by status,
+in-flight requests and latency histograms. Routes are labelled by their
+template (``/api/items/{item_id}``), never the raw path, so label
+cardinality stays bounded; requests that match no route share one label.
+"""
+
+import bisect
+import threading
+import time
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) of observed values."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        """Return ``{"buckets": {le: cumulative_count}, "count": n, "sum": total}``."""
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative["+Inf" if bound == float("inf") else bound] = running
+        return {"buckets": cumulative, "count": running, "sum": total}
+
+
+# Request latency buckets, in seconds.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestMetrics:
+    """Per-route request counters, latency histograms and an in-flight gauge."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.in_flight = 0
+        self._requests = {}
+        self._latency = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, status: int, seconds: float):
+        key = (method, route)
+        with self._lock:
+            counter_key = (method, route, status)
+            self._requests[counter_key] = self._requests.get(counter_key, 0) + 1
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def render(self) -> list:
+        """Prometheus text lines for the request metrics."""
+        with self._lock:
+            requests = sorted(self._requests.items())
+            latency = sorted(self._latency.items())
+        lines = [
+            "# HELP http_requests_total Total HTTP requests by method, route template and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in requests:
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_request_duration_seconds HTTP request latency by method and route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in latency:
+            lines += histogram_lines("http_request_duration_seconds", histogram.snapshot(), method=method, route=route)
+        return lines
+
+
+class MetricsMiddleware:
+    """ASGI middleware feeding a ``RequestMetrics`` instance."""
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight -= 1
+            route = scope.get("route")
+            self.metrics.observe(
+                scope["method"], getattr(route, "path", UNMATCHED_ROUTE), status, time.perf_counter() - start
+            )
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def histogram_lines(name: str, snapshot: dict, **labels) -> list:
+    """Prometheus ``_bucket`` / ``_sum`` / ``_count`` lines for a histogram snapshot."""
+    lines = [
+        f"{name}_bucket{_labels(**labels, le=bound)} {count}" for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_labels(**labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{_labels(**labels)} {snapshot['count']}")
+    return lines
+
+
+def gauge_lines(name: str, value, help_text: str, kind: str = "gauge") -> list:
+    """HELP/TYPE header plus one unlabelled sample."""
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
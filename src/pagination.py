@@ -0,0 +1,107 @@
+"""
+Keyset (cursor) pagination helpers for item listings.
+
+A cursor is an opaque, URL-safe token that records the sort key, direction
+and the position of the last row on the previous page. Continuing from it
+turns into an indexed range scan (``WHERE (key, id) > (:value, :id)``) so
+every page costs the same, no matter how deep into the table it is.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+from src.database import Item
+
+SORT_COLUMNS = {
+    "id": Item.id,
+    "name": Item.name,
+    "price": Item.price,
+    "created_at": Item.created_at,
+}
+
+
+# JSON types a cursor's sort value may have (created_at is an ISO string or null).
+_CURSOR_VALUE_TYPES = {"id": int, "name": str, "price": (int, float)}
+
+
+def order_by(sort: str, order: str):
+    """Return the ORDER BY clauses for a sort key, using id as tie-breaker."""
+    column = SORT_COLUMNS[sort]
+    if sort == "id":
+        return [column.desc() if order == "desc" else column.asc()]
+    if order == "desc":
+        return [column.desc(), Item.id.desc()]
+    return [column.asc(), Item.id.asc()]
+
+
+def encode_cursor(sort: str, order: str, item: Item) -> str:
+    """Build the cursor that continues after ``item``."""
+    value = getattr(item, sort)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, order, value, item.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort: str, order: str):
+    """
+    Decode a cursor into ``(value, id)`` for the given sort key and order.
+
+    Raises ValueError if the token is malformed or was issued for a
+    different sort key or order.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        cursor_sort, cursor_order, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if cursor_sort != sort or cursor_order != order:
+        raise ValueError("Cursor does not match the requested sort order")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Invalid cursor")
+    if sort == "created_at":
+        if value is not None:
+            if not isinstance(value, str):
+                raise ValueError("Invalid cursor")
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError as exc:
+                raise ValueError("Invalid cursor") from exc
+    elif not isinstance(value, _CURSOR_VALUE_TYPES[sort]) or isinstance(value, bool):
+        raise ValueError("Invalid cursor")
+    return value, last_id
+
+
+def after_cursor(sort: str, order: str, value, last_id: int):
+    """Return the WHERE clause selecting rows strictly after a cursor position."""
+    if sort == "id":
+        return Item.id < last_id if order == "desc" else Item.id > last_id
+    key = tuple_(SORT_COLUMNS[sort], Item.id)
+    if order == "desc":
+        return key < tuple_(value, last_id)
+    return key > tuple_(value, last_id)
+
+
+def paginate(query, skip: int, limit: int, sort: str, order: str, cursor=None):
+    """
+    Apply ordering, cursor and offset/limit to an ORM ``Query`` or ``select()``.
+
+    Raises ValueError for an invalid cursor or a cursor combined with skip.
+    """
+    if cursor is not None:
+        if skip:
+            raise ValueError("skip cannot be combined with cursor")
+        value, last_id = decode_cursor(cursor, sort, order)
+        query = query.filter(after_cursor(sort, order, value, last_id))
+    return query.order_by(*order_by(sort, order)).offset(skip).limit(limit)
+
+
+def next_cursor(items, limit: int, sort: str, order: str):
+    """Return the cursor for the page after ``items``, or None on the last page."""
+    if len(items) < limit:
+        return None
+    return encode_cursor(sort, order, items[-1])
@@ -0,0 +1,121 @@
+"""
+Connection pool sizing, liveness checks, prewarming and statistics.
+
+``pool_pre_ping=True`` issues a ``SELECT 1`` on every checkout. Instead,
+DB_POOL_PRE_PING=interval (the default) only pings connections that sat idle
+in the pool for longer than DB_POOL_PING_INTERVAL seconds, which is when a
+server-side timeout or failover could have killed them. ``always`` restores
+the per-checkout ping and ``off`` relies on SQLAlchemy's invalidate-on-error
+handling alone.
+"""
+
+import os
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+from src.metrics import Histogram
+
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "-1"))
+PRE_PING = os.environ.get("DB_POOL_PRE_PING", "interval").lower()
+PING_INTERVAL = float(os.environ.get("DB_POOL_PING_INTERVAL", "30"))
+PREWARM = int(os.environ.get("DB_POOL_PREWARM", str(POOL_SIZE)))
+
+# Checkout wait buckets, in seconds.
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram(WAIT_BUCKETS)
+        self.timeouts = 0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        new_pool = super().recreate()
+        new_pool.checkout_wait = self.checkout_wait
+        new_pool.timeouts = self.timeouts
+        return new_pool
+
+
+def engine_options() -> dict:
+    """``create_engine`` keyword arguments for the configured pool."""
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": PRE_PING == "always",
+    }
+
+
+def install_interval_ping(engine, interval: float = PING_INTERVAL):
+    """Ping connections on checkout only if they have been idle longer than ``interval``."""
+
+    @event.listens_for(engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        idle_since = connection_record.info.get("idle_since")
+        if idle_since is None or time.monotonic() - idle_since < interval:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception as err:
+            # Tells the pool to discard this connection and retry with a new one.
+            raise exc.DisconnectionError() from err
+
+
+def prewarm(engine, count: int = PREWARM):
+    """Open ``count`` connections up front so early requests skip connect cost."""
+    count = min(count, getattr(engine.pool, "size", lambda: count)())
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.raw_connection())
+    finally:
+        for connection in connections:
+            connection.close()
+    return count
+
+
+def pool_stats(engine) -> dict:
+    """Current occupancy and checkout-wait histogram for an engine's pool."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats["timeouts"] = pool.timeouts
+        stats["checkout_wait_seconds"] = pool.checkout_wait.snapshot()
+    return stats
@@ -0,0 +1,132 @@
+"""
+Read-replica routing with read-your-writes consistency.
+
+DATABASE_REPLICA_URLS (comma-separated) lists replicas of the primary
+database. Read-only handlers take their session from ``get_read_db``, which
+hands out replica sessions round-robin; writes keep using ``get_db`` and the
+primary. Without replicas configured ``get_read_db`` is just ``get_db``.
+
+Replicas lag, so write responses carry an ``X-Last-Write`` header with the
+primary's write position (see ``WritePosition`` in src.database). A client
+that sends the header back on a read is only served by a replica that has
+caught up to that position, and by the primary if none has.
+
+Locally, replicas can be plain copies of a primary SQLite file, refreshed
+with the SQLite backup API (``sqlite3 primary.db ".backup replica.db"``).
+"""
+
+import itertools
+import os
+import threading
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import exc, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.database import WritePosition, create_db_engine, get_db
+
+REPLICA_URLS = [url.strip() for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+WRITE_POSITION_HEADER = "X-Last-Write"
+
+
+def position(db: Session) -> Optional[int]:
+    """Current write position of the database behind ``db`` (None where it is not maintained)."""
+    return db.execute(select(WritePosition.seq).where(WritePosition.id == 1)).scalar()
+
+
+class ReplicaSet:
+    """Round-robin session factory over a fixed list of replica engines."""
+
+    def __init__(self, engines=()):
+        self.engines = list(engines)
+        self._sessionmakers = [sessionmaker(autocommit=False, autoflush=False, bind=e) for e in self.engines]
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self.reads = [0] * len(self.engines)
+        self.fallbacks = 0
+
+    @classmethod
+    def from_urls(cls, urls):
+        return cls(create_db_engine(url) for url in urls)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def session(self, min_position: Optional[int] = None) -> Optional[Session]:
+        """
+        A session on the next replica at or past ``min_position``.
+
+        Returns None when no replica has caught up (or none is reachable),
+        meaning the read should go to the primary.
+        """
+        with self._lock:
+            start = next(self._next)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            db = self._sessionmakers[index]()
+            if min_position is not None:
+                try:
+                    caught_up = (position(db) or 0) >= min_position
+                except exc.DBAPIError:
+                    caught_up = False
+                if not caught_up:
+                    db.close()
+                    continue
+            with self._lock:
+                self.reads[index] += 1
+            return db
+        with self._lock:
+            self.fallbacks += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {"url": engine.url.render_as_string(hide_password=True), "reads": reads}
+                for engine, reads in zip(self.engines, self.reads)
+            ],
+            "primary_fallbacks": self.fallbacks,
+        }
+
+
+replicas = ReplicaSet.from_urls(REPLICA_URLS)
+
+
+def requested_position(request: Request) -> Optional[int]:
+    """The write position a read must reflect, from the ``X-Last-Write`` header."""
+    token = request.headers.get(WRITE_POSITION_HEADER)
+    if token is None:
+        return None
+    try:
+        return int(token)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {WRITE_POSITION_HEADER} header")
+
+
+def write_headers(db: Session) -> dict:
+    """Response headers for a committed write: the position replicas must reach to reflect it."""
+    if not replicas.enabled:
+        return {}
+    seq = position(db)
+    return {} if seq is None else {WRITE_POSITION_HEADER: str(seq)}
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """
+    Dependency for read-only handlers — yields a replica session when one is
+    eligible, otherwise the primary session from ``get_db``.
+    """
+    replica_set = replicas
+    if not replica_set.enabled:
+        yield db
+        return
+    replica = replica_set.session(requested_position(request))
+    if replica is None:
+        yield db
+        return
+    try:
+        yield replica
+    finally:
+        replica.close()
@@ -0,0 +1,118 @@
+"""
+Pydantic request/response schemas for the items API.
+
+Kept separate from the route module so alternative routers (e.g. the async
+database path) can share them without importing the application.
+"""
+
+import os
+from typing import Optional, List, Literal
+
+from pydantic import BaseModel, Field
+
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "1000"))
+MAX_BATCH_GET_IDS = int(os.environ.get("MAX_BATCH_GET_IDS", "10000"))
+
+
+class ItemCreate(BaseModel):
+    name: str
+    description: Optional[str] = None
+    price: float = 0.0
+
+
+class ItemUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+
+
+class ItemResponse(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: int
+    name: str
+    description: Optional[str]
+    price: float
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
+
+class ItemBatchUpdate(ItemUpdate):
+    id: int
+
+
+class ItemBatchRequest(BaseModel):
+    create: List[ItemCreate] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+    update: List[ItemBatchUpdate] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+    delete: List[int] = Field(default_factory=list, max_length=MAX_BATCH_SIZE)
+
+
+class ItemBatchResult(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: int
+    status: int
+    item: Optional[ItemResponse] = None
+    detail: Optional[str] = None
+
+
+class ItemBatchResponse(BaseModel):
+    results: List[ItemBatchResult]
+
+
+class ItemBatchGetRequest(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=MAX_BATCH_GET_IDS)
+
+
+class ItemBatchGetResponse(BaseModel):
+    items: List[ItemResponse]
+    missing: List[int]
+
+
+class ItemChangeEntry(BaseModel):
+    op: Literal["upsert", "delete"]
+    id: int
+    item: Optional[ItemResponse] = None
+
+
+class ItemChangesResponse(BaseModel):
+    changes: List[ItemChangeEntry]
+    cursor: str
+    has_more: bool
+
+
+class ItemImportError(BaseModel):
+    line: int
+    error: str
+
+
+class ItemImportResult(BaseModel):
+    inserted: int
+    failed: int
+    chunks: int
+    errors: List[ItemImportError]
+
+
+class PriceBucket(BaseModel):
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+    count: int
+
+
+class PriceStats(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    sum: float
+    avg: Optional[float] = None
+
+
+class ItemStatsResponse(BaseModel):
+    count: int
+    price: PriceStats
+    buckets: List[PriceBucket]
+
+
+class ItemStatsVerification(BaseModel):
+    consistent: bool
+    differences: List[str]
+    summary: ItemStatsResponse
+    actual: ItemStatsResponse
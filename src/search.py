@@ -0,0 +1,91 @@
+"""
+Server-side filters and full-text search for item listings.
+
+Every filter maps to a predicate one of the ``items`` indexes can serve:
+``name`` / ``name_prefix`` use the (name, id) index, price bounds the
+(price, id) index and created_at bounds the (created_at, id) index, so a
+filter on the column being sorted by turns into a single index range scan.
+
+Full-text queries (``q``) match whole words in the name or description, all
+words required. On SQLite they run against the ``items_fts`` FTS5 table, on
+PostgreSQL against the ``to_tsvector`` expression index (see src.database).
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import func, literal_column, select, table
+
+from src.database import SEARCH_CONFIG, Item, search_vector
+
+_items_fts = table("items_fts", literal_column("rowid"))
+
+# GLOB metacharacters, matched literally when wrapped in brackets.
+_GLOB_SPECIAL = {"*": "[*]", "?": "[?]", "[": "[[]"}
+
+
+def _utc_naive(value: datetime) -> datetime:
+    """Timestamps are stored as naive UTC; convert aware bounds to match."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def name_prefix_clause(prefix: str, dialect: str):
+    """Case-sensitive prefix match that can use the name index."""
+    if dialect == "sqlite":
+        # SQLite's LIKE is case-insensitive and can't use a BINARY index; GLOB can.
+        pattern = "".join(_GLOB_SPECIAL.get(char, char) for char in prefix) + "*"
+        return Item.name.op("GLOB")(pattern)
+    escaped = prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return Item.name.like(escaped + "%", escape="/")
+
+
+def fts_query(q: str) -> Optional[str]:
+    """Quote each word of a user query as an FTS5 string, so operators are taken literally."""
+    words = q.split()
+    if not words:
+        return None
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+
+def full_text_clause(q: str, dialect: str):
+    """Predicate matching items whose name or description contains every word of ``q``."""
+    if dialect == "sqlite":
+        match = literal_column("items_fts").op("MATCH")(fts_query(q))
+        return Item.id.in_(select(_items_fts.c.rowid).where(match))
+    return search_vector.op("@@")(func.plainto_tsquery(SEARCH_CONFIG, q))
+
+
+def item_filters(
+    dialect: str,
+    name: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    q: Optional[str] = None,
+) -> list:
+    """
+    Build the WHERE clauses for the given filters (unset filters are skipped).
+
+    Price bounds are inclusive; ``created_after`` is inclusive and
+    ``created_before`` exclusive, so adjacent ranges don't overlap.
+    """
+    clauses = []
+    if name is not None:
+        clauses.append(Item.name == name)
+    if name_prefix:
+        clauses.append(name_prefix_clause(name_prefix, dialect))
+    if min_price is not None:
+        clauses.append(Item.price >= min_price)
+    if max_price is not None:
+        clauses.append(Item.price <= max_price)
+    if created_after is not None:
+        clauses.append(Item.created_at >= _utc_naive(created_after))
+    if created_before is not None:
+        clauses.append(Item.created_at < _utc_naive(created_before))
+    if q is not None and fts_query(q) is not None:
+        clauses.append(full_text_clause(q, dialect))
+    return clauses
@@ -0,0 +1,84 @@
+"""
+Fast JSON encoding for item responses.
+
+Handlers on the hot paths return pre-encoded bytes instead of dicts, which
+skips FastAPI's response_model validation and ``jsonable_encoder`` pass (the
+decorators keep ``response_model`` so the OpenAPI schema is unchanged).
+Timestamps are handed to the encoder as datetime objects rather than being
+``isoformat()``-ed first; orjson writes them in the same ISO 8601 form.
+
+orjson is used when installed, with the standard library as a fallback.
+"""
+
+import json
+from datetime import datetime
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+ITEM_FIELDS = ("id", "name", "description", "price", "created_at", "updated_at")
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps(payload) -> bytes:
+        """Encode a JSON payload to bytes."""
+        return orjson.dumps(payload)
+
+    def dumps_lines(payloads) -> bytes:
+        """Encode payloads as newline-delimited JSON."""
+        return b"".join(orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE) for payload in payloads)
+else:  # pragma: no cover
+    def dumps(payload) -> bytes:
+        """Encode a JSON payload to bytes."""
+        return json.dumps(
+            payload, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    def dumps_lines(payloads) -> bytes:
+        """Encode payloads as newline-delimited JSON."""
+        return b"".join(dumps(payload) + b"\n" for payload in payloads)
+
+
+def parse_fields(spec) -> tuple:
+    """
+    Parse a ``fields=`` sparse fieldset (comma-separated item field names).
+
+    Returns the requested fields in ITEM_FIELDS order, so equivalent lists
+    normalize to the same tuple, or ITEM_FIELDS when ``spec`` is None.
+    Raises ValueError for an empty list or an unknown field.
+    """
+    if spec is None:
+        return ITEM_FIELDS
+    requested = {field.strip() for field in spec.split(",")} - {""}
+    unknown = requested.difference(ITEM_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))} (choose from {', '.join(ITEM_FIELDS)})")
+    if not requested:
+        raise ValueError("fields must name at least one field")
+    return tuple(field for field in ITEM_FIELDS if field in requested)
+
+
+def item_payload(item, fields=ITEM_FIELDS) -> dict:
+    """Column values of an item (ORM object or row), timestamps left as datetimes."""
+    return {field: getattr(item, field) for field in fields}
+
+
+class JSONBytesResponse(Response):
+    """JSON response whose content is encoded with ``dumps`` (or given as bytes)."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
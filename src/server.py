@@ -0,0 +1,234 @@
+"""
+Pre-fork multi-worker server: ``python -m src.server``.
+
+The master process imports the app and brings the schema up to date once,
+binds the listening socket, then forks WEB_CONCURRENCY workers (default: one
+per available CPU, honouring container CPU limits). Workers share the socket
+and the already-imported code copy-on-write, and each runs its own uvicorn
+event loop and its own connection pools: engines drop pools inherited across
+fork (see ``src.database.dispose_in_forked_children``).
+
+Each worker exits gracefully after MAX_REQUESTS requests (plus a random
+0..MAX_REQUESTS_JITTER, so workers don't all recycle at once) and the master
+forks a replacement, which bounds per-worker memory growth. SIGTERM or SIGINT
+stops the workers gracefully (in-flight requests get GRACEFUL_TIMEOUT
+seconds) and then the master. A worker that fails within its first seconds
+stops the server instead of being respawned in a loop.
+
+Only for platforms with ``os.fork``; elsewhere run uvicorn directly.
+"""
+
+import argparse
+import logging
+import logging.config
+import math
+import os
+import random
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+logger = logging.getLogger("uvicorn.error")
+
+MAX_REQUESTS = int(os.environ.get("MAX_REQUESTS", "10000"))
+MAX_REQUESTS_JITTER = int(os.environ.get("MAX_REQUESTS_JITTER", str(MAX_REQUESTS // 10)))
+GRACEFUL_TIMEOUT = float(os.environ.get("GRACEFUL_TIMEOUT", "30"))
+# A worker exiting with an error sooner than this after being forked is a boot
+# failure (bad config, unreachable database) rather than a crash to recover from.
+MIN_WORKER_UPTIME = 2.0
+
+
+def cpu_count(cgroup_cpu_max: str = "/sys/fs/cgroup/cpu.max") -> int:
+    """CPUs this process may use: its affinity mask, capped by a cgroup v2 CPU quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(cgroup_cpu_max) as fh:
+            quota, period = fh.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Master:
+    """Forks, watches and replaces workers serving ``app`` on a shared socket."""
+
+    def __init__(
+        self,
+        app,
+        sock: socket.socket,
+        workers: int,
+        max_requests: int = MAX_REQUESTS,
+        max_requests_jitter: int = MAX_REQUESTS_JITTER,
+        graceful_timeout: float = GRACEFUL_TIMEOUT,
+        log_level: str = "info",
+    ):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        # pid -> fork time
+        self.children = {}
+        self.stopping = False
+        self.respawns = 0
+
+    def run(self) -> int:
+        """Serve until signalled; returns the process exit status."""
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._stop)
+        status = 0
+        while not self.stopping:
+            while len(self.children) < self.workers and not self.stopping:
+                self._spawn()
+            for pid, code, uptime in self._reap():
+                if code != 0 and uptime < MIN_WORKER_UPTIME and not self.stopping:
+                    logger.error("Worker %d failed to boot (exit status %d); shutting down", pid, code)
+                    self.stopping = True
+                    status = 1
+                elif not self.stopping:
+                    self.respawns += 1
+                    logger.info("Worker %d exited (status %d); starting a replacement", pid, code)
+            time.sleep(0.05)
+        self._shutdown()
+        return status
+
+    def _stop(self, signum, frame):
+        self.stopping = True
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self._work()
+            except SystemExit as exc:
+                code = exc.code if isinstance(exc.code, int) else 1
+            except BaseException:
+                logger.exception("Worker crashed")
+            finally:
+                # Never return into the master's loop (or run its atexit hooks).
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+
+    def _work(self) -> int:
+        # uvicorn installs its own handlers and re-raises captured signals when
+        # it stops; the master's handlers must not run in a worker.
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+        # Jitter applied here rather than through uvicorn's
+        # limit_max_requests_jitter, which needs uvicorn >= 0.41.
+        limit = self.max_requests + random.randint(0, self.max_requests_jitter) if self.max_requests else None
+        config = uvicorn.Config(
+            self.app,
+            limit_max_requests=limit,
+            timeout_graceful_shutdown=int(self.graceful_timeout),
+            log_level=self.log_level,
+        )
+        uvicorn.Server(config).run(sockets=[self.sock])
+        return 0
+
+    def _reap(self):
+        """Collect exited workers as ``(pid, exit status, uptime)``."""
+        exited = []
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            started = self.children.pop(pid, None)
+            if started is not None:
+                exited.append((pid, os.waitstatus_to_exitcode(status), time.monotonic() - started))
+        return exited
+
+    def _shutdown(self):
+        for pid in self.children:
+            _signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        for pid in self.children:
+            logger.warning("Worker %d did not stop within %.0fs; killing it", pid, self.graceful_timeout)
+            _signal(pid, signal.SIGKILL)
+        while self.children:
+            pid, _ = os.waitpid(-1, 0)
+            self.children.pop(pid, None)
+
+
+def _signal(pid: int, signum: int):
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def serve(app, host: str = "127.0.0.1", port: int = 8000, workers: int = None, log_level: str = "info",
+          **kwargs) -> int:
+    """Preload ``app`` and serve it from ``workers`` forked processes (default: one per CPU)."""
+    from src.database import engine, init_db
+
+    logging.config.dictConfig(uvicorn.config.LOGGING_CONFIG)
+    logging.getLogger("uvicorn").setLevel(log_level.upper())
+    workers = workers or int(os.environ.get("WEB_CONCURRENCY", "0")) or cpu_count()
+    # Schema work happens once here; each worker's startup then finds the
+    # fingerprint current. The master keeps no connections of its own.
+    init_db()
+    engine.dispose()
+    sock = bind_socket(host, port)
+    logger.info("Serving on http://%s:%d with %d workers (pid %d)", host, port, workers, os.getpid())
+    try:
+        return Master(app, sock, workers, log_level=log_level, **kwargs).run()
+    finally:
+        sock.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8000")))
+    parser.add_argument("--workers", type=int, help="worker processes (default: WEB_CONCURRENCY or one per CPU)")
+    parser.add_argument("--max-requests", type=int, default=MAX_REQUESTS,
+                        help="recycle a worker after this many requests (0 = never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=MAX_REQUESTS_JITTER)
+    parser.add_argument("--graceful-timeout", type=float, default=GRACEFUL_TIMEOUT)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    from src.app import app
+
+    return serve(
+        app,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=args.log_level,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        graceful_timeout=args.graceful_timeout,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+When many requests for the same key miss the item cache at once (a popular
+item after an expiry, every list page after a deploy), only the first one
+runs the query; the others wait for it and share its serialized result. Keys
+are the item cache keys, so they are built from the parsed route parameters
+and two requests coalesce whenever they would share a cache entry.
+
+Writes call ``forget`` for the keys they affect: requests arriving after the
+write start a new load instead of joining one that may have read the
+pre-write state. Requests already waiting on such a load still get its
+result, as they would have if their query had run alongside the write.
+"""
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Per-key leader/follower execution of thread-blocking loads."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # key -> Future of the load currently running for it
+        self._calls = {}
+        self.loads = 0
+        self.coalesced = 0
+
+    def do(self, key, load):
+        """
+        Return ``load()``, or the result of an identical load already running.
+
+        Exceptions raised by the leader's load are re-raised in every caller
+        that shared it.
+        """
+        if not self.enabled:
+            return load()
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.loads += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            result = load()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    def forget(self, *keys):
+        """Stop new callers from joining the loads running for ``keys``."""
+        with self._lock:
+            for key in keys:
+                self._calls.pop(key, None)
+
+    def forget_namespace(self, namespace):
+        """``forget`` every running key whose first element is ``namespace``."""
+        with self._lock:
+            for key in [key for key in self._calls if key[0] == namespace]:
+                del self._calls[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,84 @@
+"""
+Aggregate item statistics served from the trigger-maintained summary.
+
+``summary`` reads the single ``item_stats`` row and the price-bucket rows,
+plus min/max price from the (price, id) index — each a lookup, so the cost
+does not grow with the table. ``scan`` computes the same figures from the
+items themselves; ``verify`` compares the two and ``recompute`` rebuilds the
+summary from a scan (e.g. after rows were changed with triggers disabled).
+"""
+
+import math
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from src.database import (
+    PRICE_BUCKETS, Item, ItemPriceBucket, ItemStats, price_bucket_bounds, recompute_item_stats,
+)
+
+
+def _price_range(db: Session):
+    # Separate subqueries: SQLite only answers a lone min() or max() from the index.
+    return db.execute(
+        select(
+            select(func.min(Item.price)).scalar_subquery(),
+            select(func.max(Item.price)).scalar_subquery(),
+        )
+    ).one()
+
+
+def _result(count: int, price_sum: float, price_min, price_max, bucket_counts) -> dict:
+    return {
+        "count": count,
+        "price": {
+            "min": price_min,
+            "max": price_max,
+            "sum": price_sum,
+            "avg": price_sum / count if count else None,
+        },
+        "buckets": [
+            {"lower": lower, "upper": upper, "count": bucket_counts.get(bucket, 0)}
+            for bucket, lower, upper in price_bucket_bounds()
+        ],
+    }
+
+
+def summary(db: Session) -> dict:
+    """Statistics from the maintained summary tables."""
+    totals = db.get(ItemStats, 1, populate_existing=True)
+    count, price_sum = (totals.item_count, totals.price_sum) if totals else (0, 0.0)
+    bucket_counts = dict(db.execute(select(ItemPriceBucket.bucket, ItemPriceBucket.item_count)).all())
+    return _result(count, price_sum, *_price_range(db), bucket_counts)
+
+
+def scan(db: Session) -> dict:
+    """Statistics computed from a full scan of ``items``."""
+    count, price_sum = db.execute(select(func.count(), func.coalesce(func.sum(Item.price), 0.0))).one()
+    bucket = case(
+        *((Item.price < upper, index) for index, upper in enumerate(PRICE_BUCKETS)), else_=len(PRICE_BUCKETS)
+    )
+    bucket_counts = dict(db.execute(select(bucket, func.count()).group_by(bucket)).all())
+    return _result(count, float(price_sum), *_price_range(db), bucket_counts)
+
+
+def verify(db: Session) -> dict:
+    """Compare the summary with a full scan; ``consistent`` is False on any drift."""
+    stored, actual = summary(db), scan(db)
+    differences = []
+    if stored["count"] != actual["count"]:
+        differences.append("count")
+    # The running sum accumulates float rounding; only report real drift.
+    if not math.isclose(stored["price"]["sum"], actual["price"]["sum"], rel_tol=1e-9, abs_tol=1e-6):
+        differences.append("price.sum")
+    for stored_bucket, actual_bucket in zip(stored["buckets"], actual["buckets"]):
+        if stored_bucket["count"] != actual_bucket["count"]:
+            differences.append(f"buckets[{stored_bucket['lower']}, {stored_bucket['upper']})")
+    return {"consistent": not differences, "differences": differences, "summary": stored, "actual": actual}
+
+
+def recompute(db: Session) -> dict:
+    """Rebuild the summary from a full scan and return the fresh statistics."""
+    recompute_item_stats(db.connection())
+    db.commit()
+    return summary(db)
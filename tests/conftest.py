@@ -8,10 +8,11 @@ Uses SQLite in-memory for local tests, PostgreSQL when DATABASE_URL is set.
 import os
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
-from src.database import Base, get_db
+from src.database import Base, get_db, get_async_db, async_url, apply_sqlite_profile, create_db_engine
 from src.app import app
 
 
@@ -21,7 +22,7 @@ TEST_DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./test.db")
 if TEST_DATABASE_URL.startswith("postgres://"):
     TEST_DATABASE_URL = TEST_DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-test_engine = create_engine(TEST_DATABASE_URL, pool_pre_ping=True)
+test_engine = create_db_engine(TEST_DATABASE_URL)
 TestSession = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
 
@@ -56,3 +57,67 @@ def client(db_session):
     app.dependency_overrides[get_db] = override_get_db
     yield TestClient(app)
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def sql_statements():
+    """Record the SQL statements the test engine executes (SQL text, in order)."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(test_engine, "before_cursor_execute", record)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock for TTL tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def item_cache(monkeypatch):
+    """Enable the item response cache (driven by a fake clock) for one test."""
+    import src.app
+    from src.cache import ResponseCache
+
+    cache = ResponseCache(max_entries=64, ttl=5.0, stale_ttl=30.0, clock=FakeClock())
+    monkeypatch.setattr(src.app, "item_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def async_client():
+    """Test client for the async CRUD router, backed by the same test database."""
+    pytest.importorskip("greenlet")
+    from fastapi import FastAPI
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from src.aio import router
+
+    url = async_url(TEST_DATABASE_URL)
+    pytest.importorskip("aiosqlite" if url.startswith("sqlite") else "asyncpg")
+    # NullPool: connections must not outlive the event loop that opened them.
+    async_engine = create_async_engine(url, poolclass=NullPool)
+    if url.startswith("sqlite"):
+        apply_sqlite_profile(async_engine.sync_engine)
+    AsyncTestSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestSession() as db:
+            yield db
+
+    async_app = FastAPI()
+    async_app.include_router(router)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(async_app) as test_client:
+        yield test_client
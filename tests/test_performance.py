@@ -9,8 +9,20 @@ Marked with pytest marker 'performance' for selective execution:
     pytest -m performance tests/test_performance.py
 """
 
+import asyncio
+import json
 import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+from sqlalchemy import insert, select
+
+from src import reads
+from src.database import Item
+from src.pagination import encode_cursor
+from src.serialization import item_payload
+from tests.conftest import TestSession
 
 pytestmark = pytest.mark.performance
 
@@ -66,6 +78,59 @@ class TestResponseTimes:
         assert len(response.json()) == 20
         assert elapsed < CRUD_RESPONSE_TIME_LIMIT
 
+    def test_large_list_page_response_time(self, client, db_session):
+        """A full 1000-item page should be served well within the CRUD limit."""
+        db_session.bulk_save_objects(
+            [Item(name=f"Page {i}", description="x" * 200, price=float(i)) for i in range(1000)]
+        )
+        db_session.commit()
+
+        start = time.monotonic()
+        response = client.get("/api/items?limit=1000")
+        elapsed = time.monotonic() - start
+
+        assert response.status_code == 200
+        assert len(response.json()) == 1000
+        assert elapsed < CRUD_RESPONSE_TIME_LIMIT / 2, \
+            f"1000-item page responded in {elapsed:.3f}s (limit: {CRUD_RESPONSE_TIME_LIMIT / 2}s)"
+
+    def test_sparse_list_page_is_smaller(self, client, db_session):
+        """Projecting id,name,price should shrink a description-heavy page several times over."""
+        db_session.bulk_save_objects(
+            [Item(name=f"Page {i}", description="x" * 1000, price=float(i)) for i in range(1000)]
+        )
+        db_session.commit()
+
+        full = client.get("/api/items?limit=1000")
+        start = time.monotonic()
+        sparse = client.get("/api/items?limit=1000&fields=id,name,price")
+        elapsed = time.monotonic() - start
+
+        assert sparse.status_code == 200
+        assert set(sparse.json()[0]) == {"id", "name", "price"}
+        assert len(sparse.content) * 10 < len(full.content)
+        assert elapsed < CRUD_RESPONSE_TIME_LIMIT / 2
+
+    def test_core_page_load_allocates_less_than_orm(self, db_session):
+        """Loading a 1000-row page as Core rows should allocate well under half of ORM entities."""
+        db_session.bulk_save_objects([Item(name=f"Row {i}", price=float(i)) for i in range(1000)])
+        db_session.commit()
+
+        def peak(load):
+            with TestSession() as session:
+                load(session)  # warm the compiled statement cache
+                session.expunge_all()
+                tracemalloc.start()
+                try:
+                    load(session)
+                    return tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+        orm = peak(lambda session: [item_payload(item) for item in session.scalars(select(Item).limit(1000))])
+        core = peak(lambda session: reads.payloads(session.execute(select(*reads.item_columns()).limit(1000))))
+        assert core * 2 < orm, f"Core page peaked at {core} bytes vs {orm} for ORM entities"
+
 
 class TestThroughput:
     """Verify the application handles concurrent load."""
@@ -107,6 +172,172 @@ class TestThroughput:
         assert ops_per_sec >= CONCURRENT_RPS_MINIMUM, \
             f"CRUD throughput {ops_per_sec:.1f} ops/s below minimum"
 
+    def test_batch_create_throughput(self, client):
+        """Batched creates should sustain far more items/s than single POSTs."""
+        num_items = 1000
+        payload = {"create": [{"name": f"Batch {i}", "price": float(i)} for i in range(num_items)]}
+
+        start = time.monotonic()
+        res = client.post("/api/items:batch", json=payload)
+        elapsed = time.monotonic() - start
+
+        assert res.status_code == 200
+        assert len(res.json()["results"]) == num_items
+        items_per_sec = num_items / elapsed
+        assert items_per_sec >= CONCURRENT_RPS_MINIMUM * 10, \
+            f"Batch ingest {items_per_sec:.1f} items/s below minimum"
+
+    def test_streaming_import_throughput(self, client):
+        """Streaming import should ingest thousands of rows per second."""
+        num_items = 5000
+        body = "".join(json.dumps({"name": f"Import {i}", "price": i}) + "\n" for i in range(num_items))
+
+        start = time.monotonic()
+        res = client.post("/api/items/import", content=body)
+        elapsed = time.monotonic() - start
+
+        assert res.json()["inserted"] == num_items
+        items_per_sec = num_items / elapsed
+        assert items_per_sec >= CONCURRENT_RPS_MINIMUM * 100, \
+            f"Import {items_per_sec:.1f} items/s below minimum"
+
+    def test_batch_get_replaces_per_id_requests(self, client):
+        """Looking up 1000 ids in one request should take a fraction of 1000 single GETs' time."""
+        with TestSession() as session:
+            session.execute(insert(Item), [{"name": f"Lookup {i}", "price": float(i)} for i in range(1000)])
+            session.commit()
+        ids = list(range(1, 1001))
+
+        start = time.perf_counter()
+        for item_id in ids[:100]:
+            assert client.get(f"/api/items/{item_id}").status_code == 200
+        per_id = (time.perf_counter() - start) / 100
+
+        start = time.perf_counter()
+        res = client.post("/api/items:batchGet", json={"ids": ids})
+        batched = time.perf_counter() - start
+
+        assert res.status_code == 200
+        assert len(res.json()["items"]) == 1000
+        assert batched < per_id * len(ids) / 10, \
+            f"batchGet took {batched:.3f}s vs {per_id * len(ids):.3f}s estimated for single GETs"
+
+    def test_concurrent_writers(self):
+        """Concurrent committing writers should not hit 'database is locked'."""
+        writers, rows_each = 8, 25
+
+        def write(worker):
+            with TestSession() as session:
+                for i in range(rows_each):
+                    session.add(Item(name=f"Writer {worker}-{i}"))
+                    session.commit()
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            list(pool.map(write, range(writers)))
+        elapsed = time.monotonic() - start
+
+        with TestSession() as session:
+            assert session.query(Item).count() == writers * rows_each
+        commits_per_sec = writers * rows_each / elapsed
+        assert commits_per_sec >= CONCURRENT_RPS_MINIMUM * 5, \
+            f"Concurrent commits {commits_per_sec:.1f}/s below minimum"
+
+    def test_group_commit_concurrent_creates(self):
+        """Concurrent creates through group commit should share commits."""
+        from src.group_commit import GroupCommitter
+        from tests.conftest import test_engine
+
+        committer = GroupCommitter(max_batch=32, window=0.002)
+        writers, rows_each = 16, 25
+
+        def write(worker):
+            for i in range(rows_each):
+                committer.submit(test_engine, insert(Item).values(name=f"Grouped {worker}-{i}").returning(Item.id))
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            list(pool.map(write, range(writers)))
+        elapsed = time.monotonic() - start
+
+        with TestSession() as session:
+            assert session.query(Item).count() == writers * rows_each
+        assert committer.stats()["average_batch"] > 1
+        writes_per_sec = writers * rows_each / elapsed
+        assert writes_per_sec >= CONCURRENT_RPS_MINIMUM * 5, \
+            f"Group-committed writes {writes_per_sec:.1f}/s below minimum"
+
+    def test_identical_concurrent_reads_share_one_query(self, monkeypatch):
+        """A burst of identical list reads should run the page query once, not once per request."""
+        import httpx
+        from sqlalchemy import event
+
+        import src.app
+        from src.database import get_db
+        from src.singleflight import SingleFlight
+        from tests.conftest import test_engine
+
+        with TestSession() as session:
+            session.execute(insert(Item), [{"name": f"Hot {i}", "price": float(i)} for i in range(200)])
+            session.commit()
+        coalescer = SingleFlight()
+        monkeypatch.setattr(src.app, "read_coalescer", coalescer)
+        page_queries = []
+
+        def slow_page_query(conn, cursor, statement, *args):
+            if "LIMIT" in statement:
+                page_queries.append(statement)
+                time.sleep(0.05)
+
+        def override_get_db():
+            with TestSession() as db:
+                yield db
+
+        async def burst(count):
+            transport = httpx.ASGITransport(app=src.app.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(client.get("/api/items?limit=50") for _ in range(count)))
+
+        src.app.app.dependency_overrides[get_db] = override_get_db
+        event.listen(test_engine, "before_cursor_execute", slow_page_query)
+        try:
+            start = time.monotonic()
+            responses = asyncio.run(burst(20))
+            elapsed = time.monotonic() - start
+        finally:
+            event.remove(test_engine, "before_cursor_execute", slow_page_query)
+            src.app.app.dependency_overrides.clear()
+
+        assert [r.status_code for r in responses] == [200] * 20
+        assert len({r.content for r in responses}) == 1
+        assert len(page_queries) <= 2, f"{len(page_queries)} page queries for 20 identical reads"
+        assert coalescer.stats()["coalesced"] >= 18
+        assert elapsed < 20 * 0.05, f"Burst took {elapsed:.2f}s; reads were serialized"
+
+    def test_metrics_middleware_overhead(self):
+        """Recording request metrics should cost only microseconds per request."""
+        from src.metrics import MetricsMiddleware, RequestMetrics
+
+        async def endpoint(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def send(message):
+            pass
+
+        async def drive(app, count):
+            scope = {"type": "http", "method": "GET", "path": "/health"}
+            start = time.perf_counter()
+            for _ in range(count):
+                await app(dict(scope), None, send)
+            return time.perf_counter() - start
+
+        count = 20000
+        bare = asyncio.run(drive(endpoint, count))
+        instrumented = asyncio.run(drive(MetricsMiddleware(endpoint, RequestMetrics()), count))
+        overhead_us = (instrumented - bare) / count * 1e6
+        assert overhead_us < 50, f"Metrics overhead {overhead_us:.1f}us/request"
+
 
 class TestStress:
     """Basic stress tests to check for resource leaks or crashes."""
@@ -155,3 +386,177 @@ class TestStress:
             skip += limit
 
         assert len(all_items) == 50
+
+    def test_deep_cursor_page_stays_fast(self, client, db_session):
+        """A keyset page near the end of a large table should be as fast as page 1."""
+        db_session.bulk_save_objects(
+            [Item(name=f"Deep {i}", price=float(i % 100)) for i in range(5000)]
+        )
+        db_session.commit()
+        near_end = db_session.query(Item).order_by(Item.price.desc(), Item.id.desc()).offset(60).first()
+        deep_cursor = encode_cursor("price", "asc", near_end)
+
+        start = time.monotonic()
+        res = client.get(f"/api/items?limit=50&sort=price&cursor={deep_cursor}")
+        elapsed = time.monotonic() - start
+
+        assert res.status_code == 200
+        assert len(res.json()) == 50
+        assert elapsed < CRUD_RESPONSE_TIME_LIMIT, \
+            f"Deep cursor page responded in {elapsed:.3f}s (limit: {CRUD_RESPONSE_TIME_LIMIT}s)"
+
+    def test_export_large_table(self, client, db_session):
+        """Exporting thousands of rows should stream within the CRUD time limit."""
+        db_session.bulk_save_objects([Item(name=f"Export {i}", price=float(i)) for i in range(5000)])
+        db_session.commit()
+
+        start = time.monotonic()
+        with client.stream("GET", "/api/items/export") as res:
+            lines = sum(chunk.count(b"\n") for chunk in res.iter_bytes())
+        elapsed = time.monotonic() - start
+
+        assert lines == 5000
+        assert elapsed < CRUD_RESPONSE_TIME_LIMIT, \
+            f"Export of 5000 rows took {elapsed:.3f}s (limit: {CRUD_RESPONSE_TIME_LIMIT}s)"
+
+    def test_filtered_search_on_large_table(self, client, db_session):
+        """Filters and full-text queries should be served from indexes, not table scans."""
+        db_session.bulk_save_objects(
+            [Item(name=f"Search {i:05d}", description=f"word{i % 50} common", price=float(i % 100)) for i in range(5000)]
+        )
+        db_session.commit()
+
+        for query in ("name_prefix=Search%20012", "min_price=10&max_price=11&sort=price", "q=word7%20common"):
+            start = time.monotonic()
+            res = client.get(f"/api/items?{query}&limit=100")
+            elapsed = time.monotonic() - start
+            assert res.status_code == 200 and res.json()
+            assert elapsed < CRUD_RESPONSE_TIME_LIMIT, \
+                f"Filtered list ({query}) responded in {elapsed:.3f}s (limit: {CRUD_RESPONSE_TIME_LIMIT}s)"
+
+        if db_session.get_bind().dialect.name == "sqlite":
+            plans = {
+                "name prefix": "SELECT id FROM items WHERE name GLOB 'Search 012*'",
+                "price range": "SELECT id FROM items WHERE price >= 10 AND price <= 11 ORDER BY price, id",
+            }
+            for label, sql in plans.items():
+                plan = " ".join(row[-1] for row in db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+                assert "USING" in plan and "INDEX" in plan, f"{label} query does not use an index: {plan}"
+
+    def test_change_feed_cost_tracks_churn(self, client, db_session):
+        """A delta sync over a large table should read only the changed rows, through the seq index."""
+        from sqlalchemy import func, select, text
+        from src.changes import encode_cursor
+        from src.database import ItemChange
+
+        db_session.execute(insert(Item), [{"name": f"Synced {i}", "price": 1.0} for i in range(20000)])
+        db_session.commit()
+        seq, item_id = db_session.execute(
+            select(ItemChange.seq, ItemChange.item_id).order_by(ItemChange.seq.desc(), ItemChange.item_id.desc())
+        ).first()
+        cursor = encode_cursor(seq, item_id)
+        for changed in range(1, 11):
+            client.put(f"/api/items/{changed * 1000}", json={"price": 2.0})
+
+        start = time.monotonic()
+        feed = client.get(f"/api/items/changes?since={cursor}").json()
+        elapsed = time.monotonic() - start
+
+        assert len(feed["changes"]) == 10
+        assert elapsed < CRUD_RESPONSE_TIME_LIMIT / 10, f"Delta sync took {elapsed:.3f}s"
+        if db_session.get_bind().dialect.name == "sqlite":
+            plan = " ".join(
+                str(row[-1]) for row in db_session.execute(
+                    text("EXPLAIN QUERY PLAN SELECT item_id FROM item_changes WHERE (seq, item_id) > (:s, :i) "
+                         "ORDER BY seq, item_id"), {"s": seq, "i": item_id}
+                )
+            )
+            assert "ix_item_changes_seq_item_id" in plan
+        assert db_session.scalar(select(func.count()).select_from(ItemChange)) == 20000
+
+    def test_stats_constant_time(self, client, db_session):
+        """Stats come from the summary tables, so a large table answers as fast as an empty one."""
+        db_session.bulk_save_objects([Item(name=f"Stat {i}", price=float(i % 2000)) for i in range(20000)])
+        db_session.commit()
+
+        client.get("/api/items/stats")  # warm up
+        start = time.monotonic()
+        for _ in range(20):
+            res = client.get("/api/items/stats")
+        elapsed = (time.monotonic() - start) / 20
+
+        assert res.json()["count"] == 20000
+        assert elapsed < HEALTH_RESPONSE_TIME_LIMIT / 10, \
+            f"Stats responded in {elapsed:.4f}s on 20000 rows"
+
+
+class TestLoadHarness:
+    """The uvicorn load harness (benchmarks.loadtest) and its baseline check."""
+
+    def test_short_run_reports_percentiles(self, tmp_path):
+        from benchmarks import loadtest
+
+        out = tmp_path / "run.json"
+        status = loadtest.main([
+            "--duration", "1", "--warmup", "0", "--items", "50", "--concurrency", "4",
+            "--mix", "health=1,read=2,write=1", "--json", str(out),
+        ])
+        results = json.loads(out.read_text())["results"]
+        assert status == 0
+        assert set(results) == {"health", "read", "write", "overall"}
+        overall = results["overall"]
+        assert overall["requests"] > 0 and overall["errors"] == 0
+        assert overall["p50_ms"] <= overall["p95_ms"] <= overall["p99_ms"] <= overall["max_ms"]
+
+    def test_baseline_comparison_flags_regressions(self):
+        from benchmarks.loadtest import compare
+
+        def run(rps, p99, errors=0):
+            return {"results": {"overall": {
+                "requests": 1000, "rps": rps, "p95_ms": p99 / 2, "p99_ms": p99, "error_rate": errors / 1000,
+            }}}
+
+        baseline = run(rps=1000, p99=20)
+        assert compare(run(rps=900, p99=24), baseline, tolerance=0.25) == []
+        assert len(compare(run(rps=500, p99=20), baseline, tolerance=0.25)) == 1
+        assert any("p99_ms" in line for line in compare(run(rps=1000, p99=60), baseline, tolerance=0.25))
+        assert any("error rate" in line for line in compare(run(rps=1000, p99=20, errors=50), baseline, 0.25))
+
+
+class TestHotPathBenchmarks:
+    """Seeded data generator and the hot-path microbenchmark suite."""
+
+    def test_generator_is_deterministic(self):
+        from benchmarks.datagen import rows
+
+        assert list(rows(50, seed=7)) == list(rows(50, seed=7))
+        assert list(rows(50, seed=7)) != list(rows(50, seed=8))
+
+    def test_generated_database_is_complete(self, tmp_path):
+        from benchmarks.datagen import generate
+        from src.database import create_db_engine
+        from src.stats import verify
+
+        url = f"sqlite:///{tmp_path / 'gen.db'}"
+        generate(url, 2500, seed=3)
+        engine = create_db_engine(url)
+        try:
+            with TestSession(bind=engine) as session:
+                assert session.query(Item).count() == 2500
+                assert verify(session)["consistent"]
+                hits = session.connection().exec_driver_sql("SELECT count(*) FROM items_fts WHERE items_fts MATCH 'oak'")
+                assert hits.scalar() > 0
+        finally:
+            engine.dispose()
+
+    def test_suite_smoke_run(self, tmp_path, monkeypatch):
+        from benchmarks import bench_hotpaths, datagen
+
+        monkeypatch.setattr(datagen, "DATA_DIR", str(tmp_path))
+        out = tmp_path / "hotpaths.json"
+        bench_hotpaths.main(["--sizes", "300", "--repeat", "3", "--warmup", "1", "--alloc-calls", "1",
+                             "--json", str(out)])
+        results = json.loads(out.read_text())
+        assert results["get_item@300"]["queries"] == 1
+        assert results["create_item@300"]["queries"] == 1
+        assert all(r["median_us"] > 0 for r in results.values())
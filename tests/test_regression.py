@@ -9,8 +9,31 @@ Marked with pytest marker 'regression' for selective execution:
     pytest -m regression tests/test_regression.py
 """
 
+import base64
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+
 import pytest
 
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, insert, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+from src.database import Base, Item, create_db_engine, install_sqlite_fts
+from src.group_commit import GroupCommitter
+from src.serialization import ITEM_FIELDS, dumps, item_payload
+from src.stats import summary
+from tests.conftest import TEST_DATABASE_URL, TestSession, test_engine
+
 pytestmark = pytest.mark.regression
 
 
@@ -120,6 +143,742 @@ class TestItemRead:
         assert "not found" in response.json()["detail"].lower()
 
 
+class TestItemCursorPagination:
+    """Keyset (cursor) pagination over the item listing."""
+
+    def _walk(self, client, query):
+        """Follow X-Next-Cursor until exhausted, returning all items in order."""
+        items = []
+        url = f"/api/items?{query}"
+        while True:
+            res = client.get(url)
+            assert res.status_code == 200
+            items.extend(res.json())
+            cursor = res.headers.get("X-Next-Cursor")
+            if not cursor:
+                return items
+            url = f"/api/items?{query}&cursor={cursor}"
+
+    def test_cursor_walk_by_id(self, client):
+        """Walking cursors by id should return every item exactly once, in order."""
+        for i in range(25):
+            client.post("/api/items", json={"name": f"Item {i}"})
+
+        items = self._walk(client, "limit=10")
+        ids = [item["id"] for item in items]
+        assert len(ids) == 25
+        assert ids == sorted(ids)
+
+    def test_cursor_walk_by_price_desc_with_ties(self, client):
+        """Duplicate sort values should be tie-broken by id without gaps."""
+        for i in range(12):
+            client.post("/api/items", json={"name": f"Item {i}", "price": float(i % 3)})
+
+        items = self._walk(client, "limit=5&sort=price&order=desc")
+        keys = [(item["price"], item["id"]) for item in items]
+        assert len(keys) == 12
+        assert keys == sorted(keys, reverse=True)
+
+    def test_cursor_walk_by_name(self, client):
+        """Sorting by name should follow string order across pages."""
+        for name in ["delta", "alpha", "echo", "charlie", "bravo"]:
+            client.post("/api/items", json={"name": name})
+
+        items = self._walk(client, "limit=2&sort=name")
+        assert [item["name"] for item in items] == ["alpha", "bravo", "charlie", "delta", "echo"]
+
+    def test_cursor_walk_by_created_at(self, client):
+        """Sorting by created_at should round-trip timestamps through the cursor."""
+        for i in range(6):
+            client.post("/api/items", json={"name": f"Item {i}"})
+
+        items = self._walk(client, "limit=4&sort=created_at")
+        assert len({item["id"] for item in items}) == 6
+
+    def test_partial_page_has_no_cursor(self, client):
+        """A page shorter than limit is the last one and carries no cursor."""
+        client.post("/api/items", json={"name": "Only"})
+        res = client.get("/api/items?limit=10")
+        assert "X-Next-Cursor" not in res.headers
+
+    def test_invalid_cursor_returns_400(self, client):
+        """Garbage cursors should be rejected."""
+        res = client.get("/api/items?cursor=not-a-cursor")
+        assert res.status_code == 400
+
+    @pytest.mark.parametrize("payload", [
+        ["created_at", "asc", 5, 1],
+        ["created_at", "asc", "yesterday", 1],
+        ["price", "asc", [1], 1],
+        ["price", "asc", "1", 1],
+        ["name", "asc", {"a": 1}, 1],
+        ["id", "asc", 1.5, 1],
+        ["id", "asc", 1, True],
+    ])
+    def test_cursor_with_wrong_value_type_returns_400(self, client, payload):
+        """A well-formed cursor whose sort value has the wrong type is rejected, not a 500."""
+        client.post("/api/items", json={"name": "Item", "price": 1.0})
+        cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+        res = client.get(f"/api/items?sort={payload[0]}&cursor={cursor}")
+        assert res.status_code == 400
+
+    def test_cursor_sort_mismatch_returns_400(self, client):
+        """A cursor issued for one sort key cannot be reused for another."""
+        for i in range(3):
+            client.post("/api/items", json={"name": f"Item {i}"})
+        cursor = client.get("/api/items?limit=1&sort=price").headers["X-Next-Cursor"]
+
+        res = client.get(f"/api/items?limit=1&sort=name&cursor={cursor}")
+        assert res.status_code == 400
+
+    def test_cursor_with_skip_returns_400(self, client):
+        """skip and cursor are mutually exclusive."""
+        for i in range(3):
+            client.post("/api/items", json={"name": f"Item {i}"})
+        cursor = client.get("/api/items?limit=1").headers["X-Next-Cursor"]
+
+        res = client.get(f"/api/items?skip=1&cursor={cursor}")
+        assert res.status_code == 400
+
+    def test_invalid_sort_key_returns_422(self, client):
+        """Only the indexed sort keys are accepted."""
+        res = client.get("/api/items?sort=description")
+        assert res.status_code == 422
+
+
+class TestItemFilters:
+    """Server-side filters and full-text search on the item listing."""
+
+    @pytest.fixture
+    def catalog(self, client):
+        rows = [
+            {"name": "Apple", "description": "Crisp red fruit", "price": 1.5},
+            {"name": "Apricot", "description": "Small orange stone fruit", "price": 3.0},
+            {"name": "apple pie", "description": "Baked dessert", "price": 12.0},
+            {"name": "Banana", "description": "Yellow fruit, high in potassium", "price": 0.5},
+            {"name": "100% Juice", "description": "Orange juice", "price": 4.0},
+        ]
+        return [client.post("/api/items", json=row).json() for row in rows]
+
+    def _names(self, client, query):
+        res = client.get(f"/api/items?{query}")
+        assert res.status_code == 200
+        return [item["name"] for item in res.json()]
+
+    def test_name_equality(self, client, catalog):
+        assert self._names(client, "name=Apple") == ["Apple"]
+
+    def test_name_prefix_is_case_sensitive(self, client, catalog):
+        assert self._names(client, "name_prefix=Ap") == ["Apple", "Apricot"]
+        assert self._names(client, "name_prefix=ap") == ["apple pie"]
+
+    def test_name_prefix_escapes_wildcards(self, client, catalog):
+        assert self._names(client, "name_prefix=100%25") == ["100% Juice"]
+        assert self._names(client, "name_prefix=%25") == []
+        assert self._names(client, "name_prefix=*") == []
+
+    def test_price_range_is_inclusive(self, client, catalog):
+        assert self._names(client, "min_price=1.5&max_price=4&sort=price") == ["Apple", "Apricot", "100% Juice"]
+
+    def test_created_range(self, client, db_session, catalog):
+        db_session.query(Item).filter(Item.id == catalog[0]["id"]).update(
+            {Item.created_at: datetime(2020, 1, 1, 12, 0)}
+        )
+        db_session.commit()
+        assert self._names(client, "created_before=2021-01-01T00:00:00Z") == ["Apple"]
+        assert "Apple" not in self._names(client, "created_after=2020-01-01T12:00:01")
+        # Offset-aware bounds are compared in UTC.
+        assert self._names(client, "created_after=2020-01-01T13:00:00%2B01:00&created_before=2020-01-02") == ["Apple"]
+
+    def test_full_text_matches_name_and_description(self, client, catalog):
+        assert self._names(client, "q=fruit") == ["Apple", "Apricot", "Banana"]
+        assert self._names(client, "q=orange") == ["Apricot", "100% Juice"]
+        assert self._names(client, "q=apple") == ["Apple", "apple pie"]
+
+    def test_full_text_requires_every_word(self, client, catalog):
+        assert self._names(client, "q=orange%20juice") == ["100% Juice"]
+        assert self._names(client, "q=orange%20banana") == []
+
+    def test_full_text_treats_operators_literally(self, client, catalog):
+        for query in ('"', "fruit%20OR", "NOT%20fruit", "fruit*", "name:Apple", "(", "-"):
+            assert client.get(f"/api/items?q={query}").status_code == 200
+
+    def test_full_text_follows_writes(self, client, catalog):
+        item_id = catalog[3]["id"]
+        client.put(f"/api/items/{item_id}", json={"description": "Tropical plantain"})
+        assert self._names(client, "q=potassium") == []
+        assert self._names(client, "q=plantain") == ["Banana"]
+        client.delete(f"/api/items/{item_id}")
+        assert self._names(client, "q=plantain") == []
+
+    def test_full_text_indexes_batch_and_import_writes(self, client):
+        client.post("/api/items:batch", json={"create": [{"name": "Kiwi", "description": "fuzzy"}]})
+        client.post("/api/items/import", content=b'{"name": "Mango", "description": "fuzzy"}\n')
+        assert self._names(client, "q=fuzzy") == ["Kiwi", "Mango"]
+
+    def test_filters_combine_with_sort_and_cursor(self, client, catalog):
+        first = client.get("/api/items?q=fruit&sort=price&order=desc&limit=2")
+        assert [item["name"] for item in first.json()] == ["Apricot", "Apple"]
+        cursor = first.headers["X-Next-Cursor"]
+        assert self._names(client, f"q=fruit&sort=price&order=desc&limit=2&cursor={cursor}") == ["Banana"]
+
+    def test_filters_are_part_of_the_etag(self, client, catalog):
+        fruit = client.get("/api/items?q=fruit")
+        juice = client.get("/api/items?q=juice", headers={"If-None-Match": fruit.headers["etag"]})
+        assert juice.status_code == 200
+        assert [item["name"] for item in juice.json()] == ["100% Juice"]
+
+    def test_existing_database_gets_search_index(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'legacy.db'}"
+        legacy_engine = create_db_engine(url)
+        with legacy_engine.begin() as connection:
+            # A bare CREATE TABLE, as issued before full-text search existed.
+            connection.execute(CreateTable(Item.__table__))
+            connection.exec_driver_sql("INSERT INTO items (name, description, price) VALUES ('Old', 'legacy row', 1)")
+            install_sqlite_fts(connection)
+            hits = connection.exec_driver_sql("SELECT rowid FROM items_fts WHERE items_fts MATCH 'legacy'").all()
+        legacy_engine.dispose()
+        assert len(hits) == 1
+
+
+class TestItemStats:
+    """Aggregate statistics served from the trigger-maintained summary."""
+
+    def _stats(self, client):
+        res = client.get("/api/items/stats")
+        assert res.status_code == 200
+        return res.json()
+
+    def _bucket_counts(self, stats):
+        return [bucket["count"] for bucket in stats["buckets"]]
+
+    def test_empty_table(self, client):
+        stats = self._stats(client)
+        assert stats["count"] == 0
+        assert stats["price"] == {"min": None, "max": None, "sum": 0.0, "avg": None}
+        assert self._bucket_counts(stats) == [0, 0, 0, 0, 0, 0]
+        assert stats["buckets"][0] == {"lower": None, "upper": 10.0, "count": 0}
+        assert stats["buckets"][-1] == {"lower": 1000.0, "upper": None, "count": 0}
+
+    def test_follows_creates_updates_and_deletes(self, client):
+        ids = [client.post("/api/items", json={"name": f"S{p}", "price": p}).json()["id"] for p in (5, 10, 75, 2000)]
+        stats = self._stats(client)
+        assert stats["count"] == 4
+        assert stats["price"] == {"min": 5.0, "max": 2000.0, "sum": 2090.0, "avg": 522.5}
+        assert self._bucket_counts(stats) == [1, 1, 1, 0, 0, 1]
+
+        client.put(f"/api/items/{ids[3]}", json={"price": 400})
+        client.put(f"/api/items/{ids[0]}", json={"name": "renamed"})
+        client.delete(f"/api/items/{ids[1]}")
+        stats = self._stats(client)
+        assert stats["count"] == 3
+        assert stats["price"]["sum"] == 480.0
+        assert stats["price"]["max"] == 400.0
+        assert self._bucket_counts(stats) == [1, 0, 1, 1, 0, 0]
+
+    def test_follows_batch_and_import_writes(self, client):
+        created = client.post("/api/items:batch", json={"create": [{"name": "a", "price": 1}, {"name": "b", "price": 60}]})
+        ids = [result["item"]["id"] for result in created.json()["results"]]
+        client.post("/api/items:batch", json={"update": [{"id": ids[0], "price": 20}], "delete": [ids[1]]})
+        client.post("/api/items/import", content=b'{"name": "c", "price": 700}\n{"name": "d", "price": 3}\n')
+        stats = self._stats(client)
+        assert stats["count"] == 3
+        assert stats["price"]["sum"] == 723.0
+        assert self._bucket_counts(stats) == [1, 1, 0, 0, 1, 0]
+        assert client.get("/api/items/stats:verify").json()["consistent"] is True
+
+    def test_verify_detects_drift_and_recompute_repairs_it(self, client, db_session):
+        for price in (1, 2, 3):
+            client.post("/api/items", json={"name": "x", "price": price})
+        db_session.connection().exec_driver_sql("UPDATE item_stats SET item_count = 99, price_sum = 0")
+        db_session.connection().exec_driver_sql("UPDATE item_price_buckets SET item_count = 0")
+        db_session.commit()
+
+        check = client.get("/api/items/stats:verify").json()
+        assert check["consistent"] is False
+        assert "count" in check["differences"] and "price.sum" in check["differences"]
+        assert check["actual"]["count"] == 3
+
+        repaired = client.post("/api/items/stats:recompute").json()
+        assert repaired["count"] == 3
+        assert repaired["price"]["sum"] == 6.0
+        assert self._bucket_counts(repaired)[0] == 3
+        assert client.get("/api/items/stats:verify").json()["consistent"] is True
+
+    def test_existing_database_gets_summary(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'legacy.db'}"
+        legacy_engine = create_db_engine(url)
+        with legacy_engine.begin() as connection:
+            connection.execute(CreateTable(Item.__table__))
+            connection.exec_driver_sql("INSERT INTO items (name, price) VALUES ('Old', 42), ('Older', 8)")
+        Base.metadata.create_all(bind=legacy_engine)
+        with TestSession(bind=legacy_engine) as session:
+            stats = summary(session)
+        legacy_engine.dispose()
+        assert stats["count"] == 2
+        assert stats["price"]["sum"] == 50.0
+
+    def test_postgresql_summary_is_updated_per_statement(self):
+        from src.database import _postgresql_stats_ddl
+
+        triggers = [statement for statement in _postgresql_stats_ddl() if statement.startswith("CREATE TRIGGER")]
+        assert len(triggers) == 3
+        assert all("FOR EACH STATEMENT" in trigger and "REFERENCING" in trigger for trigger in triggers)
+
+    def test_unsupported_dialect_skips_triggers_with_warning(self, caplog):
+        from src.database import install_item_stats
+
+        connection = SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+        with caplog.at_level("WARNING", logger="src.database"):
+            install_item_stats(connection)
+        assert "not implemented for mysql" in caplog.text
+
+
+class TestSingleStatementWrites:
+    """Create, update and delete each run as one RETURNING statement."""
+
+    def _data_statements(self, statements):
+        return [sql for sql in statements if sql.split()[0] in ("SELECT", "INSERT", "UPDATE", "DELETE")]
+
+    def test_create_is_one_insert(self, client, sql_statements):
+        res = client.post("/api/items", json={"name": "One", "price": 2.5})
+        statements = self._data_statements(sql_statements)
+        assert res.status_code == 201
+        assert res.json()["name"] == "One" and res.json()["created_at"]
+        assert res.headers["etag"] == client.get(f"/api/items/{res.json()['id']}").headers["etag"]
+        assert len(statements) == 1
+        assert statements[0].startswith("INSERT INTO items") and "RETURNING" in statements[0]
+
+    def test_update_is_one_statement(self, client, sql_statements):
+        created = client.post("/api/items", json={"name": "Before", "description": "kept"}).json()
+        sql_statements.clear()
+        res = client.put(f"/api/items/{created['id']}", json={"name": "After"})
+        assert res.status_code == 200
+        body = res.json()
+        assert body["name"] == "After" and body["description"] == "kept"
+        assert body["updated_at"] >= created["updated_at"]
+        statements = self._data_statements(sql_statements)
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE items") and "RETURNING" in statements[0]
+
+    def test_delete_is_one_statement(self, client, sql_statements):
+        item_id = client.post("/api/items", json={"name": "Doomed"}).json()["id"]
+        sql_statements.clear()
+        assert client.delete(f"/api/items/{item_id}").status_code == 204
+        statements = self._data_statements(sql_statements)
+        assert len(statements) == 1
+        assert statements[0].startswith("DELETE FROM items") and "RETURNING" in statements[0]
+
+    def test_missing_items_404_from_returning(self, client):
+        assert client.put("/api/items/4242", json={"name": "x"}).status_code == 404
+        assert client.put("/api/items/4242", json={}).status_code == 404
+        assert client.delete("/api/items/4242").status_code == 404
+        assert client.delete("/api/items/4242", headers={"If-Match": "*"}).status_code == 404
+
+    def test_empty_update_leaves_item_untouched(self, client):
+        created = client.post("/api/items", json={"name": "Same"}).json()
+        res = client.put(f"/api/items/{created['id']}", json={})
+        assert res.status_code == 200
+        assert res.json() == created
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL.startswith("sqlite"), reason="replicas are SQLite file copies")
+class TestReadReplicas:
+    """Replica routing for reads, with read-your-writes via X-Last-Write."""
+
+    @pytest.fixture
+    def replica(self, tmp_path, monkeypatch):
+        """A replica file of the test database; ``replica.sync()`` copies the primary over it."""
+        import src.replicas
+        from src.replicas import ReplicaSet
+
+        replica_engine = create_db_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+
+        def sync():
+            source, target = test_engine.raw_connection(), replica_engine.raw_connection()
+            try:
+                source.driver_connection.backup(target.driver_connection)
+            finally:
+                source.close()
+                target.close()
+
+        sync()
+        monkeypatch.setattr(src.replicas, "replicas", ReplicaSet([replica_engine]))
+        yield SimpleNamespace(engine=replica_engine, sync=sync)
+        replica_engine.dispose()
+
+    def test_reads_go_to_replica(self, client, replica):
+        item_id = client.post("/api/items", json={"name": "Fresh"}).json()["id"]
+        assert client.get("/api/items").json() == []
+        assert client.get(f"/api/items/{item_id}").status_code == 404
+        replica.sync()
+        assert [item["name"] for item in client.get("/api/items").json()] == ["Fresh"]
+
+    def test_writes_report_position(self, client, replica):
+        first = client.post("/api/items", json={"name": "A"})
+        second = client.put(f"/api/items/{first.json()['id']}", json={"name": "B"})
+        deleted = client.delete(f"/api/items/{first.json()['id']}")
+        batch = client.post("/api/items:batch", json={"create": [{"name": "C"}]})
+        imported = client.post("/api/items/import", content=b'{"name": "D"}\n')
+        positions = [int(res.headers["X-Last-Write"]) for res in (first, second, deleted, batch, imported)]
+        assert positions == sorted(positions) and len(set(positions)) == 5
+
+    def test_read_your_writes_falls_back_to_primary(self, client, replica):
+        created = client.post("/api/items", json={"name": "Mine"})
+        token = {"X-Last-Write": created.headers["X-Last-Write"]}
+        item_id = created.json()["id"]
+        assert client.get(f"/api/items/{item_id}", headers=token).json()["name"] == "Mine"
+        assert [item["name"] for item in client.get("/api/items", headers=token).json()] == ["Mine"]
+        assert client.get("/api/items/stats", headers=token).json()["count"] == 1
+        assert client.get("/api/pool/stats").json()["replica_primary_fallbacks"] == 3
+
+    def test_caught_up_replica_serves_token_reads(self, client, replica):
+        created = client.post("/api/items", json={"name": "Mine"})
+        replica.sync()
+        # A row only the replica has shows which database answered.
+        with Session(bind=replica.engine) as replica_db:
+            replica_db.add(Item(name="Replica only"))
+            replica_db.commit()
+        names = [item["name"] for item in client.get(
+            "/api/items", headers={"X-Last-Write": created.headers["X-Last-Write"]}
+        ).json()]
+        assert names == ["Mine", "Replica only"]
+
+    def test_token_reads_bypass_cache(self, client, replica, item_cache):
+        created = client.post("/api/items", json={"name": "Mine"})
+        assert client.get("/api/items").json() == []  # stale replica page, now cached
+        fresh = client.get("/api/items", headers={"X-Last-Write": created.headers["X-Last-Write"]})
+        assert [item["name"] for item in fresh.json()] == ["Mine"]
+
+    def test_invalid_token_returns_400(self, client, replica):
+        assert client.get("/api/items", headers={"X-Last-Write": "soon"}).status_code == 400
+
+    def test_no_position_header_without_replicas(self, client):
+        res = client.post("/api/items", json={"name": "Solo"})
+        assert "X-Last-Write" not in res.headers
+        assert client.get("/api/items", headers={"X-Last-Write": "99"}).json()[0]["name"] == "Solo"
+
+    def test_database_without_write_position(self, client, db_session, replica, caplog):
+        """Dialects without the position triggers get no position row: no tokens and no list ETags."""
+        from src.database import WritePosition, install_write_position
+
+        with caplog.at_level("WARNING", logger="src.database"):
+            install_write_position(SimpleNamespace(dialect=SimpleNamespace(name="mysql")))
+        assert "not implemented for mysql" in caplog.text
+        db_session.execute(WritePosition.__table__.delete())
+        db_session.commit()
+        assert "X-Last-Write" not in client.post("/api/items", json={"name": "Untracked"}).headers
+        replica.sync()
+        assert "ETag" not in client.get("/api/items").headers
+
+
+class TestGroupCommit:
+    """Concurrent single-row writes coalesced into shared transactions."""
+
+    def _submit_concurrently(self, committer, statements):
+        with ThreadPoolExecutor(max_workers=len(statements)) as pool:
+            futures = [pool.submit(committer.submit, test_engine, statement) for statement in statements]
+        return futures
+
+    def _create(self, name):
+        return insert(Item).values(name=name, price=1.0).returning(Item.id, Item.name)
+
+    def test_concurrent_writes_share_one_commit(self):
+        committer = GroupCommitter(max_batch=8, window=5.0)
+        futures = self._submit_concurrently(committer, [self._create(f"G{i}") for i in range(8)])
+        rows = [future.result() for future in futures]
+        assert sorted(row.name for row in rows) == [f"G{i}" for i in range(8)]
+        assert len({row.id for row in rows}) == 8
+        assert committer.stats()["batches"] == 1
+        with TestSession() as session:
+            assert session.query(Item).count() == 8
+
+    def test_window_flushes_partial_batch(self):
+        committer = GroupCommitter(max_batch=100, window=0.01)
+        row = committer.submit(test_engine, self._create("Lonely"))
+        assert row.name == "Lonely"
+        assert committer.stats()["operations"] == 1
+
+    def test_max_batch_caps_batch_size(self):
+        committer = GroupCommitter(max_batch=2, window=0.2)
+        futures = self._submit_concurrently(committer, [self._create(f"C{i}") for i in range(6)])
+        assert all(future.result() for future in futures)
+        stats = committer.stats()
+        assert stats["largest_batch"] <= 2
+        assert stats["batches"] >= 3
+
+    def test_failing_write_only_fails_its_caller(self):
+        committer = GroupCommitter(max_batch=4, window=5.0)
+        statements = [self._create("ok 1"), insert(Item).values(name=None), self._create("ok 2"), self._create("ok 3")]
+        futures = self._submit_concurrently(committer, statements)
+        with pytest.raises(IntegrityError):
+            futures[1].result()
+        assert sorted(future.result().name for i, future in enumerate(futures) if i != 1) == ["ok 1", "ok 2", "ok 3"]
+        assert committer.stats()["fallbacks"] == 1
+
+    def test_endpoints_use_group_commit(self, client, monkeypatch):
+        import src.app
+
+        committer = GroupCommitter(max_batch=4, window=0.001)
+        monkeypatch.setattr(src.app, "group_commit", committer)
+        created = client.post("/api/items", json={"name": "Grouped", "price": 2.0})
+        assert created.status_code == 201
+        updated = client.put(f"/api/items/{created.json()['id']}", json={"price": 3.0})
+        assert updated.json()["price"] == 3.0 and updated.json()["name"] == "Grouped"
+        assert client.put("/api/items/9999", json={"price": 1.0}).status_code == 404
+        assert committer.stats()["operations"] == 3
+        assert "group_commit_batches_total 3" in client.get("/metrics").text
+
+    def test_guarded_write_does_not_hold_a_second_connection(self, tmp_path, monkeypatch):
+        import time
+
+        import src.app
+        from sqlalchemy.orm import sessionmaker
+        from src.database import get_db, init_db
+
+        small = create_db_engine(f"sqlite:///{tmp_path}/small.db", pool_size=1, max_overflow=0, pool_timeout=2)
+        init_db(small)
+        SmallSession = sessionmaker(bind=small, autoflush=False)
+
+        def override_get_db():
+            with SmallSession() as db:
+                yield db
+
+        monkeypatch.setattr(src.app, "group_commit", GroupCommitter(max_batch=4, window=0.001))
+        src.app.app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(src.app.app)
+            created = client.post("/api/items", json={"name": "Guarded", "price": 1.0})
+            start = time.monotonic()
+            res = client.put(f"/api/items/{created.json()['id']}", json={"price": 2.0},
+                             headers={"If-Match": created.headers["ETag"]})
+            elapsed = time.monotonic() - start
+        finally:
+            src.app.app.dependency_overrides.pop(get_db)
+            small.dispose()
+        assert res.status_code == 200 and res.json()["price"] == 2.0
+        assert elapsed < 1
+
+
+class TestSparseFieldsets:
+    """fields= narrows the SELECT and the response to the requested columns."""
+
+    def test_list_returns_only_requested_fields(self, client, sql_statements):
+        client.post("/api/items", json={"name": "Sparse", "description": "x" * 500, "price": 3.0})
+        sql_statements.clear()
+        res = client.get("/api/items?fields=price,id,name")
+        assert res.status_code == 200
+        assert res.json() == [{"id": 1, "name": "Sparse", "price": 3.0}]
+        page_query = next(s for s in sql_statements if "LIMIT" in s)
+        assert "description" not in page_query and "created_at" not in page_query
+
+    def test_sparse_pages_keep_cursor_and_filters(self, client):
+        for i in range(5):
+            client.post("/api/items", json={"name": f"Item {i}", "price": float(5 - i)})
+        first = client.get("/api/items?fields=name&sort=price&limit=2")
+        assert first.json() == [{"name": "Item 4"}, {"name": "Item 3"}]
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get(f"/api/items?fields=name&sort=price&limit=2&cursor={cursor}")
+        assert second.json() == [{"name": "Item 2"}, {"name": "Item 1"}]
+
+    def test_get_item_fieldset_has_its_own_etag(self, client):
+        item_id = client.post("/api/items", json={"name": "Tagged", "price": 1.0}).json()["id"]
+        full = client.get(f"/api/items/{item_id}")
+        sparse = client.get(f"/api/items/{item_id}?fields=name,id")
+        assert sparse.json() == {"id": item_id, "name": "Tagged"}
+        assert sparse.headers["ETag"] != full.headers["ETag"]
+        assert client.get(f"/api/items/{item_id}?fields=id,name").headers["ETag"] == sparse.headers["ETag"]
+        revalidated = client.get(
+            f"/api/items/{item_id}?fields=id,name", headers={"If-None-Match": sparse.headers["ETag"]}
+        )
+        assert revalidated.status_code == 304
+        # If-Match on writes compares against the full representation.
+        assert client.put(f"/api/items/{item_id}", json={"price": 2.0},
+                          headers={"If-Match": full.headers["ETag"]}).status_code == 200
+
+    def test_cached_fieldsets_invalidated_by_writes(self, client, item_cache):
+        item_id = client.post("/api/items", json={"name": "Before", "price": 1.0}).json()["id"]
+        assert client.get(f"/api/items/{item_id}?fields=name").json() == {"name": "Before"}
+        assert client.get("/api/items?fields=name").json() == [{"name": "Before"}]
+        client.put(f"/api/items/{item_id}", json={"name": "After"})
+        assert client.get(f"/api/items/{item_id}?fields=name").json() == {"name": "After"}
+        assert client.get("/api/items?fields=name").json() == [{"name": "After"}]
+
+    def test_batch_get_fields(self, client):
+        item_id = client.post("/api/items", json={"name": "Batched", "price": 4.0}).json()["id"]
+        body = client.post("/api/items:batchGet?fields=price", json={"ids": [item_id, 404]}).json()
+        assert body == {"items": [{"price": 4.0}], "missing": [404]}
+
+    @pytest.mark.parametrize("fields", ["colour", "name,colour", ",", ""])
+    def test_invalid_fields_rejected(self, client, fields):
+        res = client.get(f"/api/items?fields={fields}")
+        assert res.status_code == 400
+
+
+class TestCoreReadPath:
+    """Item GETs read Core rows, with the same JSON as serializing ORM objects."""
+
+    def _seed(self, client):
+        client.post("/api/items", json={"name": "Plain", "price": 1.5})
+        client.post("/api/items", json={"name": "Described", "description": "Text", "price": 0.0})
+        client.post("/api/items", json={"name": "Pricey", "price": 1234.56})
+
+    def _orm_payloads(self, fields=ITEM_FIELDS):
+        with TestSession() as session:
+            items = session.scalars(select(Item).order_by(Item.id)).all()
+            return json.loads(dumps([item_payload(item, fields) for item in items]))
+
+    def test_list_matches_orm_serialization(self, client):
+        self._seed(client)
+        assert client.get("/api/items").json() == self._orm_payloads()
+        assert client.get("/api/items?fields=price,name").json() == self._orm_payloads(("name", "price"))
+
+    def test_get_matches_orm_serialization(self, client):
+        self._seed(client)
+        for expected in self._orm_payloads():
+            res = client.get(f"/api/items/{expected['id']}")
+            assert res.json() == expected
+        assert client.get("/api/items/3?fields=description").json() == {"description": None}
+        assert client.get("/api/items/999?fields=name").status_code == 404
+
+    def test_reads_leave_no_objects_in_session(self, client, db_session):
+        self._seed(client)
+        db_session.expunge_all()
+        client.get("/api/items")
+        client.get("/api/items/1")
+        assert len(db_session.identity_map) == 0
+
+    def test_sort_column_outside_fieldset_still_pages(self, client):
+        self._seed(client)
+        first = client.get("/api/items?fields=name&sort=price&order=desc&limit=2")
+        assert first.json() == [{"name": "Pricey"}, {"name": "Plain"}]
+        cursor = first.headers["X-Next-Cursor"]
+        rest = client.get(f"/api/items?fields=name&sort=price&order=desc&limit=2&cursor={cursor}")
+        assert rest.json() == [{"name": "Described"}]
+
+
+class TestChangeFeed:
+    """Incremental sync through /api/items/changes."""
+
+    def _sync(self, client, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        res = client.get("/api/items/changes", params=params)
+        assert res.status_code == 200
+        return res.json()
+
+    def test_full_sync_then_empty_delta(self, client):
+        ids = [client.post("/api/items", json={"name": f"Feed {i}", "price": 1.0}).json()["id"] for i in range(3)]
+        feed = self._sync(client)
+        assert [(c["op"], c["id"]) for c in feed["changes"]] == [("upsert", item_id) for item_id in ids]
+        assert feed["changes"][0]["item"] == client.get(f"/api/items/{ids[0]}").json()
+        assert feed["has_more"] is False
+        again = self._sync(client, feed["cursor"])
+        assert again == {"changes": [], "cursor": feed["cursor"], "has_more": False}
+
+    def test_each_row_write_advances_position_once(self, client, db_session):
+        from src.replicas import position
+
+        start = position(db_session)
+        item_id = client.post("/api/items", json={"name": "Once", "price": 1.0}).json()["id"]
+        client.put(f"/api/items/{item_id}", json={"price": 2.0})
+        client.delete(f"/api/items/{item_id}")
+        db_session.rollback()
+        assert position(db_session) == start + 3
+        if db_session.get_bind().dialect.name == "sqlite":
+            triggers = db_session.execute(
+                select(func.count()).select_from(text("sqlite_master")).where(text("name LIKE 'items_position_%'"))
+            ).scalar()
+            assert triggers == 0
+
+    def test_unsupported_dialect_skips_triggers_with_warning(self, caplog):
+        from sqlalchemy.dialects import mysql
+        from src.database import install_item_changes, schema_fingerprint
+
+        connection = SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+        with caplog.at_level("WARNING", logger="src.database"):
+            install_item_changes(connection)
+        assert "not implemented for mysql" in caplog.text
+        # init_db fingerprints the DDL first; that must not fail either.
+        assert schema_fingerprint(mysql.dialect())
+
+    def test_delta_has_latest_state_and_tombstones(self, client):
+        keep = client.post("/api/items", json={"name": "Keep", "price": 1.0}).json()["id"]
+        gone = client.post("/api/items", json={"name": "Gone", "price": 1.0}).json()["id"]
+        untouched = client.post("/api/items", json={"name": "Untouched", "price": 1.0}).json()["id"]
+        cursor = self._sync(client)["cursor"]
+
+        client.put(f"/api/items/{keep}", json={"price": 2.0})
+        client.put(f"/api/items/{keep}", json={"price": 3.0})
+        client.delete(f"/api/items/{gone}")
+        delta = self._sync(client, cursor)["changes"]
+
+        assert [(c["op"], c["id"]) for c in delta] == [("upsert", keep), ("delete", gone)]
+        assert delta[0]["item"]["price"] == 3.0
+        assert "item" not in delta[1]
+        assert untouched not in [c["id"] for c in delta]
+
+    def test_batch_writes_are_recorded(self, client):
+        doomed = client.post("/api/items", json={"name": "Doomed"}).json()["id"]
+        cursor = self._sync(client)["cursor"]
+        client.post("/api/items:batch", json={"create": [{"name": "New"}], "delete": [doomed]})
+        ops = {c["op"] for c in self._sync(client, cursor)["changes"]}
+        assert ops == {"upsert", "delete"}
+
+    def test_pages_by_limit(self, client):
+        for i in range(5):
+            client.post("/api/items", json={"name": f"Paged {i}"})
+        first = self._sync(client, limit=2)
+        assert len(first["changes"]) == 2 and first["has_more"] is True
+        rest = self._sync(client, first["cursor"], limit=10)
+        assert len(rest["changes"]) == 3 and rest["has_more"] is False
+
+    def test_invalid_cursor_rejected(self, client):
+        assert client.get("/api/items/changes?since=not-a-cursor").status_code == 400
+
+    def test_existing_items_enter_the_feed(self, tmp_path):
+        engine = create_db_engine(f"sqlite:///{tmp_path}/legacy.db")
+        with engine.begin() as connection:
+            connection.execute(CreateTable(Item.__table__))
+            connection.execute(insert(Item), [{"name": "Old 1"}, {"name": "Old 2"}])
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            from src import changes
+
+            feed = changes.read(db, None, 10)
+        assert [(c["op"], c["id"]) for c in feed["changes"]] == [("upsert", 1), ("upsert", 2)]
+
+    def test_long_poll_wakes_on_write(self):
+        import threading
+        import time
+        from src.app import app
+        from src.database import get_db
+
+        def override_get_db():
+            with TestSession() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(app)
+            cursor = client.get("/api/items/changes").json()["cursor"]
+            writer = threading.Timer(0.2, lambda: client.post("/api/items", json={"name": "Late"}))
+            writer.start()
+            start = time.monotonic()
+            feed = client.get("/api/items/changes", params={"since": cursor, "wait": 10}).json()
+            elapsed = time.monotonic() - start
+            writer.join()
+            idle_start = time.monotonic()
+            idle = client.get("/api/items/changes", params={"since": feed["cursor"], "wait": 0.3}).json()
+            idle_elapsed = time.monotonic() - idle_start
+        finally:
+            app.dependency_overrides.clear()
+        assert [c["item"]["name"] for c in feed["changes"]] == ["Late"]
+        assert elapsed < 5
+        assert idle["changes"] == [] and idle["cursor"] == feed["cursor"]
+        assert idle_elapsed >= 0.3
+
+
 class TestItemUpdate:
     """Full test coverage for updating items."""
 
@@ -211,6 +970,1154 @@ class TestItemDelete:
         assert remaining[0]["name"] == "Keep"
 
 
+class TestItemBatch:
+    """Batched create / update / delete in one request."""
+
+    def test_batch_create(self, client):
+        """Creates should return one 201 result per item, in order."""
+        payload = {"create": [{"name": f"Bulk {i}", "price": float(i)} for i in range(5)]}
+        res = client.post("/api/items:batch", json=payload)
+        assert res.status_code == 200
+        results = res.json()["results"]
+        assert [r["status"] for r in results] == [201] * 5
+        assert [r["item"]["name"] for r in results] == [f"Bulk {i}" for i in range(5)]
+        assert len(client.get("/api/items").json()) == 5
+
+    def test_batch_update_keeps_patch_semantics(self, client):
+        """Batched updates should only touch the fields that were sent."""
+        first = client.post("/api/items", json={"name": "A", "description": "keep", "price": 1.0}).json()
+        second = client.post("/api/items", json={"name": "B", "price": 2.0}).json()
+
+        payload = {"update": [{"id": first["id"], "price": 10.0}, {"id": second["id"], "name": "B2"}]}
+        results = client.post("/api/items:batch", json=payload).json()["results"]
+
+        assert [r["status"] for r in results] == [200, 200]
+        assert results[0]["item"]["price"] == 10.0
+        assert results[0]["item"]["description"] == "keep"
+        assert results[1]["item"]["name"] == "B2"
+        assert results[1]["item"]["price"] == 2.0
+        assert client.get(f"/api/items/{first['id']}").json()["price"] == 10.0
+
+    def test_batch_delete(self, client):
+        """Deletes should report 204 for removed items and 404 for missing ones."""
+        item = client.post("/api/items", json={"name": "Gone"}).json()
+        results = client.post("/api/items:batch", json={"delete": [item["id"], 99999]}).json()["results"]
+
+        assert [(r["id"], r["status"]) for r in results] == [(item["id"], 204), (99999, 404)]
+        assert client.get(f"/api/items/{item['id']}").status_code == 404
+
+    def test_batch_mixed_operations(self, client):
+        """Mixed batches report results for every operation."""
+        keep = client.post("/api/items", json={"name": "Keep"}).json()
+        drop = client.post("/api/items", json={"name": "Drop"}).json()
+        payload = {
+            "create": [{"name": "New"}],
+            "update": [{"id": keep["id"], "name": "Kept"}, {"id": 99999, "name": "Ghost"}],
+            "delete": [drop["id"]],
+        }
+        results = client.post("/api/items:batch", json=payload).json()["results"]
+
+        assert [(r["op"], r["status"]) for r in results] == [
+            ("create", 201), ("update", 200), ("update", 404), ("delete", 204),
+        ]
+        names = sorted(item["name"] for item in client.get("/api/items").json())
+        assert names == ["Kept", "New"]
+
+    def test_batch_invalid_item_rejects_whole_batch(self, client):
+        """A validation error anywhere fails the request before any write."""
+        payload = {"create": [{"name": "Valid"}, {"price": 1.0}]}
+        res = client.post("/api/items:batch", json=payload)
+        assert res.status_code == 422
+        assert client.get("/api/items").json() == []
+
+    def test_batch_size_is_capped(self, client):
+        """Oversized batches should be rejected."""
+        from src.app import MAX_BATCH_SIZE
+
+        payload = {"delete": list(range(MAX_BATCH_SIZE + 1))}
+        res = client.post("/api/items:batch", json=payload)
+        assert res.status_code == 422
+
+
+class TestItemBatchGet:
+    """Fetching many items by id in one request."""
+
+    def test_items_in_request_order_with_missing(self, client):
+        ids = [client.post("/api/items", json={"name": f"Get {i}", "price": float(i)}).json()["id"] for i in range(3)]
+        res = client.post("/api/items:batchGet", json={"ids": [ids[2], 99999, ids[0], ids[2]]})
+        assert res.status_code == 200
+        body = res.json()
+        assert [item["id"] for item in body["items"]] == [ids[2], ids[0]]
+        assert body["items"][0] == client.get(f"/api/items/{ids[2]}").json()
+        assert body["missing"] == [99999]
+
+    def test_large_lookup_is_streamed_in_chunks(self, client, db_session, sql_statements):
+        from src.app import IN_CLAUSE_CHUNK
+
+        db_session.execute(insert(Item), [{"name": f"Many {i}", "price": 1.0} for i in range(1100)])
+        db_session.commit()
+        ids = list(range(1200, 0, -1))
+        sql_statements.clear()
+        res = client.post("/api/items:batchGet", json={"ids": ids})
+        assert res.status_code == 200
+        assert "content-length" not in res.headers
+        body = res.json()
+        assert [item["id"] for item in body["items"]] == list(range(1100, 0, -1))
+        assert body["missing"] == list(range(1200, 1100, -1))
+        lookups = [s for s in sql_statements if "FROM items" in s]
+        assert len(lookups) == -(-len(ids) // IN_CLAUSE_CHUNK)
+
+    def test_streamed_lookup_uses_its_own_session(self, client, db_session):
+        from src.app import IN_CLAUSE_CHUNK, app
+        from src.database import get_db
+
+        class RequestSession(Session):
+            def execute(self, *args, **kwargs):
+                raise AssertionError("request session used while streaming")
+
+        def override_get_db():
+            with RequestSession(bind=test_engine) as db:
+                yield db
+
+        db_session.execute(insert(Item), [{"name": "Streamed", "price": 1.0}])
+        db_session.commit()
+        app.dependency_overrides[get_db] = override_get_db
+        res = client.post("/api/items:batchGet", json={"ids": list(range(1, IN_CLAUSE_CHUNK + 2))})
+        assert res.status_code == 200
+        assert [item["name"] for item in res.json()["items"]] == ["Streamed"]
+
+    def test_empty_or_oversized_lookup_rejected(self, client):
+        from src.schemas import MAX_BATCH_GET_IDS
+
+        assert client.post("/api/items:batchGet", json={"ids": []}).status_code == 422
+        too_many = {"ids": list(range(1, MAX_BATCH_GET_IDS + 2))}
+        assert client.post("/api/items:batchGet", json=too_many).status_code == 422
+
+
+class TestAsyncItems:
+    """The async (DB_ASYNC) CRUD router behaves like the sync one."""
+
+    def test_async_crud_round_trip(self, async_client):
+        """Create, read, update and delete through the async handlers."""
+        created = async_client.post("/api/items", json={"name": "Async", "price": 1.5})
+        assert created.status_code == 201
+        item_id = created.json()["id"]
+
+        assert async_client.get(f"/api/items/{item_id}").json()["name"] == "Async"
+
+        updated = async_client.put(f"/api/items/{item_id}", json={"price": 3.0})
+        assert updated.status_code == 200
+        assert updated.json()["price"] == 3.0
+        assert updated.json()["name"] == "Async"
+
+        assert async_client.delete(f"/api/items/{item_id}").status_code == 204
+        assert async_client.get(f"/api/items/{item_id}").status_code == 404
+
+    def test_async_list_cursor_pagination(self, async_client):
+        """Cursor pagination works the same on the async path."""
+        for i in range(5):
+            async_client.post("/api/items", json={"name": f"Item {i}"})
+
+        first = async_client.get("/api/items?limit=3")
+        cursor = first.headers["X-Next-Cursor"]
+        second = async_client.get(f"/api/items?limit=3&cursor={cursor}")
+
+        ids = [item["id"] for item in first.json() + second.json()]
+        assert len(ids) == 5
+        assert ids == sorted(ids)
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_async_missing_item_returns_404(self, async_client):
+        """Missing items 404 on every async handler."""
+        assert async_client.get("/api/items/99999").status_code == 404
+        assert async_client.put("/api/items/99999", json={"name": "Ghost"}).status_code == 404
+        assert async_client.delete("/api/items/99999").status_code == 404
+
+    def test_async_reads_honour_fields(self, async_client):
+        item_id = async_client.post("/api/items", json={"name": "Sparse", "price": 2.0}).json()["id"]
+        assert async_client.get("/api/items?fields=price,name").json() == [{"name": "Sparse", "price": 2.0}]
+        assert async_client.get(f"/api/items/{item_id}?fields=id").json() == {"id": item_id}
+        assert async_client.get("/api/items?fields=bogus").status_code == 400
+
+    def test_async_writes_invalidate_cached_reads(self, client, async_client, item_cache):
+        """Writes on the async path drop the shared cache entries and wake change-feed waiters."""
+        import src.app
+
+        item_id = async_client.post("/api/items", json={"name": "Before"}).json()["id"]
+        assert client.get(f"/api/items/{item_id}").json()["name"] == "Before"
+        assert len(client.get("/api/items").json()) == 1
+
+        seen = src.app.change_notifier.version
+        async_client.put(f"/api/items/{item_id}", json={"name": "After"})
+        assert src.app.change_notifier.version > seen
+        assert client.get(f"/api/items/{item_id}").json()["name"] == "After"
+
+        async_client.delete(f"/api/items/{item_id}")
+        assert client.get("/api/items").json() == []
+
+    def test_async_writes_honour_if_match(self, async_client):
+        created = async_client.post("/api/items", json={"name": "Versioned", "price": 1.0})
+        item_id, etag = created.json()["id"], created.headers["ETag"]
+
+        unchanged = async_client.put(f"/api/items/{item_id}", json={}, headers={"If-Match": etag})
+        assert unchanged.status_code == 200 and unchanged.json()["name"] == "Versioned"
+        updated = async_client.put(f"/api/items/{item_id}", json={"price": 2.0}, headers={"If-Match": etag})
+        assert updated.status_code == 200 and updated.headers["ETag"] != etag
+
+        stale = {"If-Match": etag}
+        assert async_client.put(f"/api/items/{item_id}", json={"price": 3.0}, headers=stale).status_code == 412
+        assert async_client.delete(f"/api/items/{item_id}", headers=stale).status_code == 412
+        current = {"If-Match": updated.headers["ETag"]}
+        assert async_client.delete(f"/api/items/{item_id}", headers=current).status_code == 204
+        assert async_client.put("/api/items/99999", json={}, headers={"If-Match": "*"}).status_code == 404
+
+    def test_in_memory_async_engine_uses_static_pool(self, monkeypatch):
+        """sqlite:// gets one shared connection instead of QueuePool sizing arguments."""
+        pytest.importorskip("greenlet")
+        pytest.importorskip("aiosqlite")
+        import asyncio
+        from sqlalchemy.pool import StaticPool
+        from src import database
+
+        monkeypatch.setattr(database, "_async_engine", None)
+        monkeypatch.setattr(database, "_async_sessionmaker", None)
+        monkeypatch.setenv("ASYNC_DATABASE_URL", "sqlite+aiosqlite://")
+        engine = database.get_async_engine()
+
+        async def query():
+            async with engine.connect() as connection:
+                await connection.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+            async with engine.connect() as connection:
+                return (await connection.exec_driver_sql("SELECT count(*) FROM t")).scalar()
+
+        try:
+            assert isinstance(engine.pool, StaticPool)
+            assert asyncio.run(query()) == 0
+        finally:
+            asyncio.run(engine.dispose())
+
+    def test_app_with_db_async_keeps_fixed_item_paths(self, tmp_path):
+        """The full app in DB_ASYNC mode still routes /api/items/<name> paths to their own handlers."""
+        pytest.importorskip("greenlet")
+        pytest.importorskip("aiosqlite")
+        code = """
+import json
+from fastapi.testclient import TestClient
+from src.app import app
+
+with TestClient(app) as client:
+    client.post("/api/items", json={"name": "Async", "price": 1.0})
+    paths = ["/api/items/export", "/api/items/stats", "/api/items/changes", "/api/items/1?fields=name",
+             "/api/items?fields=name"]
+    responses = {path: client.get(path) for path in paths}
+    print(json.dumps({path: [res.status_code, res.text] for path, res in responses.items()}))
+"""
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path}/async.db", DB_ASYNC="true")
+        out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        results = json.loads(out.stdout.splitlines()[-1])
+        assert {path: status for path, (status, _) in results.items()} == dict.fromkeys(results, 200)
+        assert json.loads(results["/api/items/1?fields=name"][1]) == {"name": "Async"}
+        assert json.loads(results["/api/items?fields=name"][1]) == [{"name": "Async"}]
+
+
+class TestResponseCache:
+    """Unit behaviour of the LRU/TTL response cache."""
+
+    def _cache(self, **kwargs):
+        from tests.conftest import FakeClock
+        from src.cache import ResponseCache
+
+        clock = FakeClock()
+        return ResponseCache(clock=clock, **kwargs), clock
+
+    def test_disabled_cache_never_stores(self):
+        cache, _ = self._cache(max_entries=0)
+        cache.set(("item", 1), b"x", 1, cache.epoch)
+        assert cache.get(("item", 1)) == (None, None)
+
+    def test_lru_eviction_by_entries(self):
+        from src.cache import FRESH
+
+        cache, _ = self._cache(max_entries=2)
+        for key in ("a", "b"):
+            cache.set(("item", key), key, 1, cache.epoch)
+        cache.get(("item", "a"))  # "b" is now least recently used
+        cache.set(("item", "c"), "c", 1, cache.epoch)
+
+        assert cache.get(("item", "b")) == (None, None)
+        assert cache.get(("item", "a")) == ("a", FRESH)
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_bytes(self):
+        cache, _ = self._cache(max_entries=10, max_bytes=10)
+        cache.set(("item", 1), "x", 6, cache.epoch)
+        cache.set(("item", 2), "y", 6, cache.epoch)
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] == 6
+
+    def test_stale_while_revalidate(self):
+        from src.cache import FRESH, REVALIDATE, STALE
+
+        cache, clock = self._cache(ttl=5, stale_ttl=10)
+        cache.set(("item", 1), "v", 1, cache.epoch)
+        assert cache.get(("item", 1)) == ("v", FRESH)
+
+        clock.advance(6)
+        assert cache.get(("item", 1)) == ("v", REVALIDATE)
+        assert cache.get(("item", 1)) == ("v", STALE)
+
+        clock.advance(10)
+        assert cache.get(("item", 1)) == (None, None)
+        assert cache.stats()["expirations"] == 1
+
+    def test_load_started_before_write_is_discarded(self):
+        cache, _ = self._cache()
+        epoch = cache.epoch
+        cache.invalidate(("item", 1))
+        cache.set(("item", 1), "old", 1, epoch)
+        assert cache.get(("item", 1)) == (None, None)
+
+    def test_unrelated_writes_do_not_discard_loads(self):
+        from src.cache import FRESH
+
+        cache, _ = self._cache()
+        epoch = cache.epoch
+        cache.invalidate(("item", 2))
+        cache.invalidate_namespace("list")
+        cache.set(("item", 1), "v", 1, epoch)
+        cache.set(("list", 0), "page", 1, epoch)
+        assert cache.get(("item", 1)) == ("v", FRESH)
+        assert cache.get(("list", 0)) == (None, None)
+
+    def test_rejected_or_failed_refresh_is_retried(self):
+        from src.cache import REVALIDATE, STALE
+
+        cache, clock = self._cache(ttl=5, stale_ttl=30, max_bytes=10)
+        cache.set(("item", 1), "old", 1, cache.epoch)
+        clock.advance(6)
+        assert cache.get(("item", 1)) == ("old", REVALIDATE)
+        cache.set(("item", 1), "too large", 11, cache.epoch)  # rejected store
+        assert cache.get(("item", 1)) == ("old", REVALIDATE)
+        cache.release(("item", 1))  # the refresh raised
+        assert cache.get(("item", 1)) == ("old", REVALIDATE)
+        assert cache.get(("item", 1)) == ("old", STALE)
+
+    def test_invalidate_namespace(self):
+        cache, _ = self._cache()
+        cache.set(("list", 0), "a", 1, cache.epoch)
+        cache.set(("item", 1), "b", 1, cache.epoch)
+        cache.invalidate_namespace("list")
+        assert cache.get(("list", 0)) == (None, None)
+        assert cache.get(("item", 1))[0] == "b"
+
+
+class TestItemCacheEndpoints:
+    """Read-through caching and write invalidation on the item endpoints."""
+
+    def test_get_item_served_from_cache(self, client, item_cache, db_session):
+        """A second read is a hit, even if the row changed behind the API's back."""
+        item_id = client.post("/api/items", json={"name": "Cached"}).json()["id"]
+        assert client.get(f"/api/items/{item_id}").json()["name"] == "Cached"
+
+        db_session.query(Item).filter(Item.id == item_id).update({"name": "Changed"})
+        db_session.commit()
+
+        assert client.get(f"/api/items/{item_id}").json()["name"] == "Cached"
+        stats = client.get("/api/cache/stats").json()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_update_invalidates_item_and_lists(self, client, item_cache):
+        item_id = client.post("/api/items", json={"name": "Before"}).json()["id"]
+        client.get(f"/api/items/{item_id}")
+        client.get("/api/items")
+
+        client.put(f"/api/items/{item_id}", json={"name": "After"})
+
+        assert client.get(f"/api/items/{item_id}").json()["name"] == "After"
+        assert client.get("/api/items").json()[0]["name"] == "After"
+
+    def test_create_and_delete_invalidate_lists(self, client, item_cache):
+        assert client.get("/api/items").json() == []
+        item_id = client.post("/api/items", json={"name": "New"}).json()["id"]
+        assert len(client.get("/api/items").json()) == 1
+
+        client.delete(f"/api/items/{item_id}")
+        assert client.get("/api/items").json() == []
+        assert client.get(f"/api/items/{item_id}").status_code == 404
+
+    def test_batch_invalidates_affected_items(self, client, item_cache):
+        item_id = client.post("/api/items", json={"name": "Batched"}).json()["id"]
+        client.get(f"/api/items/{item_id}")
+
+        client.post("/api/items:batch", json={"update": [{"id": item_id, "price": 7.0}]})
+        assert client.get(f"/api/items/{item_id}").json()["price"] == 7.0
+
+    def test_list_cache_keeps_cursor_header(self, client, item_cache):
+        for i in range(3):
+            client.post("/api/items", json={"name": f"Item {i}"})
+        first = client.get("/api/items?limit=2")
+        again = client.get("/api/items?limit=2")
+        assert again.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+        assert again.json() == first.json()
+
+    def test_stale_entry_is_served_then_refreshed(self, client, item_cache, db_session):
+        """After the TTL the stale body is returned once and refreshed in the background."""
+        item_id = client.post("/api/items", json={"name": "Old"}).json()["id"]
+        client.get(f"/api/items/{item_id}")
+        db_session.query(Item).filter(Item.id == item_id).update({"name": "Fresh"})
+        db_session.commit()
+
+        item_cache.clock.advance(6)
+        assert client.get(f"/api/items/{item_id}").json()["name"] == "Old"
+        assert client.get(f"/api/items/{item_id}").json()["name"] == "Fresh"
+
+
+class TestConditionalRequests:
+    """ETag / Last-Modified validators and conditional requests."""
+
+    def test_item_has_validators(self, client):
+        res = client.post("/api/items", json={"name": "Tagged"})
+        etag = res.headers["ETag"]
+        assert etag.startswith('"')
+        assert "Last-Modified" in res.headers
+
+        got = client.get(f"/api/items/{res.json()['id']}")
+        assert got.headers["ETag"] == etag
+
+    def test_if_none_match_returns_304(self, client):
+        item_id = client.post("/api/items", json={"name": "Tagged"}).json()["id"]
+        etag = client.get(f"/api/items/{item_id}").headers["ETag"]
+
+        res = client.get(f"/api/items/{item_id}", headers={"If-None-Match": etag})
+        assert res.status_code == 304
+        assert res.content == b""
+        assert res.headers["ETag"] == etag
+
+    def test_etag_changes_after_update(self, client):
+        item_id = client.post("/api/items", json={"name": "Tagged"}).json()["id"]
+        etag = client.get(f"/api/items/{item_id}").headers["ETag"]
+        client.put(f"/api/items/{item_id}", json={"name": "Retagged"})
+
+        res = client.get(f"/api/items/{item_id}", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert res.json()["name"] == "Retagged"
+
+    def test_if_modified_since(self, client):
+        item_id = client.post("/api/items", json={"name": "Dated"}).json()["id"]
+        last_modified = client.get(f"/api/items/{item_id}").headers["Last-Modified"]
+
+        res = client.get(f"/api/items/{item_id}", headers={"If-Modified-Since": last_modified})
+        assert res.status_code == 304
+        res = client.get(f"/api/items/{item_id}", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"})
+        assert res.status_code == 200
+
+    def test_conditional_get_missing_item_returns_404(self, client):
+        res = client.get("/api/items/99999", headers={"If-None-Match": '"abc"'})
+        assert res.status_code == 404
+
+    def test_list_if_none_match(self, client):
+        client.post("/api/items", json={"name": "One"})
+        etag = client.get("/api/items").headers["ETag"]
+
+        assert client.get("/api/items", headers={"If-None-Match": etag}).status_code == 304
+        # Different page parameters are a different representation.
+        assert client.get("/api/items?limit=5", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_list_etag_changes_on_create_update_delete(self, client):
+        item_id = client.post("/api/items", json={"name": "One"}).json()["id"]
+        seen = {client.get("/api/items").headers["ETag"]}
+
+        client.post("/api/items", json={"name": "Two"})
+        seen.add(client.get("/api/items").headers["ETag"])
+        client.put(f"/api/items/{item_id}", json={"price": 2.0})
+        seen.add(client.get("/api/items").headers["ETag"])
+        client.delete(f"/api/items/{item_id}")
+        seen.add(client.get("/api/items").headers["ETag"])
+
+        assert len(seen) == 4
+
+    def test_list_has_no_last_modified(self, client):
+        client.post("/api/items", json={"name": "One"})
+        client.post("/api/items", json={"name": "Two"})
+        assert "Last-Modified" not in client.get("/api/items").headers
+        # A delete leaves no newer updated_at behind, so a date could not invalidate the page.
+        client.delete("/api/items/2")
+        res = client.get("/api/items", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        assert res.status_code == 200
+        assert [item["name"] for item in res.json()] == ["One"]
+
+    def test_list_validator_does_not_scan_items(self, client, sql_statements):
+        client.post("/api/items", json={"name": "One"})
+        sql_statements.clear()
+        etag = client.get("/api/items").headers["ETag"]
+        assert client.get("/api/items", headers={"If-None-Match": etag}).status_code == 304
+        assert not any("count(" in statement.lower() for statement in sql_statements)
+
+    def test_conditional_get_served_from_cache(self, client, item_cache):
+        item_id = client.post("/api/items", json={"name": "Cached"}).json()["id"]
+        etag = client.get(f"/api/items/{item_id}").headers["ETag"]
+
+        res = client.get(f"/api/items/{item_id}", headers={"If-None-Match": etag})
+        assert res.status_code == 304
+        assert item_cache.stats()["hits"] == 1
+
+    def test_put_with_matching_if_match(self, client):
+        res = client.post("/api/items", json={"name": "Locked", "price": 1.0})
+        item_id, etag = res.json()["id"], res.headers["ETag"]
+
+        res = client.put(f"/api/items/{item_id}", json={"price": 2.0}, headers={"If-Match": etag})
+        assert res.status_code == 200
+        assert res.json()["price"] == 2.0
+        assert res.json()["name"] == "Locked"
+        assert res.headers["ETag"] != etag
+
+    def test_put_with_stale_if_match_returns_412(self, client):
+        res = client.post("/api/items", json={"name": "Locked"})
+        item_id, etag = res.json()["id"], res.headers["ETag"]
+        client.put(f"/api/items/{item_id}", json={"name": "Someone else"})
+
+        res = client.put(f"/api/items/{item_id}", json={"name": "Mine"}, headers={"If-Match": etag})
+        assert res.status_code == 412
+        assert client.get(f"/api/items/{item_id}").json()["name"] == "Someone else"
+
+    def test_delete_with_if_match(self, client):
+        res = client.post("/api/items", json={"name": "Doomed"})
+        item_id, etag = res.json()["id"], res.headers["ETag"]
+
+        assert client.delete(f"/api/items/{item_id}", headers={"If-Match": '"stale"'}).status_code == 412
+        assert client.delete(f"/api/items/{item_id}", headers={"If-Match": etag}).status_code == 204
+        assert client.get(f"/api/items/{item_id}").status_code == 404
+
+
+class TestItemExport:
+    """Streaming NDJSON / CSV export."""
+
+    def test_export_ndjson(self, client):
+        for i in range(3):
+            client.post("/api/items", json={"name": f"Item {i}", "price": float(i)})
+
+        res = client.get("/api/items/export")
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in res.text.splitlines()]
+        assert [row["name"] for row in rows] == ["Item 0", "Item 1", "Item 2"]
+        assert rows == client.get("/api/items").json()
+
+    def test_export_csv(self, client):
+        client.post("/api/items", json={"name": "Comma, Quote\"", "description": "multi\nline", "price": 1.5})
+        client.post("/api/items", json={"name": "Plain"})
+
+        res = client.get("/api/items/export?format=csv")
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(res.text)))
+        assert [row["name"] for row in rows] == ["Comma, Quote\"", "Plain"]
+        assert rows[0]["description"] == "multi\nline"
+        assert rows[1]["description"] == ""
+        assert float(rows[0]["price"]) == 1.5
+
+    def test_export_reads_columns_not_entities(self, client, db_session):
+        """Export selects column rows; CSV cells match Item.to_dict(), ISO 8601 timestamps included."""
+        client.post("/api/items", json={"name": "Row", "description": "d", "price": 2.5})
+        item = db_session.scalars(select(Item)).one().to_dict()
+        loaded = []
+
+        def record(target, context):
+            loaded.append(target)
+
+        event.listen(Item, "load", record)
+        try:
+            csv_rows = list(csv.DictReader(io.StringIO(client.get("/api/items/export?format=csv").text)))
+            ndjson = json.loads(client.get("/api/items/export").text)
+        finally:
+            event.remove(Item, "load", record)
+        assert csv_rows == [{key: str(value) for key, value in item.items()}]
+        assert ndjson == item
+        assert loaded == []
+
+    def test_export_empty_table(self, client):
+        assert client.get("/api/items/export").text == ""
+        assert client.get("/api/items/export?format=csv").text.strip() == \
+            "id,name,description,price,created_at,updated_at"
+
+    def test_export_spans_multiple_batches(self, client, monkeypatch):
+        import src.app
+
+        monkeypatch.setattr(src.app, "EXPORT_BATCH_SIZE", 2)
+        client.post("/api/items:batch", json={"create": [{"name": f"Item {i}"} for i in range(5)]})
+
+        lines = client.get("/api/items/export").text.splitlines()
+        assert len(lines) == 5
+
+    def test_export_streams_on_its_own_session(self, client):
+        """The body streams after the handler returns, so it must not use the request-scoped session."""
+        from src.app import app
+        from src.database import get_db
+
+        class RequestSession(Session):
+            def execute(self, *args, **kwargs):
+                raise AssertionError("request session used while streaming")
+
+            scalars = execute
+
+        def override_get_db():
+            with RequestSession(bind=test_engine) as db:
+                yield db
+
+        client.post("/api/items", json={"name": "Streamed", "price": 1.0})
+        app.dependency_overrides[get_db] = override_get_db
+        for format in ("ndjson", "csv"):
+            assert "Streamed" in client.get(f"/api/items/export?format={format}").text
+
+    def test_export_invalid_format_returns_422(self, client):
+        assert client.get("/api/items/export?format=xml").status_code == 422
+
+
+class TestItemImport:
+    """Streaming NDJSON / CSV import."""
+
+    def test_import_ndjson(self, client):
+        body = "\n".join(json.dumps({"name": f"Imported {i}", "price": i}) for i in range(5)) + "\n"
+        res = client.post("/api/items/import", content=body)
+        assert res.status_code == 200
+        assert res.json() == {"inserted": 5, "failed": 0, "chunks": 1, "errors": []}
+        assert [item["name"] for item in client.get("/api/items").json()] == [f"Imported {i}" for i in range(5)]
+
+    def test_import_commits_in_chunks(self, client):
+        body = "".join(json.dumps({"name": f"Item {i}"}) + "\n" for i in range(7))
+        res = client.post("/api/items/import?chunk_size=3", content=body)
+        assert res.json()["inserted"] == 7
+        assert res.json()["chunks"] == 3
+
+    def test_import_reports_bad_lines(self, client):
+        body = '{"name": "Good"}\nnot json\n[1, 2]\n{"price": 1}\n\n{"name": "Also good"}'
+        res = client.post("/api/items/import", content=body).json()
+
+        assert res["inserted"] == 2
+        assert res["failed"] == 3
+        assert [e["line"] for e in res["errors"]] == [2, 3, 4]
+        assert "name" in res["errors"][2]["error"]
+
+    def test_import_chunks_keep_valid_rows_and_cap_errors(self, client, monkeypatch):
+        import src.ingest
+
+        monkeypatch.setattr(src.ingest, "MAX_REPORTED_ERRORS", 2)
+        body = '{"price": 1}\n{"name": "A"}\n{"name": "B", "price": "x"}\nnot json\n{"name": "C"}\n'
+        res = client.post("/api/items/import?chunk_size=2", content=body).json()
+
+        assert (res["inserted"], res["failed"], res["chunks"]) == (2, 3, 2)
+        assert [e["line"] for e in res["errors"]] == [1, 3]
+        assert res["errors"][1]["error"].startswith("price:")
+        assert [item["name"] for item in client.get("/api/items").json()] == ["A", "C"]
+
+    def test_import_csv(self, client):
+        body = 'name,description,price\nPlain,,1.5\n"Quoted, name","two\nlines",2\n,missing name,3\n'
+        res = client.post("/api/items/import?format=csv", content=body).json()
+
+        assert res["inserted"] == 2
+        assert res["failed"] == 1
+        items = client.get("/api/items").json()
+        assert items[0]["description"] is None
+        assert items[1]["name"] == "Quoted, name"
+        assert items[1]["description"] == "two\nlines"
+
+    def test_export_then_import_round_trip(self, client):
+        client.post("/api/items", json={"name": "Round", "description": "trip", "price": 3.5})
+        exported = client.get("/api/items/export?format=csv").text
+
+        res = client.post("/api/items/import?format=csv", content=exported).json()
+        assert res["inserted"] == 1
+        names = [(item["name"], item["description"], item["price"]) for item in client.get("/api/items").json()]
+        assert names == [("Round", "trip", 3.5)] * 2
+
+    def test_import_streamed_body_split_mid_line(self, client):
+        def chunks():
+            payload = "".join(json.dumps({"name": f"Ünïcode {i}"}) + "\n" for i in range(20)).encode()
+            for start in range(0, len(payload), 7):
+                yield payload[start:start + 7]
+
+        res = client.post("/api/items/import", content=chunks()).json()
+        assert res["inserted"] == 20
+        assert res["failed"] == 0
+
+    def test_import_invalidates_cached_lists(self, client, item_cache):
+        assert client.get("/api/items").json() == []
+        client.post("/api/items/import", content='{"name": "New"}\n')
+        assert len(client.get("/api/items").json()) == 1
+
+
+class TestFastSerialization:
+    """The bytes fast path must match what response_model validation produced."""
+
+    def test_item_json_matches_response_model(self, client, db_session):
+        from src.schemas import ItemResponse
+
+        item_id = client.post("/api/items", json={"name": "Exact", "description": "é ✓", "price": 0.1}).json()["id"]
+        expected = ItemResponse.model_validate(db_session.get(Item, item_id).to_dict()).model_dump()
+
+        assert client.get(f"/api/items/{item_id}").json() == expected
+        assert client.get("/api/items").json() == [expected]
+
+    def test_responses_are_utf8_json(self, client):
+        res = client.post("/api/items", json={"name": "Ñoño ✓"})
+        assert res.headers["content-type"] == "application/json"
+        assert "Ñoño ✓".encode() in res.content
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL.startswith("sqlite"), reason="SQLite-only profile")
+class TestSQLiteProfile:
+    """The SQLite performance profile is applied to every connection."""
+
+    def test_pragmas_applied(self):
+        with test_engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+            assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2  # MEMORY
+
+    def test_profile_can_be_disabled(self, monkeypatch):
+        import src.database
+
+        monkeypatch.setattr(src.database, "SQLITE_PROFILE", "off")
+        engine = create_db_engine("sqlite://")
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 2  # FULL
+
+    def test_memory_database_is_shared_across_sessions(self):
+        engine = create_db_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as writer:
+            writer.add(Item(name="Shared"))
+            writer.commit()
+        with Session(engine) as reader:
+            assert reader.query(Item).count() == 1
+
+
+class TestConnectionPool:
+    """Pool instrumentation, interval pinging and prewarming."""
+
+    def _file_engine(self, tmp_path, **kwargs):
+        return create_db_engine(f"sqlite:///{tmp_path}/pool.db", **kwargs)
+
+    def test_pool_stats_endpoint(self, client):
+        client.get("/api/items")
+        stats = client.get("/api/pool/stats").json()
+        assert stats["pool_class"] in ("InstrumentedQueuePool", "StaticPool")
+        if stats["pool_class"] == "InstrumentedQueuePool":
+            assert stats["checkout_wait_seconds"]["count"] >= 1
+            assert stats["checked_out"] >= 0
+
+    def test_prewarm_fills_pool(self, tmp_path):
+        from src import pool
+
+        engine = self._file_engine(tmp_path, pool_size=3)
+        assert pool.prewarm(engine, 10) == 3
+        assert engine.pool.checkedin() == 3
+
+    def test_checkout_wait_histogram(self, tmp_path):
+        from src import pool
+
+        engine = self._file_engine(tmp_path)
+        for _ in range(4):
+            with engine.connect():
+                pass
+        wait = pool.pool_stats(engine)["checkout_wait_seconds"]
+        assert wait["count"] == 4
+        assert wait["buckets"]["+Inf"] == 4
+
+    def test_interval_ping_replaces_dead_connection(self, tmp_path):
+        """An idle connection that fails its ping is swapped for a fresh one."""
+        import sqlite3
+        from sqlalchemy import create_engine
+        from src import pool
+
+        class FlakyConnection:
+            def __init__(self):
+                self._conn = sqlite3.connect(str(tmp_path / "flaky.db"), check_same_thread=False)
+                self.dead = False
+
+            def cursor(self):
+                if self.dead:
+                    raise sqlite3.OperationalError("server closed the connection unexpectedly")
+                return self._conn.cursor()
+
+            def rollback(self):
+                if not self.dead:
+                    self._conn.rollback()
+
+            def __getattr__(self, name):
+                return getattr(self._conn, name)
+
+        opened = []
+
+        def connect():
+            opened.append(FlakyConnection())
+            return opened[-1]
+
+        engine = create_engine("sqlite://", creator=connect, poolclass=pool.InstrumentedQueuePool, pool_size=1)
+        pool.install_interval_ping(engine, interval=0)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+        opened[0].dead = True
+
+        with engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT 1").scalar() == 1
+        assert len(opened) == 2
+
+    def test_ping_skipped_for_recently_used_connection(self, tmp_path):
+        from src import pool
+
+        engine = self._file_engine(tmp_path, pool_size=1)
+        pool.install_interval_ping(engine, interval=3600)
+        with engine.connect() as conn:
+            first = conn.connection.dbapi_connection
+        with engine.connect() as conn:
+            assert conn.connection.dbapi_connection is first
+
+    def test_histogram_is_cumulative(self):
+        from src.metrics import Histogram
+
+        histogram = Histogram([1, 5])
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+        assert snapshot["buckets"] == {1: 2, 5: 3, "+Inf": 4}
+        assert snapshot["count"] == 4
+        assert snapshot["sum"] == 14.5
+
+
+class TestMetricsEndpoint:
+    """Prometheus /metrics exposition."""
+
+    def _sample(self, text, prefix):
+        return [line for line in text.splitlines() if line.startswith(prefix)]
+
+    def test_metrics_use_route_templates(self, client):
+        item_id = client.post("/api/items", json={"name": "Metered"}).json()["id"]
+        client.get(f"/api/items/{item_id}")
+        client.get("/api/items/99999")
+
+        res = client.get("/metrics")
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = res.text
+        assert self._sample(text, 'http_requests_total{method="GET",route="/api/items/{item_id}",status="200"}')
+        assert self._sample(text, 'http_requests_total{method="GET",route="/api/items/{item_id}",status="404"}')
+        assert f"/api/items/{item_id}" not in text
+
+    def test_unmatched_paths_share_one_label(self, client):
+        client.get("/no/such/path")
+        client.get("/another/missing/path")
+        text = client.get("/metrics").text
+        assert self._sample(text, 'http_requests_total{method="GET",route="<unmatched>",status="404"}')
+        assert "/no/such/path" not in text
+
+    def test_latency_histogram_exposed(self, client):
+        client.get("/health")
+        text = client.get("/metrics").text
+        assert self._sample(text, 'http_request_duration_seconds_bucket{method="GET",route="/health",le="+Inf"}')
+        assert self._sample(text, 'http_request_duration_seconds_count{method="GET",route="/health"}')
+        assert "http_requests_in_flight" in text
+        assert "item_cache_hits_total" in text
+
+    def test_metrics_not_in_openapi(self, client):
+        assert "/metrics" not in client.get("/openapi.json").json()["paths"]
+
+
+class TestFastStartup:
+    """Schema fingerprinting, lazy dialect imports and startup timings."""
+
+    def _ddl_count(self, engine, action):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith(("CREATE", "DROP")):
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            result = action()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        return result, len(statements)
+
+    def test_matching_fingerprint_skips_schema_work(self, tmp_path):
+        from src.database import init_db
+
+        engine = create_db_engine(f"sqlite:///{tmp_path}/boot.db")
+        applied, ddl = self._ddl_count(engine, lambda: init_db(engine))
+        assert applied and ddl > 0
+        applied, ddl = self._ddl_count(engine, lambda: init_db(engine))
+        assert not applied and ddl == 0
+
+    def test_changed_schema_is_reapplied(self, tmp_path, monkeypatch):
+        from src import database
+
+        engine = create_db_engine(f"sqlite:///{tmp_path}/boot.db")
+        assert database.init_db(engine)
+        monkeypatch.setattr(database, "PRICE_BUCKETS", (5.0, 25.0))
+        assert database.init_db(engine)
+        with engine.connect() as connection:
+            buckets = connection.scalar(select(func.count()).select_from(database.ItemPriceBucket))
+        assert buckets == 3
+        assert not database.init_db(engine)
+
+    def test_schema_check_always_reapplies(self, tmp_path, monkeypatch):
+        from src import database
+
+        engine = create_db_engine(f"sqlite:///{tmp_path}/boot.db")
+        database.init_db(engine)
+        monkeypatch.setattr(database, "SCHEMA_CHECK", "always")
+        assert database.init_db(engine)
+
+    def test_database_without_fingerprint_is_upgraded(self, tmp_path):
+        from src.database import init_db
+
+        engine = create_db_engine(f"sqlite:///{tmp_path}/legacy.db")
+        with engine.begin() as connection:
+            connection.execute(CreateTable(Item.__table__))
+            connection.execute(insert(Item).values(name="Old", description="legacy row", price=1.0))
+        assert init_db(engine)
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("SELECT rowid FROM items_fts WHERE items_fts MATCH 'legacy'").all()
+
+    def test_upgraded_database_gets_new_indexes(self, tmp_path):
+        from src.database import init_db
+
+        engine = create_db_engine(f"sqlite:///{tmp_path}/baseline.db")
+        with engine.begin() as connection:
+            # The items table as the first release created it.
+            connection.exec_driver_sql(
+                "CREATE TABLE items (id INTEGER NOT NULL PRIMARY KEY, name VARCHAR(255) NOT NULL, "
+                "description VARCHAR(1024), price FLOAT NOT NULL, created_at DATETIME, updated_at DATETIME)"
+            )
+            connection.exec_driver_sql("CREATE INDEX ix_items_id ON items (id)")
+            connection.exec_driver_sql("CREATE INDEX ix_items_name ON items (name)")
+        assert init_db(engine)
+        with engine.connect() as connection:
+            indexes = set(connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars())
+            plan = " ".join(
+                row[-1] for row in connection.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN SELECT * FROM items ORDER BY price, id LIMIT 10"
+                )
+            )
+        assert {index.name for index in Item.__table__.indexes} <= indexes
+        assert "ix_items_price_id" in plan and "TEMP B-TREE" not in plan
+
+    def test_upgraded_database_drops_retired_indexes(self, tmp_path):
+        from src.database import init_db
+
+        engine = create_db_engine(f"sqlite:///{tmp_path}/retired.db")
+        with engine.begin() as connection:
+            connection.execute(CreateTable(Item.__table__))
+            connection.exec_driver_sql("CREATE INDEX ix_items_updated_at ON items (updated_at)")
+        assert init_db(engine)
+        with engine.connect() as connection:
+            indexes = set(connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars())
+        assert "ix_items_updated_at" not in indexes
+
+    def test_sqlite_boot_skips_postgresql_dialect(self):
+        code = "import sys, src.app; print('sqlalchemy.dialects.postgresql' in sys.modules)"
+        env = dict(os.environ, DATABASE_URL="sqlite:///:memory:")
+        out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "False"
+
+    def test_startup_timings_in_metrics(self, monkeypatch):
+        import src.app as app_module
+
+        monkeypatch.setattr(app_module, "init_db", lambda: False)
+        monkeypatch.setattr(app_module.pool, "prewarm", lambda engine: 0)
+        with TestClient(app_module.app) as client:
+            text = client.get("/metrics").text
+        assert 'app_startup_seconds{phase="import"}' in text
+        assert 'app_startup_seconds{phase="schema"}' in text
+        assert "app_schema_applied 0" in text
+
+
+class TestPreforkServer:
+    """src.server: CPU detection, fork-safe engines and worker recycling."""
+
+    def test_cpu_count_honours_cgroup_quota(self, tmp_path):
+        from src.server import cpu_count
+
+        available = cpu_count(str(tmp_path / "missing"))
+        limit = tmp_path / "cpu.max"
+        limit.write_text("150000 100000\n")
+        assert cpu_count(str(limit)) == min(available, 2)
+        limit.write_text("max 100000\n")
+        assert cpu_count(str(limit)) == available
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_forked_child_starts_with_empty_pool(self, tmp_path):
+        engine = create_db_engine(f"sqlite:///{tmp_path}/fork.db")
+        with engine.connect():
+            pass
+        assert engine.pool.checkedin() == 1
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover — runs in the child
+            os.write(write_end, str(engine.pool.checkedin()).encode())
+            os._exit(0)
+        os.close(write_end)
+        os.waitpid(pid, 0)
+        assert os.read(read_end, 16) == b"0"
+        os.close(read_end)
+        assert engine.pool.checkedin() == 1
+
+    def test_worker_request_limit_is_jittered(self, monkeypatch):
+        from src import server
+
+        configs = []
+        monkeypatch.setattr(server.uvicorn, "Config", lambda app, **kwargs: configs.append(kwargs))
+        monkeypatch.setattr(server.uvicorn, "Server", lambda config: SimpleNamespace(run=lambda sockets: None))
+        monkeypatch.setattr(server.signal, "signal", lambda signum, handler: None)
+        master = server.Master(None, None, 1, max_requests=100, max_requests_jitter=10)
+        for _ in range(20):
+            master._work()
+        server.Master(None, None, 1, max_requests=0)._work()
+        limits = [config["limit_max_requests"] for config in configs]
+        assert all(100 <= limit <= 110 for limit in limits[:-1]) and len(set(limits[:-1])) > 1
+        assert limits[-1] is None
+        # Only Config arguments every supported uvicorn release accepts.
+        assert "limit_max_requests_jitter" not in configs[0]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_workers_recycle_and_stop_gracefully(self, tmp_path):
+        import socket
+        import signal
+        import time
+
+        import httpx
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path}/prefork.db")
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "src.server", "--port", str(port), "--workers", "2",
+             "--max-requests", "3", "--max-requests-jitter", "0"],
+            env=env, stderr=subprocess.PIPE, text=True,
+        )
+        try:
+            deadline = time.monotonic() + 15
+            while True:
+                try:
+                    httpx.get(f"http://127.0.0.1:{port}/health")
+                    break
+                except httpx.TransportError:
+                    assert time.monotonic() < deadline, "server did not start"
+                    time.sleep(0.1)
+            def get_health():
+                try:
+                    return httpx.get(f"http://127.0.0.1:{port}/health", timeout=10).status_code
+                except httpx.RemoteProtocolError:
+                    # A connection accepted by a worker that just hit its limit is
+                    # closed unanswered while it shuts down; a retry reaches another.
+                    return httpx.get(f"http://127.0.0.1:{port}/health", timeout=10).status_code
+
+            # More requests than two workers may serve before being replaced.
+            statuses = [get_health() for _ in range(12)]
+            assert statuses == [200] * 12
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            _, log = proc.communicate(timeout=30)
+        assert proc.returncode == 0
+        assert "starting a replacement" in log
+
+
+class TestReadCoalescing:
+    """Single-flight sharing of identical concurrent loads."""
+
+    def test_concurrent_callers_share_one_load(self):
+        import threading
+        import time
+        from src.singleflight import SingleFlight
+
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def load():
+            calls.append(1)
+            release.wait(5)
+            return b"page"
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(flight.do, ("list", 1), load) for _ in range(8)]
+            while flight.stats()["coalesced"] < 7:
+                time.sleep(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+        assert results == [b"page"] * 8
+        assert len(calls) == 1
+        assert flight.stats() == {"enabled": True, "loads": 1, "coalesced": 7, "in_flight": 0}
+
+    def test_errors_reach_every_caller(self):
+        import threading
+        import time
+        from fastapi import HTTPException
+        from src.singleflight import SingleFlight
+
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def load():
+            release.wait(5)
+            raise HTTPException(status_code=404, detail="Item not found")
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(flight.do, ("item", 1), load) for _ in range(4)]
+            while flight.stats()["coalesced"] < 3:
+                time.sleep(0.001)
+            release.set()
+            errors = [future.exception() for future in futures]
+        assert all(isinstance(error, HTTPException) and error.status_code == 404 for error in errors)
+        # A failed load is not remembered.
+        assert flight.do(("item", 1), lambda: b"found") == b"found"
+
+    def test_forget_starts_a_new_load(self):
+        import threading
+        from src.singleflight import SingleFlight
+
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def stale_load():
+            started.set()
+            release.wait(5)
+            return b"before write"
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(flight.do, ("list", 1), stale_load)
+            started.wait(5)
+            flight.forget_namespace("list")
+            assert flight.do(("list", 1), lambda: b"after write") == b"after write"
+            release.set()
+            assert first.result() == b"before write"
+        assert flight.stats()["coalesced"] == 0
+
+    def test_disabled_runs_every_load(self):
+        from src.singleflight import SingleFlight
+
+        flight = SingleFlight(enabled=False)
+        assert flight.do(("item", 1), lambda: b"a") == b"a"
+        assert flight.stats()["loads"] == 0
+
+    def test_counters_exposed(self, client, monkeypatch):
+        import src.app
+        from src.singleflight import SingleFlight
+
+        monkeypatch.setattr(src.app, "read_coalescer", SingleFlight())
+        item_id = client.post("/api/items", json={"name": "Counted"}).json()["id"]
+        client.get(f"/api/items/{item_id}")
+        client.get("/api/items")
+        assert client.get("/api/cache/stats").json()["single_flight"]["loads"] == 2
+        text = client.get("/metrics").text
+        assert "read_coalesce_loads_total 2" in text
+        assert "read_coalesce_collapsed_total 0" in text
+
+
 class TestDataIntegrity:
     """Tests verifying data consistency and edge cases."""
 